@@ -7,6 +7,14 @@ from claude_container.cli.helpers import get_project_context
 from claude_container.core.constants import CLAUDE_SKIP_PERMISSIONS_FLAG, CLAUDE_PERMISSIONS_ERROR, CONTAINER_PREFIX
 from claude_container.core.container_runner import ContainerRunner
 from claude_container.cli.commands.auth_check import check_claude_auth
+from claude_container.utils.permission_cache import PermissionCache
+
+
+def _remember_accepted(runner: ContainerRunner) -> None:
+    """Record accepted permissions so task runs can skip their own probe."""
+    image_digest = runner.docker_service.get_image_digest(runner.image_name)
+    if image_digest:
+        PermissionCache(runner.data_dir).set(image_digest, True)
 
 
 @click.command()
@@ -63,6 +71,7 @@ def accept_permissions(force: bool):
             container.remove()
             
             if exit_code == 0:
+                _remember_accepted(runner)
                 click.echo("✅ Permissions are already accepted!")
                 return
             elif CLAUDE_PERMISSIONS_ERROR not in logs:
@@ -86,6 +95,7 @@ def accept_permissions(force: bool):
             user='node'
         )
         
+        _remember_accepted(runner)
         click.echo("\n✅ Permissions accepted successfully!")
         click.echo("You can now run tasks non-interactively.")
     except Exception as e:
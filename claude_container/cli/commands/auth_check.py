@@ -1,15 +1,34 @@
 import click
 import sys
+import time
+from pathlib import Path
 from claude_container.cli.helpers import get_project_context
 from claude_container.core.container_runner import ContainerRunner
-from claude_container.core.constants import CONTAINER_PREFIX
+from claude_container.core.constants import AUTH_CACHE_FILE, AUTH_CACHE_TTL, CONTAINER_PREFIX
 
+# Data directories whose auth check already passed in this process
+_verified_data_dirs = set()
 
-def check_claude_auth(quiet=False):
+
+def _auth_recently_verified(marker: Path) -> bool:
+    """Check whether a successful auth check was recorded within the TTL."""
+    try:
+        return time.time() - marker.stat().st_mtime < AUTH_CACHE_TTL
+    except OSError:
+        return False
+
+
+def check_claude_auth(quiet=False, use_cache=True):
     """Check if Claude authentication is still valid.
     
+    A successful check is recorded in the data directory, and later checks
+    within ``AUTH_CACHE_TTL`` return immediately instead of starting another
+    container and Claude request. Within one process the result is also
+    remembered in memory, so repeated checks skip the marker lookup.
+    
     Args:
         quiet: If True, only show errors
+        use_cache: If False, always run the check in a container
         
     Returns:
         bool: True if authentication is valid, False otherwise
@@ -21,6 +40,14 @@ def check_claude_auth(quiet=False):
             click.echo("No container found. Please run 'claude-container build' first.", err=True)
         return False
     
+    if use_cache and data_dir in _verified_data_dirs:
+        return True
+    
+    auth_marker = data_dir / AUTH_CACHE_FILE
+    if use_cache and _auth_recently_verified(auth_marker):
+        _verified_data_dirs.add(data_dir)
+        return True
+    
     image_name = f"{CONTAINER_PREFIX}-{project_root.name}".lower()
     
     # Create container runner with unified config
@@ -68,8 +95,16 @@ def check_claude_auth(quiet=False):
         if exit_code == 0:
             if not quiet:
                 click.echo("✓ Authentication is valid")
+            _verified_data_dirs.add(data_dir)
+            try:
+                auth_marker.touch()
+            except OSError:
+                # The marker only saves a re-check
+                pass
             return True
         else:
+            _verified_data_dirs.discard(data_dir)
+            auth_marker.unlink(missing_ok=True)
             if not quiet:
                 click.echo("✗ Authentication has expired or is invalid", err=True)
                 click.echo("Run 'claude-container login' to re-authenticate")
@@ -87,5 +122,5 @@ def auth_check():
     
     Starts a new container to verify global Claude authentication status.
     """
-    if not check_claude_auth():
+    if not check_claude_auth(use_cache=False):
         sys.exit(1)
\ No newline at end of file
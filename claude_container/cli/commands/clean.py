@@ -27,33 +27,33 @@ def clean(containers, force):
             # Use the project-specific prefix pattern
             name_prefix = f"{CONTAINER_PREFIX}-task-{project_root.name}".lower()
             
-            # List containers with claude-container label
+            # List containers with claude-container label and the prefix
             containers = docker_service.list_containers(
                 all=True,
                 labels={
                     "claude-container": "true",
                     "claude-container-project": project_root.name.lower()
-                }
+                },
+                name_prefix=name_prefix,
+                sparse=True
             )
-            
-            # Filter by name prefix if needed
-            containers = [c for c in containers if c.name.startswith(name_prefix)]
             removed = 0
             
             for container in containers:
+                name = DockerService.container_name(container)
                 try:
                     if container.status == 'running' and not force:
-                        click.echo(f"Skipping running container: {container.name}")
+                        click.echo(f"Skipping running container: {name}")
                         continue
                     
                     if container.status == 'running':
                         container.stop()
                     
                     docker_service.remove_container(container)
-                    click.echo(f"Removed container: {container.name}")
+                    click.echo(f"Removed container: {name}")
                     removed += 1
                 except Exception as e:
-                    click.echo(f"Failed to remove container {container.name}: {e}")
+                    click.echo(f"Failed to remove container {name}: {e}")
             if removed > 0:
                 click.echo(f"Removed {removed} task container(s)")
             else:
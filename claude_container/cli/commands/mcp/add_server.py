@@ -4,7 +4,6 @@ import json
 from pathlib import Path
 
 import click
-from rich.console import Console
 
 from ....utils import MCPManager
 
@@ -29,6 +28,7 @@ def add_server(ctx, name: str, config: str):
         # Load from file
         claude-container mcp add myserver @server-config.json
     """
+    from rich.console import Console  # deferred: rich is slow to import
     console = Console()
     project_root = Path.cwd()
     
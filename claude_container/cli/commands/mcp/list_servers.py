@@ -4,8 +4,6 @@ import json
 from pathlib import Path
 
 import click
-from rich.console import Console
-from rich.table import Table
 
 from ....utils import MCPManager
 
@@ -14,6 +12,9 @@ from ....utils import MCPManager
 @click.pass_context
 def list_servers(ctx):
     """List all registered MCP servers."""
+    # deferred: rich is slow to import
+    from rich.console import Console
+    from rich.table import Table
     console = Console()
     project_root = Path.cwd()
     
@@ -3,8 +3,6 @@
 from pathlib import Path
 
 import click
-from rich.console import Console
-from rich.prompt import Confirm
 
 from ....utils import MCPManager
 
@@ -15,6 +13,9 @@ from ....utils import MCPManager
 @click.pass_context
 def remove_server(ctx, name: str, yes: bool):
     """Remove an MCP server configuration."""
+    # deferred: rich is slow to import
+    from rich.console import Console
+    from rich.prompt import Confirm
     console = Console()
     project_root = Path.cwd()
     
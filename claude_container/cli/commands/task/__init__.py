@@ -13,6 +13,7 @@ from .search import search
 from .history import history
 from .cleanup import cleanup
 from .debug_settings import debug_settings
+from .warmup import warmup
 
 __all__ = [
     'task',
@@ -27,6 +28,7 @@ __all__ = [
     'history',
     'cleanup',
     'debug_settings',
+    'warmup',
 ]
 
 
@@ -47,4 +49,5 @@ task.add_command(logs)
 task.add_command(search)
 task.add_command(history)
 task.add_command(cleanup)
-task.add_command(debug_settings)
\ No newline at end of file
+task.add_command(debug_settings)
+task.add_command(warmup)
\ No newline at end of file
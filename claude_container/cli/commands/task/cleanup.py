@@ -3,8 +3,8 @@
 import click
 import sys
 from pathlib import Path
-from tabulate import tabulate
 
+from claude_container.cli.helpers import CONTAINER_STATUS_COLORS, get_docker_service, print_table
 from ....core.constants import CONTAINER_PREFIX
 from ....services.docker_service import DockerService
 from ....services.exceptions import DockerServiceError
@@ -17,20 +17,20 @@ def cleanup(force):
     project_root = Path.cwd()
     
     try:
-        docker_service = DockerService()
+        docker_service = get_docker_service()
         
-        # List containers for this project
+        # List task containers for this project; the daemon does the filtering
         containers = docker_service.list_containers(
             all=True,
             labels={
                 "claude-container": "true",
                 "claude-container-project": project_root.name.lower()
-            }
+            },
+            sparse=True,
+            name_prefix=f"{CONTAINER_PREFIX}-task"
         )
-        
-        # Filter by name prefix
-        name_prefix = f"{CONTAINER_PREFIX}-task"
-        containers = [c for c in containers if c.name.startswith(name_prefix)]
+        # Sparse containers only carry list-endpoint attrs
+        containers = [(c, DockerService.container_name(c)) for c in containers]
         
         if not containers:
             click.echo(f"No task containers found for project '{project_root.name}'")
@@ -41,29 +41,20 @@ def cleanup(force):
         
         # Prepare container table data
         container_data = []
-        for container in containers:
+        for container, name in containers:
             status_val = container.status
-            name = container.name
-            created = container.attrs['Created'][:19]
+            created = DockerService.container_created(container)
             
             # Color code status
-            if status_val == 'running':
-                status_display = click.style(status_val.upper(), fg='green')
-            elif status_val == 'exited':
-                status_display = click.style(status_val.upper(), fg='yellow')
-            else:
-                status_display = click.style(status_val.upper(), fg='red')
+            status_display = click.style(
+                status_val.upper(),
+                fg=CONTAINER_STATUS_COLORS.get(status_val, 'red')
+            )
             
             container_data.append([name, status_display, created])
         
         # Print container table
-        container_headers = ["CONTAINER NAME", "STATUS", "CREATED"]
-        container_table = tabulate(
-            container_data,
-            headers=container_headers,
-            tablefmt="simple"
-        )
-        click.echo(container_table)
+        print_table(["CONTAINER NAME", "STATUS", "CREATED"], container_data)
         
         # Confirm removal unless force flag is used
         if not force:
@@ -76,19 +67,19 @@ def cleanup(force):
         removed_count = 0
         failed_count = 0
         
-        for container in containers:
+        for container, name in containers:
             try:
                 # Stop container if running
                 if container.status == 'running':
-                    click.echo(f"  Stopping {container.name}...")
+                    click.echo(f"  Stopping {name}...")
                     container.stop()
                 
                 # Remove container
-                click.echo(f"  Removing {container.name}...")
+                click.echo(f"  Removing {name}...")
                 docker_service.remove_container(container)
                 removed_count += 1
             except Exception as e:
-                click.echo(f"  ❌ Failed to remove {container.name}: {e}", err=True)
+                click.echo(f"  ❌ Failed to remove {name}: {e}", err=True)
                 failed_count += 1
         
         # Summary
@@ -1,32 +1,18 @@
 """Continue task command."""
 
-import json
 import click
+import json
+import shlex
 import sys
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 
-import questionary
-from rich.console import Console
-
-from ....core.container_runner import ContainerRunner
-from ....core.constants import CONTAINER_PREFIX, DATA_DIR_NAME, DEFAULT_WORKDIR, MCP_CONFIG_PATH, CLAUDE_SKIP_PERMISSIONS_FLAG, CLAUDE_PERMISSIONS_ERROR
-from ....core.task_storage import TaskStorageManager
-from ....models.task import TaskStatus
-from ....utils import MCPManager
+from ....core.constants import (
+    CONTAINER_PREFIX, DATA_DIR_NAME, DEFAULT_WORKDIR, MCP_CONFIG_PATH,
+    TASK_ID_LABEL, TASK_DESCRIPTION_PATH
+)
 from ...commands.auth_check import check_claude_auth
-from ...util import get_feedback_from_editor
-from claude_container.cli.helpers.claude_output_parser import parse_claude_stream_json
-
-
-def _get_exec_result(result):
-    """Helper to handle both test mock and real docker exec result formats."""
-    if hasattr(result, 'exit_code'):
-        # Test mock format
-        return result.exit_code, result.output
-    else:
-        # Real docker exec_run returns (exit_code, output)
-        return result
 
 
 @click.command(name='continue')
@@ -34,8 +20,20 @@ def _get_exec_result(result):
 @click.option('--feedback', '-f', help='Inline feedback string')
 @click.option('--feedback-file', type=click.Path(exists=True), help='File containing feedback')
 @click.option('--mcp', help='Comma-separated list of MCP servers to use (overrides previous selection)')
-def continue_task(task_identifier, feedback, feedback_file, mcp):
+@click.option('--fresh', is_flag=True, help='Always start a new container instead of reusing a running one')
+@click.option('--keep-container', is_flag=True,
+              help='Leave a newly created container running so later continuations can reuse it')
+def continue_task(task_identifier, feedback, feedback_file, mcp, fresh, keep_container):
     """Continue an existing task with additional feedback"""
+    # deferred: task models and helpers pull in pydantic and the Docker SDK,
+    # which other commands should not pay for at startup
+    from ....models.task import TaskStatus
+    from ...util import get_feedback_from_editor
+    from claude_container.cli.helpers import BANNER, get_task_storage
+    from claude_container.cli.helpers.claude_output_parser import (
+        CHANGE_MARKER_INSTRUCTION, find_change_marker
+    )
+    
     # Verify Claude authentication
     if not check_claude_auth():
         sys.exit(1)
@@ -49,7 +47,7 @@ def continue_task(task_identifier, feedback, feedback_file, mcp):
         sys.exit(1)
     
     # Initialize storage manager
-    storage_manager = TaskStorageManager(data_dir)
+    storage_manager = get_task_storage(data_dir)
     
     # Look up task (by ID or PR URL)
     if task_identifier.startswith("http"):
@@ -59,33 +57,22 @@ def continue_task(task_identifier, feedback, feedback_file, mcp):
             sys.exit(1)
     else:
         # Try full ID first, then short ID
-        task_metadata = storage_manager.get_task(task_identifier)
-        if not task_metadata:
-            # Try to find by short ID
-            all_tasks = storage_manager.list_tasks()
-            matching_tasks = [t for t in all_tasks if t.id.startswith(task_identifier)]
-            if len(matching_tasks) == 1:
-                task_metadata = matching_tasks[0]
-            elif len(matching_tasks) > 1:
-                click.echo(f"Error: Multiple tasks found starting with '{task_identifier}'", err=True)
-                for t in matching_tasks:
-                    click.echo(f"  - {t.id[:8]}: {t.description.split()[0]}...")
-                sys.exit(1)
-            else:
-                click.echo(f"Error: No task found with ID: {task_identifier}", err=True)
-                sys.exit(1)
+        from claude_container.cli.helpers import resolve_task_id
+        task_metadata = resolve_task_id(storage_manager, task_identifier)
     
-    click.echo(f"\n📋 Continuing task {task_metadata.id[:8]}")
-    click.echo(f"   Branch: {task_metadata.branch_name}")
-    click.echo(f"   Description: {task_metadata.description.split(chr(10))[0]}...")
+    summary = (
+        f"\n📋 Continuing task {task_metadata.id[:8]}\n"
+        f"   Branch: {task_metadata.branch_name}\n"
+        f"   Description: {task_metadata.description.partition(chr(10))[0]}..."
+    )
     if task_metadata.pr_url:
-        click.echo(f"   PR: {task_metadata.pr_url}")
-    click.echo(f"   Continuations: {task_metadata.continuation_count}")
+        summary += f"\n   PR: {task_metadata.pr_url}"
+    summary += f"\n   Continuations: {task_metadata.continuation_count}"
+    click.echo(summary)
     
     # Get feedback
     if feedback_file:
-        with open(feedback_file, 'r') as f:
-            feedback_content = f.read().strip()
+        feedback_content = Path(feedback_file).read_text(encoding='utf-8').strip()
         feedback_type = "file"
     elif feedback:
         feedback_content = feedback
@@ -98,7 +85,8 @@ def continue_task(task_identifier, feedback, feedback_file, mcp):
             feedback_content = click.prompt("Feedback")
         feedback_type = "text"
     
-    if not feedback_content or feedback_content.isspace():
+    feedback_content = (feedback_content or "").strip()
+    if not feedback_content:
         click.echo("\nError: Feedback cannot be empty.", err=True)
         sys.exit(1)
     
@@ -107,37 +95,61 @@ def continue_task(task_identifier, feedback, feedback_file, mcp):
     
     image_name = f"{CONTAINER_PREFIX}-{project_root.name}".lower()
     
-    # Initialize container runner
+    # Initialize container runner (deferred import pulls in the Docker SDK)
+    from claude_container.cli.helpers import (
+        BackgroundLogWriter, check_claude_permissions, commit_task_changes, get_container_runner,
+        get_mcp_manager, is_verbose, parse_commit_log, run_claude_streaming, COMMIT_LOG_COMMAND
+    )
+    from ....services.exceptions import DockerServiceError
     try:
-        container_runner = ContainerRunner(project_root, data_dir, image_name)
-    except RuntimeError as e:
+        container_runner = get_container_runner(project_root, data_dir, image_name)
+    except (RuntimeError, DockerServiceError) as e:
         click.echo(f"Error initializing container: {e}", err=True)
         sys.exit(1)
     
+    # Start the independent registry and image digest lookups in the background
+    # and only block on each when its value is needed. A previous MCP selection
+    # is reused as-is unless --mcp overrides it, so the registry isn't read then.
+    mcp_manager = get_mcp_manager(project_root)
+    startup_pool = ThreadPoolExecutor(max_workers=2)
+    servers_future = None
+    if mcp or not task_metadata.mcp_servers:
+        servers_future = startup_pool.submit(mcp_manager.list_servers)
+    digest_future = startup_pool.submit(container_runner.docker_service.get_image_digest, image_name)
+    startup_pool.shutdown(wait=False)
+    
     # Verify container image exists
     if not container_runner.docker_service.image_exists(image_name):
         click.echo(f"Error: Container image '{image_name}' not found.", err=True)
         sys.exit(1)
     
     container = None
+    created_container = False
+    log_writer = BackgroundLogWriter(storage_manager)
+    # Metadata changes made during the run are written once at the end
+    task_updates = storage_manager.batch_update(task_metadata.id)
     try:
         click.echo(f"\n🚀 Continuing task on branch '{task_metadata.branch_name}'...\n")
         
-        # Create persistent container
-        container = container_runner.create_persistent_container("task", user="node")
+        # Reuse a container kept running for this task, or create a new one
+        if not fresh:
+            container = container_runner.find_task_container(task_metadata.id)
+        if container:
+            click.echo(f"♻️  Reusing running container {container.name}")
+        else:
+            container = container_runner.create_persistent_container(
+                "task", user="node", labels={TASK_ID_LABEL: task_metadata.id}
+            )
+            created_container = True
         storage_manager.update_task(task_metadata.id, container_id=container.id)
         
-        # Check if permissions are accepted
-        click.echo("🔍 Checking Claude permissions...")
-        test_result = container_runner.exec_in_container_as_user(
-            container,
-            ["claude", "-p", "echo test", CLAUDE_SKIP_PERMISSIONS_FLAG],
-            user='node',
-            workdir=DEFAULT_WORKDIR
-        )
+        # Run the short git commands below through one shell instead of an exec each
+        container_runner.open_shell(container)
         
-        exit_code, output = _get_exec_result(test_result)
-        if exit_code != 0 and CLAUDE_PERMISSIONS_ERROR in output.decode():
+        # Check if permissions are accepted (a reused container already passed)
+        if created_container and not check_claude_permissions(
+            container_runner, container, image_digest=digest_future.result()
+        ):
             click.echo("❌ Claude permissions have not been accepted yet.", err=True)
             click.echo("Please run 'claude-container accept-permissions' first.", err=True)
             
@@ -146,155 +158,160 @@ def continue_task(task_identifier, feedback, feedback_file, mcp):
             container.remove()
             raise click.Abort()
         
+        # Fetch, checkout and pull the task branch in a single exec, in the
+        # background while MCP servers are selected and configured. Only the
+        # task branch is fetched, so checkout can find it in a new container
+        branch = shlex.quote(task_metadata.branch_name)
+        click.echo(f"📥 Fetching and checking out branch '{task_metadata.branch_name}'...")
+        sync_pool = ThreadPoolExecutor(max_workers=1)
+        sync_future = sync_pool.submit(
+            container_runner.run_batched,
+            container,
+            [
+                ("fetch", f"git fetch origin {branch}"),
+                ("checkout", f"git checkout {branch}"),
+                ("pull", f"git pull origin {branch}"),
+            ],
+            user='node',
+            workdir=DEFAULT_WORKDIR,
+            stop_on_failure=("checkout",)
+        )
+        sync_pool.shutdown(wait=False)
+        
         # Handle MCP server selection
-        console = Console()
-        mcp_manager = MCPManager(project_root)
         selected_servers = []
         
         try:
-            all_servers = mcp_manager.list_servers()
+            all_servers = servers_future.result() if servers_future else []
             
             if mcp:
                 # Use provided server list (overrides previous selection)
                 requested = [s.strip() for s in mcp.split(',')]
-                missing = mcp_manager.validate_server_names(requested)
+                missing = mcp_manager.validate_server_names(requested, all_servers)
                 
                 if missing:
-                    console.print(f"[red]Error: Unknown MCP servers: {', '.join(missing)}[/red]")
-                    console.print(f"Available servers: {', '.join(all_servers)}")
+                    click.secho(f"Error: Unknown MCP servers: {', '.join(missing)}", fg='red')
+                    click.echo(f"Available servers: {', '.join(all_servers)}")
                     sys.exit(1)
                 
                 selected_servers = requested
-                console.print(f"[green]Using MCP servers: {', '.join(selected_servers)}[/green]")
+                click.secho(f"Using MCP servers: {', '.join(selected_servers)}", fg='green')
                 
                 # Update task metadata with new selection
-                storage_manager.update_task(task_metadata.id, mcp_servers=selected_servers)
+                task_updates.update(mcp_servers=selected_servers)
             
             elif task_metadata.mcp_servers:
                 # Use servers from previous task run
                 selected_servers = task_metadata.mcp_servers
-                console.print(f"[green]Using MCP servers from previous run: {', '.join(selected_servers)}[/green]")
+                click.secho(f"Using MCP servers from previous run: {', '.join(selected_servers)}", fg='green')
             
             elif all_servers and sys.stdin.isatty():
                 # Interactive mode - show prompt
-                console.print("\n[cyan]Select MCP servers to use for this task:[/cyan]")
-                console.print("[dim]Previous selection: None[/dim]")
+                click.secho("\nSelect MCP servers to use for this task:", fg='cyan')
+                click.secho("Previous selection: None", dim=True)
                 
                 # Add "All servers" option at the top
                 choices = ["All servers"] + all_servers
+                import questionary  # deferred: pulls in prompt_toolkit
                 selected = questionary.checkbox(
                     "Available servers:",
                     choices=choices
                 ).ask()
                 
                 if selected is None:
-                    console.print("[yellow]No servers selected, continuing without MCP[/yellow]")
+                    click.secho("No servers selected, continuing without MCP", fg='yellow')
                 elif "All servers" in selected:
                     selected_servers = all_servers
-                    console.print(f"[green]Using all MCP servers: {', '.join(selected_servers)}[/green]")
+                    click.secho(f"Using all MCP servers: {', '.join(selected_servers)}", fg='green')
                 else:
                     selected_servers = selected
-                    console.print(f"[green]Using MCP servers: {', '.join(selected_servers)}[/green]")
+                    click.secho(f"Using MCP servers: {', '.join(selected_servers)}", fg='green')
                 
                 # Update task metadata with new selection
                 if selected_servers:
-                    storage_manager.update_task(task_metadata.id, mcp_servers=selected_servers)
+                    task_updates.update(mcp_servers=selected_servers)
             
             else:
                 # Non-interactive mode - use all available if no previous selection
                 selected_servers = all_servers
                 if selected_servers:
-                    console.print(f"[green]Using all available MCP servers: {', '.join(selected_servers)}[/green]")
-                    storage_manager.update_task(task_metadata.id, mcp_servers=selected_servers)
+                    click.secho(f"Using all available MCP servers: {', '.join(selected_servers)}", fg='green')
+                    task_updates.update(mcp_servers=selected_servers)
         
         except Exception as e:
-            console.print(f"[yellow]Warning: Failed to load MCP servers: {e}[/yellow]")
+            click.secho(f"Warning: Failed to load MCP servers: {e}", fg='yellow')
             # Continue without MCP servers
         
+        # Files for the container are collected and written in a single exec
+        container_files = {}
+        
         # Write MCP configuration if servers are selected
         mcp_path = None
         if selected_servers:
             click.echo("🔧 Configuring MCP servers...")
             try:
-                # Get filtered registry with only selected servers
-                filtered_registry = mcp_manager.filter_registry(selected_servers)
-                mcp_config = filtered_registry.to_mcp_json()
-                mcp_config_str = json.dumps(mcp_config, indent=2)
+                # Get serialized config with only selected servers (cached on disk)
+                mcp_config_str = mcp_manager.get_mcp_config_json(selected_servers)
                 
                 # Debug: Show MCP configuration
-                click.echo("\n📋 MCP Configuration:")
-                click.echo("-" * 60)
-                click.echo(mcp_config_str)
-                click.echo("-" * 60)
+                if is_verbose():
+                    mcp_config_display = json.dumps(json.loads(mcp_config_str), indent=2)
+                    click.echo(f"\n📋 MCP Configuration:\n{BANNER}\n{mcp_config_display}\n{BANNER}")
                 
                 # Write MCP configuration to container (outside workspace to avoid commits)
                 mcp_path = f"/tmp/{MCP_CONFIG_PATH}"
                 click.echo(f"\n📝 Writing MCP config to: {mcp_path}")
-                container_runner.write_file(container, mcp_path, mcp_config_str)
-                
-                # Verify file was written
-                verify_result = container_runner.exec_in_container_as_user(
-                    container,
-                    f"cat {mcp_path}",
-                    user='node',
-                    workdir=DEFAULT_WORKDIR
-                )
-                exit_code, output = _get_exec_result(verify_result)
-                if exit_code == 0:
-                    click.echo("✅ MCP config file verified in container")
-                else:
-                    click.echo(f"❌ Failed to verify MCP config file: {output.decode()}")
-                
-                click.echo(f"✅ Configured {len(selected_servers)} MCP server(s)")
+                container_files[mcp_path] = mcp_config_str
             except Exception as e:
                 click.echo(f"⚠️  Warning: Failed to configure MCP servers: {e}", err=True)
                 mcp_path = None
         
-        # Fetch latest remote changes first
-        click.echo("📥 Fetching latest remote changes...")
-        fetch_result = container_runner.exec_in_container_as_user(
-            container,
-            "git fetch --all",
-            user='node',
-            workdir=DEFAULT_WORKDIR
-        )
+        # The description is constant across continuations, so it lives in a file
+        # on the container (written once per container) rather than in the prompt
+        description_in_file = not created_container
+        if created_container:
+            container_files[TASK_DESCRIPTION_PATH] = task_metadata.description
+        
+        if container_files:
+            try:
+                container_runner.stream_files(container, container_files)
+                description_in_file = True
+                if mcp_path:
+                    click.echo(
+                        f"✅ MCP config file verified in container\n"
+                        f"✅ Configured {len(selected_servers)} MCP server(s)"
+                    )
+            except Exception as e:
+                click.echo(f"⚠️  Warning: Failed to write container files, sending the description inline: {e}", err=True)
+                mcp_path = None
+        
+        # Wait for the branch sync started before MCP setup
+        sync_results = sync_future.result()
         
-        exit_code, output = _get_exec_result(fetch_result)
+        exit_code, output = sync_results["fetch"]
         if exit_code != 0:
             click.echo(f"⚠️  Warning: Failed to fetch remote changes\n{output.decode()}", err=True)
         
         # Checkout the branch (it should exist since this is a continue operation)
-        click.echo(f"🌿 Checking out branch '{task_metadata.branch_name}'...")
-        checkout_result = container_runner.exec_in_container_as_user(
-            container,
-            f"git checkout {task_metadata.branch_name}",
-            user='node',
-            workdir=DEFAULT_WORKDIR
-        )
-        
-        exit_code, output = _get_exec_result(checkout_result)
+        exit_code, output = sync_results.get("checkout", (1, b""))
         if exit_code != 0:
             click.echo(f"\n❌ Error: Failed to checkout branch\n{output.decode()}", err=True)
             raise Exception("Failed to checkout branch")
         
         # Pull latest changes from the remote feature branch
-        click.echo(f"📥 Pulling latest changes from origin/{task_metadata.branch_name}...")
-        pull_result = container_runner.exec_in_container_as_user(
-            container,
-            f"git pull origin {task_metadata.branch_name}",
-            user='node',
-            workdir=DEFAULT_WORKDIR
-        )
-        
-        exit_code, output = _get_exec_result(pull_result)
+        exit_code, output = sync_results["pull"]
         if exit_code != 0:
             click.echo(f"⚠️  Warning: Failed to pull latest changes\n{output.decode()}", err=True)
             # Continue anyway, as the branch might not have been pushed yet
+        else:
+            click.echo(f"📥 Pulled latest changes from origin/{task_metadata.branch_name}")
         
         # Build context for Claude
-        full_context = f"""You are continuing work on a task. Here is the original task description:
-
-{task_metadata.description}
+        if description_in_file:
+            task_context = f"The original task description is in {TASK_DESCRIPTION_PATH}. Read it first."
+        else:
+            task_context = f"Here is the original task description:\n\n{task_metadata.description}"
+        full_context = f"""You are continuing work on a task. {task_context}
 
 The task has been worked on {task_metadata.continuation_count - 1} time(s) before.
 
@@ -303,187 +320,112 @@ Here is the new feedback/requirements:
 {feedback_content}
 
 Please continue working on this task based on the feedback provided."""
+        full_context += CHANGE_MARKER_INSTRUCTION
         
         # Execute Claude with context
-        click.echo("\n🤖 Running Claude with feedback...")
-        click.echo("\n" + "-" * 60)
-        click.echo("Claude is working on your task...")
-        click.echo("-" * 60 + "\n")
-        
-        # Build Claude command with optional MCP config
-        claude_cmd = ["claude", "--model=opus", "-p", full_context, "--output-format", "stream-json", "--verbose", CLAUDE_SKIP_PERMISSIONS_FLAG]
-        if mcp_path:
-            claude_cmd.extend(["--mcp-config", mcp_path])
-        
-        # Debug: Show the full command
-        click.echo("\n🔍 Claude command:")
-        click.echo(f"   {' '.join(claude_cmd[:6])}... [truncated]")
-        if mcp_path:
-            click.echo(f"   MCP config: {mcp_path}")
-        
-        claude_output = []
-        claude_result = container_runner.exec_in_container_as_user(
-            container,
-            claude_cmd,
-            user='node',
-            workdir=DEFAULT_WORKDIR,
-            stream=True
-        )
-        
-        # For streaming results, we need to handle the output differently
-        if hasattr(claude_result, 'output'):
-            # Mock result format
-            output_stream = claude_result.output
-        else:
-            # Real docker format - when stream=True, it returns a generator directly
-            output_stream = claude_result
-        
-        # Parse the stream-json output
-        raw_output, json_messages = parse_claude_stream_json(output_stream, echo_to_screen=True)
+        click.echo(f"\n🤖 Running Claude with feedback...\n\n{BANNER}\nClaude is working on your task...\n{BANNER}\n")
         
-        # Save output (raw JSON)
-        storage_manager.save_task_log(
-            task_metadata.id, 
-            f"claude_output_cont_{task_metadata.continuation_count}", 
-            ''.join(raw_output)
+        json_messages = run_claude_streaming(
+            container_runner, container, full_context, mcp_path, log_writer,
+            task_metadata.id, f"claude_output_cont_{task_metadata.continuation_count}",
+            show_command=True
         )
         
         # Commit changes
-        click.echo("\n\n💾 Having Claude commit the changes...")
-        
-        status_result = container_runner.exec_in_container_as_user(
-            container,
-            "git status --porcelain",
-            user='node',
-            workdir=DEFAULT_WORKDIR
-        )
+        click.echo("\n\n💾 Committing the changes...")
         
-        exit_code, output = _get_exec_result(status_result)
-        # Handle case where output might be an iterator (shouldn't happen for non-streaming commands)
-        if hasattr(output, '__iter__') and not isinstance(output, (bytes, str)):
-            # Consume the iterator and join the results
-            output = b''.join(output)
-        
-        if not output.strip():
-            click.echo("ℹ️  No changes to commit")
-        else:
-            commit_prompt = f"""Please commit all the changes you made. Review the changes with git diff and git status, then create a semantic commit message following the Conventional Commits specification.
-
-Use one of these types: feat, fix, docs, style, refactor, test, chore, perf, build, ci
-Format: <type>(<scope>): <description>
-
-Examples:
-- feat(auth): add OAuth2 login support
-- fix(api): resolve null pointer in user service
-- docs(readme): update installation instructions
-- refactor(core): simplify error handling logic
-
-Feedback context: {feedback_content}
-
-Create a concise, semantic commit message that describes what was accomplished. Do NOT include any attribution, emojis, or Co-Authored-By lines."""
-            
-            click.echo("\n🤖 Asking Claude to commit the changes...")
-            click.echo("-" * 60 + "\n")
-            
-            # Build Claude command with optional MCP config
-            commit_cmd = ["claude", "--model=opus", "-p", commit_prompt, "--output-format", "stream-json", "--verbose", CLAUDE_SKIP_PERMISSIONS_FLAG]
-            if mcp_path:
-                commit_cmd.extend(["--mcp-config", mcp_path])
-            
-            commit_output = []
-            commit_result = container_runner.exec_in_container_as_user(
+        # Claude's own report is only trusted when it says files changed, so a
+        # wrong "no changes" can never skip committing real work
+        has_changes = find_change_marker(json_messages)
+        if not has_changes:
+            status_result = container_runner.exec_in_container_as_user(
                 container,
-                commit_cmd,
+                "git status --porcelain",
                 user='node',
-                workdir=DEFAULT_WORKDIR,
-                stream=True
-            )
-            
-            # For streaming results, we need to handle the output differently
-            if hasattr(commit_result, 'output'):
-                # Mock result format
-                output_stream = commit_result.output
-            else:
-                # Real docker format - when stream=True, it returns a generator directly
-                output_stream = commit_result
-            
-            # Parse the stream-json output
-            raw_output, json_messages = parse_claude_stream_json(output_stream, echo_to_screen=True)
-            
-            # Save commit output (raw JSON)
-            storage_manager.save_task_log(
-                task_metadata.id,
-                f"claude_commit_cont_{task_metadata.continuation_count}",
-                ''.join(raw_output)
+                workdir=DEFAULT_WORKDIR
             )
             
-            # Check if a commit was actually made
-            get_commit_msg = container_runner.exec_in_container_as_user(
-                container,
-                "git log -1 --pretty=%B",
-                user='node',
-                workdir=DEFAULT_WORKDIR
+            # Non-streaming exec output is already bytes; no decode is needed
+            has_changes = bool(status_result.output.strip())
+        
+        if not has_changes:
+            click.echo("ℹ️  No changes to commit")
+        else:
+            # Commit with git directly; Claude only writes the message. The
+            # same exec records and pushes the commit if one was made
+            commit_results = commit_task_changes(
+                container_runner, container, feedback_content, log_writer,
+                task_metadata.id, f"claude_commit_cont_{task_metadata.continuation_count}",
+                base_ref=f"origin/{task_metadata.branch_name}",
+                then=[
+                    ("log", COMMIT_LOG_COMMAND),
+                    ("push", "git push"),
+                ]
             )
             
-            exit_code, output = _get_exec_result(get_commit_msg)
-            if exit_code == 0:
+            # The follow-up steps only ran if there was a commit to push,
+            # including ones Claude made itself
+            if commit_results["commit"][0] == 0 and "log" not in commit_results:
+                click.echo("ℹ️  No changes to commit")
+            elif commit_results["commit"][0] == 0:
                 click.echo("\n\n✅ Changes committed successfully")
                 
-                # Get commit hash
-                get_commit_hash = container_runner.exec_in_container_as_user(
-                    container,
-                    "git rev-parse HEAD",
-                    user='node',
-                    workdir=DEFAULT_WORKDIR
-                )
-                exit_code, output = _get_exec_result(get_commit_hash)
+                # Only the hash is recorded; the message itself is not shown
+                exit_code, output = commit_results["log"]
                 if exit_code == 0:
-                    commit_hash = output.decode().strip()
-                    storage_manager.update_task(task_metadata.id, commit_hash=commit_hash)
+                    commit_hash, _ = parse_commit_log(output)
+                    task_updates.update(commit_hash=commit_hash)
                 
                 # Push changes
                 click.echo(f"\n📤 Pushing changes to branch '{task_metadata.branch_name}'...")
-                push_result = container_runner.exec_in_container_as_user(
-                    container,
-                    "git push",
-                    user='node',
-                    workdir=DEFAULT_WORKDIR
-                )
-                
-                exit_code, output = _get_exec_result(push_result)
+                exit_code, output = commit_results["push"]
                 if exit_code != 0:
                     click.echo(f"\n⚠️  Warning: Failed to push\n{output.decode()}", err=True)
                 else:
                     click.echo("✅ Changes pushed successfully")
             else:
                 click.echo("\n\n⚠️  Warning: No commit was made")
-                click.echo("ℹ️  Claude may not have executed the commit command")
+                click.echo("ℹ️  git commit did not complete; see the commit log for details")
         
         # Update task status
-        storage_manager.update_task(task_metadata.id, 
-                                    completed_at=datetime.now(),
-                                    container_id=None)
+        task_updates.update(completed_at=datetime.now(), container_id=None)
+        task_updates.flush()
         
-        click.echo("\n🎉 Task continuation completed!")
-        click.echo(f"   Task ID: {task_metadata.id[:8]}")
-        click.echo(f"   Branch: {task_metadata.branch_name}")
+        completion = (
+            f"\n🎉 Task continuation completed!\n"
+            f"   Task ID: {task_metadata.id[:8]}\n"
+            f"   Branch: {task_metadata.branch_name}"
+        )
         if task_metadata.pr_url:
-            click.echo(f"   PR: {task_metadata.pr_url}")
+            completion += f"\n   PR: {task_metadata.pr_url}"
+        click.echo(completion)
         
     except Exception as e:
         click.echo(f"\n❌ Error during task continuation: {e}", err=True)
-        storage_manager.update_task(task_metadata.id,
-                                    status=TaskStatus.FAILED,
-                                    error_message=str(e),
-                                    container_id=None)
+        task_updates.update(status=TaskStatus.FAILED,
+                            error_message=str(e),
+                            container_id=None)
+        task_updates.flush()
         sys.exit(1)
         
     finally:
         if container:
+            container_runner.close_shell(container)
+        
+        # Only remove containers this invocation created, unless asked to keep them
+        if container and (not created_container or keep_container):
+            click.echo(f"\n📦 Container {container.name} left running for continuations")
+        elif container:
             try:
                 click.echo("\n🧹 Cleaning up resources...")
                 container.stop()
                 container.remove()
                 click.echo("✅ Container removed successfully")
             except Exception as e:
-                click.echo(f"⚠️  Warning: Failed to remove container: {e}", err=True)
\ No newline at end of file
+                click.echo(f"⚠️  Warning: Failed to remove container: {e}", err=True)
+        
+        # Persist anything still pending if the run exited early
+        task_updates.flush()
+        
+        # Logs were written in the background while the container ran
+        log_writer.close()
\ No newline at end of file
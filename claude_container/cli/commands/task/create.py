@@ -1,45 +1,13 @@
 """Create task command."""
 
-import json
 import click
+import json
+import shlex
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-
-import questionary
-from rich.console import Console
-
-from claude_container.cli.helpers import (
-    ensure_authenticated,
-    get_storage_and_runner,
-    cleanup_container
-)
-from claude_container.cli.helpers.claude_output_parser import parse_claude_stream_json
-from ....core.constants import DEFAULT_WORKDIR, MCP_CONFIG_PATH, CLAUDE_SKIP_PERMISSIONS_FLAG, CLAUDE_PERMISSIONS_ERROR
-from ....models.task import TaskStatus
-from ....utils import MCPManager
-from ....services.git_service import GitService, GitServiceError
-from ...util import get_description_from_editor
-
-
-def _get_exec_result(result):
-    """Helper to handle both test mock and real docker exec result formats."""
-    if hasattr(result, 'exit_code'):
-        # Test mock format
-        return result.exit_code, result.output
-    else:
-        # Real docker exec_run returns (exit_code, output)
-        return result
-
-
-def _is_streaming_result(result):
-    """Check if the result is from a streaming command."""
-    if hasattr(result, 'output'):
-        # Mock result - check if output is an iterator
-        return hasattr(result.output, '__iter__') and not isinstance(result.output, (bytes, str))
-    else:
-        # Real docker result - second element would be a generator
-        return hasattr(result[1], '__iter__') and not isinstance(result[1], (bytes, str))
+from pathlib import Path
 
 
 @click.command()
@@ -47,8 +15,38 @@ def _is_streaming_result(result):
 @click.option('--file', '-f', 'description_file', type=click.Path(exists=True), 
               help='File containing task description')
 @click.option('--mcp', help='Comma-separated list of MCP servers to use')
-def create(branch, description_file, mcp):
+@click.option('--keep-container', is_flag=True,
+              help='Leave the task container running so continuations can reuse it')
+@click.option('--force-permissions-check', is_flag=True,
+              help='Probe Claude permissions even if a cached result exists')
+def create(branch, description_file, mcp, keep_container, force_permissions_check):
     """Create a new task and run it to completion"""
+    # deferred: these pull in the Docker SDK, which every other command
+    # would otherwise pay for when the CLI imports this module
+    from claude_container.cli.helpers import (
+        ensure_authenticated,
+        get_mcp_manager,
+        get_storage_and_runner,
+        cleanup_container,
+        check_claude_permissions,
+        BackgroundLogWriter,
+        BANNER,
+        commit_task_changes,
+        parse_commit_log,
+        COMMIT_LOG_COMMAND,
+        is_verbose,
+        run_claude_streaming
+    )
+    from claude_container.cli.helpers.claude_output_parser import (
+        CHANGE_MARKER_INSTRUCTION, find_change_marker
+    )
+    from ....core.constants import DEFAULT_WORKDIR, MCP_CONFIG_PATH, TASK_ID_LABEL, TASK_DESCRIPTION_PATH
+    from ....models.task import TaskStatus
+    from ....services.git_service import local_branch_exists
+    from ....services.github_service import GitHubService, parse_github_repo
+    from ....services.exceptions import GitHubServiceError
+    from ...util import get_description_from_editor
+    
     # Verify Claude authentication
     ensure_authenticated()
     
@@ -57,9 +55,7 @@ def create(branch, description_file, mcp):
     project_root = container_runner.project_root
     
     # Collect task parameters
-    click.echo("\n" + "=" * 60)
-    click.echo("Claude Container Task Setup")
-    click.echo("=" * 60 + "\n")
+    click.echo(f"\n{'=' * 60}\nClaude Container Task Setup\n{'=' * 60}\n")
     
     # Get branch name
     if not branch:
@@ -67,8 +63,7 @@ def create(branch, description_file, mcp):
     
     # Get task description
     if description_file:
-        with open(description_file, 'r') as f:
-            task_description = f.read().strip()
+        task_description = Path(description_file).read_text(encoding='utf-8').strip()
     else:
         # Try to get description from editor first
         click.echo("\nOpening editor for task description...")
@@ -78,18 +73,28 @@ def create(branch, description_file, mcp):
             # Fall back to simple prompt
             task_description = click.prompt("Task description")
     
-    # Validate user inputs
-    if not branch or branch.isspace():
+    # Validate user inputs; surrounding whitespace would otherwise reach git
+    branch = (branch or "").strip()
+    task_description = (task_description or "").strip()
+    if not branch:
         click.echo("\nError: Branch name cannot be empty.", err=True)
         sys.exit(1)
     
-    if not task_description or task_description.isspace():
+    if not task_description:
         click.echo("\nError: Task description cannot be empty.", err=True)
         sys.exit(1)
     
+    # Ask origin for just this ref instead of fetching every remote. It runs
+    # while the MCP servers are chosen and is only waited on further down
+    remote_branch_check = subprocess.Popen(
+        ["git", "ls-remote", "--exit-code", "--heads", "origin", f"refs/heads/{branch}"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        cwd=project_root
+    )
+    
     # Handle MCP server selection
-    console = Console()
-    mcp_manager = MCPManager(project_root)
+    mcp_manager = get_mcp_manager(project_root)
     selected_servers = []
     
     try:
@@ -98,79 +103,72 @@ def create(branch, description_file, mcp):
         if mcp:
             # Use provided server list
             requested = [s.strip() for s in mcp.split(',')]
-            missing = mcp_manager.validate_server_names(requested)
+            missing = mcp_manager.validate_server_names(requested, all_servers)
             
             if missing:
-                console.print(f"[red]Error: Unknown MCP servers: {', '.join(missing)}[/red]")
-                console.print(f"Available servers: {', '.join(all_servers)}")
+                click.secho(f"Error: Unknown MCP servers: {', '.join(missing)}", fg='red')
+                click.echo(f"Available servers: {', '.join(all_servers)}")
                 sys.exit(1)
             
             selected_servers = requested
-            console.print(f"[green]Using MCP servers: {', '.join(selected_servers)}[/green]")
+            click.secho(f"Using MCP servers: {', '.join(selected_servers)}", fg='green')
         
         elif all_servers and sys.stdin.isatty():
             # Interactive mode - show prompt
-            console.print("\n[cyan]Select MCP servers to use for this task:[/cyan]")
+            click.secho("\nSelect MCP servers to use for this task:", fg='cyan')
             
             # Add "All servers" option at the top
             choices = ["All servers"] + all_servers
+            import questionary  # deferred: pulls in prompt_toolkit
             selected = questionary.checkbox(
                 "Available servers:",
                 choices=choices
             ).ask()
             
             if selected is None:
-                console.print("[yellow]No servers selected, continuing without MCP[/yellow]")
+                click.secho("No servers selected, continuing without MCP", fg='yellow')
             elif "All servers" in selected:
                 selected_servers = all_servers
-                console.print(f"[green]Using all MCP servers: {', '.join(selected_servers)}[/green]")
+                click.secho(f"Using all MCP servers: {', '.join(selected_servers)}", fg='green')
             else:
                 selected_servers = selected
-                console.print(f"[green]Using MCP servers: {', '.join(selected_servers)}[/green]")
+                click.secho(f"Using MCP servers: {', '.join(selected_servers)}", fg='green')
         
         else:
             # Non-interactive mode or no servers - use all available
             selected_servers = all_servers
             if selected_servers:
-                console.print(f"[green]Using all available MCP servers: {', '.join(selected_servers)}[/green]")
+                click.secho(f"Using all available MCP servers: {', '.join(selected_servers)}", fg='green')
     
     except Exception as e:
-        console.print(f"[yellow]Warning: Failed to load MCP servers: {e}[/yellow]")
+        click.secho(f"Warning: Failed to load MCP servers: {e}", fg='yellow')
         # Continue without MCP servers
     
     # Check if branch already exists locally or remotely before creating task
     try:
-        # First fetch to ensure we have latest remote info
-        click.echo("\n📥 Fetching latest remote information...")
-        fetch_result = subprocess.run(
-            ["git", "fetch", "--all"],
-            capture_output=True,
-            text=True,
-            cwd=project_root
-        )
-        
-        if fetch_result.returncode != 0:
-            click.echo("⚠️  Warning: Failed to fetch remote information", err=True)
-        
-        # Check for local branch
-        local_branch_check = subprocess.run(
-            ["git", "show-ref", "--verify", "--quiet", f"refs/heads/{branch}"],
-            capture_output=True,
-            cwd=project_root
-        )
-        
-        # Check for remote branch
-        remote_branch_check = subprocess.run(
-            ["git", "show-ref", "--verify", "--quiet", f"refs/remotes/origin/{branch}"],
-            capture_output=True,
-            cwd=project_root
-        )
-        
-        if local_branch_check.returncode == 0 or remote_branch_check.returncode == 0:
+        click.echo("\n📥 Checking remote for existing branch...")
+        # The local ref is read from .git directly; git is only asked when
+        # the refs cannot be read that way
+        local_exists = local_branch_exists(Path(project_root), branch)
+        if local_exists is None:
+            local_exists = bool(subprocess.run(
+                ["git", "for-each-ref", "--format=%(refname)", f"refs/heads/{branch}"],
+                capture_output=True,
+                text=True,
+                cwd=project_root
+            ).stdout.strip())
+        # ls-remote --exit-code exits 2 when the ref is not found
+        remote_returncode = remote_branch_check.wait()
+        remote_exists = remote_returncode == 0
+        
+        if remote_returncode not in (0, 2):
+            click.echo("⚠️  Warning: Failed to query remote origin", err=True)
+        
+        if local_exists or remote_exists:
             click.echo(f"\nError: Branch '{branch}' already exists", err=True)
-            if local_branch_check.returncode == 0:
+            if local_exists:
                 click.echo("  Found as local branch")
-            if remote_branch_check.returncode == 0:
+            if remote_exists:
                 click.echo("  Found on remote origin")
             click.echo("\nUse 'claude-container task continue' to work on an existing task")
             sys.exit(1)
@@ -180,36 +178,40 @@ def create(branch, description_file, mcp):
     
     # Create task record
     task_metadata = storage_manager.create_task(task_description, branch)
+    # Metadata changes are collected and written together
+    task_updates = storage_manager.batch_update(task_metadata.id)
     # Store selected MCP servers
     if selected_servers:
         task_metadata.mcp_servers = selected_servers
-        storage_manager.update_task(task_metadata.id, mcp_servers=selected_servers)
+        task_updates.update(mcp_servers=selected_servers)
     click.echo(f"\n✅ Created task {task_metadata.id[:8]} on branch '{branch}'")
     
     container = None
+    log_writer = BackgroundLogWriter(storage_manager)
     try:
         click.echo(f"\n🚀 Starting task on branch '{branch}'...\n")
         
         # Update task status
-        storage_manager.update_task(task_metadata.id, 
-                                    started_at=datetime.now(),
-                                    status=TaskStatus.CREATED)
-        
-        # Create persistent container for task execution
-        container = container_runner.create_persistent_container("task", user="node")
+        task_updates.update(started_at=datetime.now(), status=TaskStatus.CREATED)
+        task_updates.flush()
+        
+        # Use a container from 'task warmup' if one is waiting. Kept containers
+        # are found again by their task ID label, so they are always new
+        if not keep_container:
+            container = container_runner.claim_warm_container()
+        if container is None:
+            container = container_runner.create_persistent_container(
+                "task", user="node", labels={TASK_ID_LABEL: task_metadata.id}
+            )
         storage_manager.update_task(task_metadata.id, container_id=container.id)
         
-        # Check if permissions are accepted
-        click.echo("🔍 Checking Claude permissions...")
-        test_result = container_runner.exec_in_container_as_user(
-            container,
-            ["claude", "-p", "echo test", CLAUDE_SKIP_PERMISSIONS_FLAG],
-            user='node',
-            workdir=DEFAULT_WORKDIR
-        )
+        # Run the short git commands below through one shell instead of an exec each
+        container_runner.open_shell(container)
         
-        exit_code, output = _get_exec_result(test_result)
-        if exit_code != 0 and CLAUDE_PERMISSIONS_ERROR in output.decode():
+        # Check if permissions are accepted
+        if not check_claude_permissions(
+            container_runner, container, force=force_permissions_check
+        ):
             click.echo("❌ Claude permissions have not been accepted yet.", err=True)
             click.echo("Please run 'claude-container accept-permissions' first.", err=True)
             
@@ -219,270 +221,162 @@ def create(branch, description_file, mcp):
             storage_manager.delete_task(task_metadata.id)
             raise click.Abort()
         
+        # Files for the container are collected and written in a single exec
+        container_files = {}
+        
         # Write MCP configuration if servers are selected
         mcp_path = None
         if selected_servers:
             click.echo("🔧 Configuring MCP servers...")
             try:
-                # Get filtered registry with only selected servers
-                filtered_registry = mcp_manager.filter_registry(selected_servers)
-                mcp_config = filtered_registry.to_mcp_json()
-                mcp_config_str = json.dumps(mcp_config, indent=2)
+                # Get serialized config with only selected servers (cached on disk)
+                mcp_config_str = mcp_manager.get_mcp_config_json(selected_servers)
                 
                 # Debug: Show MCP configuration
-                click.echo("\n📋 MCP Configuration:")
-                click.echo("-" * 60)
-                click.echo(mcp_config_str)
-                click.echo("-" * 60)
+                if is_verbose():
+                    mcp_config_display = json.dumps(json.loads(mcp_config_str), indent=2)
+                    click.echo(f"\n📋 MCP Configuration:\n{BANNER}\n{mcp_config_display}\n{BANNER}")
                 
                 # Write MCP configuration to container (outside workspace to avoid commits)
                 mcp_path = f"/tmp/{MCP_CONFIG_PATH}"
                 click.echo(f"\n📝 Writing MCP config to: {mcp_path}")
-                container_runner.write_file(container, mcp_path, mcp_config_str)
-                
-                # Verify file was written
-                verify_result = container_runner.exec_in_container_as_user(
-                    container,
-                    f"cat {mcp_path}",
-                    user='node',
-                    workdir=DEFAULT_WORKDIR
-                )
-                exit_code, output = _get_exec_result(verify_result)
-                if exit_code == 0:
-                    click.echo("✅ MCP config file verified in container")
-                else:
-                    click.echo(f"❌ Failed to verify MCP config file: {output.decode()}")
-                
-                click.echo(f"✅ Configured {len(selected_servers)} MCP server(s)")
+                container_files[mcp_path] = mcp_config_str
             except Exception as e:
                 click.echo(f"⚠️  Warning: Failed to configure MCP servers: {e}", err=True)
                 mcp_path = None
         
+        # A kept container is reused by continuations, which read the
+        # description from this file instead of resending it in the prompt
+        if keep_container:
+            container_files[TASK_DESCRIPTION_PATH] = task_description
+        
+        if container_files:
+            try:
+                container_runner.stream_files(container, container_files)
+                if mcp_path:
+                    click.echo(
+                        f"✅ MCP config file verified in container\n"
+                        f"✅ Configured {len(selected_servers)} MCP server(s)"
+                    )
+            except Exception as e:
+                click.echo(f"⚠️  Warning: Failed to write container files: {e}", err=True)
+                mcp_path = None
+        
         # Step 1: Git branch setup
         click.echo(f"\n🌿 Setting up branch '{branch}'...")
         
-        # Configure git to trust the workspace directory
-        click.echo("🔧 Configuring git safe directory...")
-        git_config_result = container_runner.exec_in_container_as_user(
-            container,
-            "git config --global --add safe.directory /workspace",
-            user='node',
-            workdir=DEFAULT_WORKDIR
-        )
-        exit_code, output = _get_exec_result(git_config_result)
-        if exit_code != 0:
-            click.echo(f"⚠️  Warning: Failed to configure git safe directory: {output.decode()}")
-        
-        # First, ensure we're on master and pull latest changes
+        # Trust the workspace, update master and create the task branch in a
+        # single exec; a failed checkout or pull stops the remaining steps.
+        # The project is copied into the image rather than bind-mounted, so
+        # the branch has to be created inside the container, not on the host
         click.echo("📥 Switching to master and pulling latest changes...")
-        
-        # Check current branch first
-        current_branch_result = container_runner.exec_in_container_as_user(
+        setup_results = container_runner.run_batched(
             container,
-            "git branch --show-current",
+            [
+                ("safe_directory", "git config --global --add safe.directory /workspace"),
+                ("checkout_master", '[ "$(git branch --show-current)" = master ] || git checkout master'),
+                ("pull", "git pull origin master"),
+                ("branch", f"git checkout -b {shlex.quote(branch)}"),
+            ],
             user='node',
-            workdir=DEFAULT_WORKDIR
+            workdir=DEFAULT_WORKDIR,
+            stop_on_failure=("checkout_master", "pull")
         )
         
-        exit_code, output = _get_exec_result(current_branch_result)
-        current_branch = output.decode().strip() if exit_code == 0 else ""
-        
-        # Only checkout master if we're not already on it
-        if current_branch != "master":
-            master_checkout_result = container_runner.exec_in_container_as_user(
-                container,
-                "git checkout master",
-                user='node',
-                workdir=DEFAULT_WORKDIR
-            )
-            
-            exit_code, output = _get_exec_result(master_checkout_result)
-            if exit_code != 0:
-                click.echo(f"\n❌ Error: Failed to checkout master\n{output.decode()}", err=True)
-                raise Exception("Failed to checkout master branch")
-        else:
-            click.echo("✅ Already on master branch")
+        exit_code, output = setup_results.get("safe_directory", (1, b""))
+        if exit_code != 0:
+            click.echo(f"⚠️  Warning: Failed to configure git safe directory: {output.decode()}")
         
-        # Pull latest changes from master
-        pull_result = container_runner.exec_in_container_as_user(
-            container,
-            "git pull origin master",
-            user='node',
-            workdir=DEFAULT_WORKDIR
-        )
+        exit_code, output = setup_results.get("checkout_master", (1, b""))
+        if exit_code != 0:
+            click.echo(f"\n❌ Error: Failed to checkout master\n{output.decode()}", err=True)
+            raise Exception("Failed to checkout master branch")
         
-        exit_code, output = _get_exec_result(pull_result)
+        exit_code, output = setup_results.get("pull", (1, b""))
         if exit_code != 0:
             click.echo(f"\n❌ Error: Failed to pull latest changes\n{output.decode()}", err=True)
             raise Exception("Failed to pull latest changes from master")
         
         click.echo("✅ Successfully pulled latest changes from master")
         
-        # Create new branch from updated master
-        checkout_result = container_runner.exec_in_container_as_user(
-            container,
-            f"git checkout -b {branch}",
-            user='node',
-            workdir=DEFAULT_WORKDIR
-        )
-        
-        exit_code, output = _get_exec_result(checkout_result)
+        exit_code, output = setup_results.get("branch", (1, b""))
         if exit_code != 0:
             click.echo(f"\n❌ Error: Failed to create branch\n{output.decode()}", err=True)
             raise Exception("Failed to create branch")
         
         # Step 2: Execute Claude task
-        click.echo(f"\n🤖 Running Claude with task:\n   {task_description}")
-        click.echo("\n" + "-" * 60)
-        click.echo("Claude is working on your task...")
-        click.echo("-" * 60 + "\n")
-        
-        # Build full output for logging
-        claude_output = []
-        
-        # Build Claude command with optional MCP config
-        claude_cmd = ["claude", "--model=opus", "-p", task_description, "--output-format", "stream-json", "--verbose", CLAUDE_SKIP_PERMISSIONS_FLAG]
-        if mcp_path:
-            claude_cmd.extend(["--mcp-config", mcp_path])
-        
-        # Debug: Show the full command
-        click.echo("\n🔍 Claude command:")
-        click.echo(f"   {' '.join(claude_cmd[:6])}... [truncated]")
-        if mcp_path:
-            click.echo(f"   MCP config: {mcp_path}")
-        
-        # Execute Claude with the task
-        claude_result = container_runner.exec_in_container_as_user(
-            container,
-            claude_cmd,
-            user='node',
-            workdir=DEFAULT_WORKDIR,
-            stream=True
+        click.echo(
+            f"\n🤖 Running Claude with task:\n   {task_description}\n"
+            f"\n{BANNER}\nClaude is working on your task...\n{BANNER}\n"
         )
         
-        # Stream Claude's output in real-time
-        # For streaming results, we need to handle the output differently
-        if hasattr(claude_result, 'output'):
-            # Mock result format
-            output_stream = claude_result.output
-        else:
-            # Real docker format - when stream=True, it returns a generator directly
-            output_stream = claude_result
-        
-        # Parse the stream-json output
-        raw_output, json_messages = parse_claude_stream_json(output_stream, echo_to_screen=True)
-        
-        # Save Claude output log (raw JSON)
-        storage_manager.save_task_log(task_metadata.id, "claude_output", ''.join(raw_output))
-        
-        # Step 3: Have Claude commit the changes
-        click.echo("\n\n💾 Having Claude commit the changes...")
-        
-        # Check if there are changes to commit
-        status_result = container_runner.exec_in_container_as_user(
-            container,
-            "git status --porcelain",
-            user='node',
-            workdir=DEFAULT_WORKDIR
+        # Run Claude; its raw output is saved to the task log
+        json_messages = run_claude_streaming(
+            container_runner, container, task_description + CHANGE_MARKER_INSTRUCTION, mcp_path,
+            log_writer, task_metadata.id, "claude_output", show_command=True
         )
         
-        exit_code, output = _get_exec_result(status_result)
-        # Handle case where output might be an iterator (shouldn't happen for non-streaming commands)
-        if hasattr(output, '__iter__') and not isinstance(output, (bytes, str)):
-            # Consume the iterator and join the results
-            output = b''.join(output)
+        # Step 3: Commit the changes
+        click.echo("\n\n💾 Committing the changes...")
         
-        if not output or not output.strip():
-            click.echo("ℹ️  No changes to commit")
-            commit_message = None
-        else:
-            # Ask Claude to commit the changes
-            commit_prompt = f"""Please commit all the changes you made. Review the changes with git diff and git status, then create a semantic commit message following the Conventional Commits specification.
-
-Use one of these types: feat, fix, docs, style, refactor, test, chore, perf, build, ci
-Format: <type>(<scope>): <description>
-
-Examples:
-- feat(auth): add OAuth2 login support
-- fix(api): resolve null pointer in user service
-- docs(readme): update installation instructions
-- refactor(core): simplify error handling logic
-
-Task context: {task_description}
-
-Create a concise, semantic commit message that describes what was accomplished. Do NOT include any attribution, emojis, or Co-Authored-By lines."""
-            
-            click.echo("\n🤖 Asking Claude to commit the changes...")
-            click.echo("-" * 60 + "\n")
-            
-            # Build Claude command with optional MCP config
-            commit_cmd = ["claude", "--model=opus", "-p", commit_prompt, "--output-format", "stream-json", "--verbose", CLAUDE_SKIP_PERMISSIONS_FLAG]
-            if mcp_path:
-                commit_cmd.extend(["--mcp-config", mcp_path])
-            
-            commit_output = []
-            commit_result = container_runner.exec_in_container_as_user(
+        # Check if there are changes to commit. Claude's own report is only
+        # trusted when it says files changed, so real work is never skipped
+        has_changes = find_change_marker(json_messages)
+        if not has_changes:
+            status_result = container_runner.exec_in_container_as_user(
                 container,
-                commit_cmd,
+                "git status --porcelain",
                 user='node',
-                workdir=DEFAULT_WORKDIR,
-                stream=True
+                workdir=DEFAULT_WORKDIR
             )
             
-            # Stream Claude's commit output
-            # For streaming results, we need to handle the output differently
-            if hasattr(commit_result, 'output'):
-                # Mock result format
-                output_stream = commit_result.output
-            else:
-                # Real docker format - when stream=True, it returns a generator directly
-                output_stream = commit_result
-            
-            # Parse the stream-json output
-            raw_output, json_messages = parse_claude_stream_json(output_stream, echo_to_screen=True)
-            
-            # Save commit output (raw JSON)
-            storage_manager.save_task_log(task_metadata.id, "claude_commit", ''.join(raw_output))
+            # Non-streaming exec output is already bytes; no decode is needed
+            has_changes = bool(status_result.output.strip())
+        
+        if not has_changes:
+            click.echo("ℹ️  No changes to commit")
+            commit_message = None
+        else:
+            # Commit with git directly; Claude only writes the message. The
+            # same exec reads the commit and pushes the branch, and the GitHub
+            # token is looked up while it runs
+            github = GitHubService()
+            with ThreadPoolExecutor(max_workers=1) as token_pool:
+                token_pool.submit(github.prefetch_token)
+                commit_results = commit_task_changes(
+                    container_runner, container, task_description, log_writer,
+                    task_metadata.id, "claude_commit", base_ref="master",
+                    then=[
+                        ("log", COMMIT_LOG_COMMAND),
+                        ("push", f"git push -u origin {shlex.quote(branch)}"),
+                        ("remote", "git remote get-url origin"),
+                    ]
+                )
             
-            # Extract commit message from the last commit
-            get_commit_msg = container_runner.exec_in_container_as_user(
-                container,
-                "git log -1 --pretty=%B",
-                user='node',
-                workdir=DEFAULT_WORKDIR
-            )
+            # A failed commit skipped the rest of the batch; the changes the
+            # task was run for never reached the branch
+            exit_code, output = commit_results["commit"]
+            if exit_code != 0:
+                click.echo(f"\n❌ Error: Failed to commit changes\n{output.decode(errors='replace')}", err=True)
+                raise Exception("Failed to commit changes")
             
-            exit_code, output = _get_exec_result(get_commit_msg)
-            if exit_code == 0:
-                commit_message = output.decode().strip()
+            # The follow-up steps only ran if there was a commit to push,
+            # including ones Claude made itself
+            if "log" not in commit_results:
+                click.echo("ℹ️  No changes to commit")
+                commit_message = None
+            elif commit_results["log"][0] == 0:
+                commit_hash, commit_message = parse_commit_log(commit_results["log"][1])
                 click.echo("\n\n✅ Changes committed successfully")
-                
-                # Get commit hash
-                get_commit_hash = container_runner.exec_in_container_as_user(
-                    container,
-                    "git rev-parse HEAD",
-                    user='node',
-                    workdir=DEFAULT_WORKDIR
-                )
-                exit_code, output = _get_exec_result(get_commit_hash)
-                if exit_code == 0:
-                    commit_hash = output.decode().strip()
-                    storage_manager.update_task(task_metadata.id, commit_hash=commit_hash)
+                task_updates.update(commit_hash=commit_hash)
             else:
                 click.echo("\n\n⚠️  Warning: Could not retrieve commit message")
                 commit_message = f"Task: {task_description}"
         
-        # Push to remote repository only if there was a commit
+        # The branch was pushed with the commit lookups only if there was a commit
         if commit_message:
             click.echo(f"\n📤 Pushing branch '{branch}' to remote...")
-            push_result = container_runner.exec_in_container_as_user(
-                container,
-                f"git push -u origin {branch}",
-                user='node',
-                workdir=DEFAULT_WORKDIR
-            )
-            
-            exit_code, output = _get_exec_result(push_result)
+            exit_code, output = commit_results["push"]
             if exit_code != 0:
                 click.echo(f"\n❌ Error: Failed to push branch\n{output.decode()}", err=True)
                 raise Exception("Failed to push branch")
@@ -491,61 +385,94 @@ Create a concise, semantic commit message that describes what was accomplished.
             click.echo("\n🔀 Creating pull request...")
             
             # Extract first line of commit message for PR title
-            pr_title = commit_message.split('\n')[0]
+            pr_title = commit_message.partition('\n')[0]
             # Use full commit message in PR body
             pr_body = f"## 📋 Task Description\n\n{task_description}\n\n## 💬 Changes Made\n\n{commit_message}\n\n---\n\n*This PR was created automatically by claude-container task*"
             
+            # Call the GitHub API directly when origin is on github.com and a
+            # token is available; the origin URL came from the batch above
+            _, remote_url = commit_results.get("remote", (1, b""))
             try:
-                pr_result = subprocess.run(
-                    [
-                        "gh", "pr", "create",
-                        "--title", pr_title,
-                        "--body", pr_body,
-                        "--head", branch,
-                        "--draft"
-                    ],
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-                
-                click.echo("\n✅ Pull request created successfully!")
-                click.echo(pr_result.stdout)
-                
-                # Extract PR URL from output
-                pr_url = pr_result.stdout.strip()
-                if pr_url.startswith("https://"):
-                    storage_manager.update_task(task_metadata.id, pr_url=pr_url)
-                
-            except subprocess.CalledProcessError as e:
-                error_msg = e.stderr if e.stderr else str(e)
-                click.echo(f"\n❌ Error: Failed to create PR\n{error_msg}", err=True)
-                click.echo("\nℹ️  Make sure you have the GitHub CLI installed and authenticated")
+                owner, repo = parse_github_repo(remote_url.decode())
+            except GitHubServiceError:
+                owner = repo = None
+            
+            if owner and github.has_token():
+                try:
+                    pr_url = github.create_pull_request(
+                        owner, repo, pr_title, pr_body, head=branch, base="master"
+                    )
+                    
+                    click.echo(f"\n✅ Pull request created successfully!\n{pr_url}")
+                    task_updates.update(pr_url=pr_url)
+                    
+                except GitHubServiceError as e:
+                    click.echo(f"\n❌ Error: Failed to create PR\n{e}", err=True)
+                    click.echo("\nℹ️  Make sure GITHUB_TOKEN is set or the GitHub CLI is authenticated")
+            else:
+                # Fall back to the GitHub CLI, which also knows about hosts
+                # other than github.com
+                try:
+                    pr_result = subprocess.run(
+                        [
+                            "gh", "pr", "create",
+                            "--title", pr_title,
+                            "--body", pr_body,
+                            "--head", branch,
+                            "--draft"
+                        ],
+                        capture_output=True,
+                        text=True,
+                        check=True,
+                        cwd=project_root
+                    )
+                    
+                    click.echo("\n✅ Pull request created successfully!")
+                    click.echo(pr_result.stdout)
+                    pr_url = pr_result.stdout.strip()
+                    if pr_url.startswith("https://"):
+                        task_updates.update(pr_url=pr_url)
+                    
+                except (OSError, subprocess.CalledProcessError) as e:
+                    error_msg = getattr(e, "stderr", None) or str(e)
+                    click.echo(f"\n❌ Error: Failed to create PR\n{error_msg}", err=True)
+                    click.echo("\nℹ️  Make sure GITHUB_TOKEN is set or the GitHub CLI is authenticated")
         else:
             click.echo("\n⚠️  No changes were made, skipping PR creation")
         
         # Mark task as completed
-        storage_manager.update_task(task_metadata.id, 
-                                    completed_at=datetime.now(),
-                                    container_id=None)
-        
-        click.echo("\n🎉 Task completed successfully!")
-        click.echo(f"   Task ID: {task_metadata.id[:8]}")
-        click.echo(f"   Branch: {branch}")
-        if commit_message:
-            click.echo("   Status: PR created and ready for review")
-        else:
-            click.echo("   Status: No changes were made")
+        task_updates.update(completed_at=datetime.now(), container_id=None)
+        task_updates.flush()
+        
+        status = "PR created and ready for review" if commit_message else "No changes were made"
+        click.echo(
+            f"\n🎉 Task completed successfully!\n"
+            f"   Task ID: {task_metadata.id[:8]}\n"
+            f"   Branch: {branch}\n"
+            f"   Status: {status}"
+        )
         
     except Exception as e:
         click.echo(f"\n❌ Error during task execution: {e}", err=True)
-        storage_manager.update_task(task_metadata.id,
-                                    status=TaskStatus.FAILED,
-                                    error_message=str(e),
-                                    completed_at=datetime.now(),
-                                    container_id=None)
+        task_updates.update(status=TaskStatus.FAILED,
+                            error_message=str(e),
+                            completed_at=datetime.now(),
+                            container_id=None)
+        task_updates.flush()
         sys.exit(1)
         
     finally:
         # Step 5: Cleanup
-        cleanup_container(container)
\ No newline at end of file
+        if container:
+            container_runner.close_shell(container)
+        
+        if keep_container and container:
+            click.echo(f"\n📦 Container {container.name} left running for continuations")
+        else:
+            cleanup_container(container)
+        
+        # Persist anything still pending if the run exited early
+        task_updates.flush()
+        
+        # Logs were written in the background while the container ran
+        log_writer.close()
\ No newline at end of file
@@ -5,7 +5,7 @@ import sys
 from pathlib import Path
 
 from ....core.constants import DATA_DIR_NAME
-from ....core.task_storage import TaskStorageManager
+from claude_container.cli.helpers import get_task_storage, resolve_task_id
 
 
 @click.command()
@@ -20,27 +20,15 @@ def delete(task_id):
         click.echo("Error: No container configuration found.", err=True)
         sys.exit(1)
     
-    storage_manager = TaskStorageManager(data_dir)
+    storage_manager = get_task_storage(data_dir)
     
     # Get task to verify it exists
-    task_metadata = storage_manager.get_task(task_id)
-    if not task_metadata:
-        # Try short ID
-        all_tasks = storage_manager.list_tasks()
-        matching_tasks = [t for t in all_tasks if t.id.startswith(task_id)]
-        if len(matching_tasks) == 1:
-            task_metadata = matching_tasks[0]
-            task_id = task_metadata.id
-        elif len(matching_tasks) > 1:
-            click.echo(f"Error: Multiple tasks found starting with '{task_id}'", err=True)
-            sys.exit(1)
-        else:
-            click.echo(f"Error: No task found with ID: {task_id}", err=True)
-            sys.exit(1)
+    task_metadata = resolve_task_id(storage_manager, task_id)
+    task_id = task_metadata.id
     
     # Delete the task
     storage_manager.delete_task(task_id)
     
     click.echo(f"✅ Task {task_id[:8]} deleted successfully")
     click.echo(f"   Branch: {task_metadata.branch_name}")
-    click.echo(f"   Description: {task_metadata.description.split(chr(10))[0]}...")
\ No newline at end of file
+    click.echo(f"   Description: {task_metadata.description.partition(chr(10))[0]}...")
\ No newline at end of file
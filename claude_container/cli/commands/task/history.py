@@ -2,12 +2,11 @@
 
 import click
 import sys
+from collections import Counter
 from pathlib import Path
-from tabulate import tabulate
 
 from ....core.constants import DATA_DIR_NAME
-from ....core.task_storage import TaskStorageManager
-from ....models.task import TaskStatus
+from claude_container.cli.helpers import format_task_table, get_task_storage
 
 
 @click.command()
@@ -22,7 +21,7 @@ def history(limit, branch):
         click.echo("Error: No container configuration found.", err=True)
         sys.exit(1)
     
-    storage_manager = TaskStorageManager(data_dir)
+    storage_manager = get_task_storage(data_dir)
     
     # Get task history
     tasks = storage_manager.get_task_history(limit=limit, branch=branch)
@@ -40,74 +39,14 @@ def history(limit, branch):
     else:
         click.echo(f"\n📋 Task history (showing up to {limit} tasks):")
     
-    # Use the same table formatting as list command
-    table_data = []
-    for task_item in tasks:
-        # Truncate description to first line, max 50 chars
-        desc_line = task_item.description.split('\n')[0]
-        if len(desc_line) > 50:
-            desc_line = desc_line[:47] + "..."
-        
-        # Format status with color
-        status_colors = {
-            TaskStatus.CREATED: 'green',
-            TaskStatus.CONTINUED: 'yellow',
-            TaskStatus.FAILED: 'red'
-        }
-        status_display = click.style(
-            task_item.status.value.upper(), 
-            fg=status_colors.get(task_item.status, 'white')
-        )
-        
-        # Format dates
-        created = task_item.created_at.strftime('%Y-%m-%d %H:%M')
-        
-        # Format PR URL if exists
-        pr_display = ""
-        if task_item.pr_url:
-            # Extract PR number from URL (e.g., https://github.com/owner/repo/pull/123)
-            pr_parts = task_item.pr_url.split('/')
-            if len(pr_parts) >= 2 and pr_parts[-2] == 'pull':
-                pr_number = pr_parts[-1]
-                pr_display = click.style(f"PR #{pr_number}", fg='cyan')
-            else:
-                pr_display = click.style("PR", fg='cyan')
-        
-        # Add continuation count to description if exists
-        if task_item.continuation_count > 0:
-            desc_line += click.style(f" (cont: {task_item.continuation_count})", fg='yellow')
-        
-        # Build row
-        row = [
-            task_item.id[:8],  # Short ID
-            status_display,
-            task_item.branch_name,
-            desc_line,
-            created,
-            pr_display
-        ]
-        
-        table_data.append(row)
-    
-    # Print table with proper alignment
-    headers = ["ID", "STATUS", "BRANCH", "DESCRIPTION", "CREATED", "PR"]
-    table_str = tabulate(
-        table_data, 
-        headers=headers, 
-        tablefmt="simple",
-        colalign=("left", "left", "left", "left", "right", "left")
-    )
-    click.echo(table_str)
+    # Use the same table formatting as list command, counting statuses as we go
+    status_counts = Counter()
+    click.echo(format_task_table(tasks, status_counts=status_counts))
     
     # Display summary
     click.echo(f"\nShowing {len(tasks)} task(s)")
     
     # Show statistics
-    status_counts = {}
-    for task in tasks:
-        status = task.status.value
-        status_counts[status] = status_counts.get(status, 0) + 1
-    
     if len(status_counts) > 1:
         click.echo("\nStatus breakdown:")
         for status, count in sorted(status_counts.items()):
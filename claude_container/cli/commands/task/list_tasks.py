@@ -1,11 +1,12 @@
 """List tasks command."""
 
 import click
-from claude_container.cli.helpers import get_project_context, format_task_table
-from ....core.constants import CONTAINER_PREFIX
+from claude_container.cli.helpers import (
+    CONTAINER_STATUS_COLORS, get_project_context, format_task_table, get_docker_service,
+    get_task_storage, print_table
+)
 from ....services.docker_service import DockerService
 from ....services.exceptions import DockerServiceError
-from ....core.task_storage import TaskStorageManager
 from ....models.task import TaskStatus
 
 
@@ -18,7 +19,7 @@ def list(status):
     
     # Show stored tasks
     if data_dir.exists():
-        storage_manager = TaskStorageManager(data_dir)
+        storage_manager = get_task_storage(data_dir)
         
         # Get tasks with optional status filter
         if status:
@@ -37,21 +38,20 @@ def list(status):
     
     # Also show running containers
     try:
-        docker_service = DockerService()
+        docker_service = get_docker_service()
         
-        # List containers for this project
+        # List this project's task containers; the daemon applies the label
+        # filters and the list response alone is enough for the table
         containers = docker_service.list_containers(
             all=True,
             labels={
                 "claude-container": "true",
+                "claude-container-type": "task",
                 "claude-container-project": project_root.name.lower()
-            }
+            },
+            sparse=True
         )
         
-        # Filter by name prefix
-        name_prefix = f"{CONTAINER_PREFIX}-task"
-        containers = [c for c in containers if c.name.startswith(name_prefix)]
-        
         if containers:
             click.echo("\n🐳 Running task containers:")
             
@@ -59,28 +59,19 @@ def list(status):
             container_data = []
             for container in containers:
                 status_val = container.status
-                name = container.name
-                created = container.attrs['Created'][:19]
-                
-                # Color code status
-                if status_val == 'running':
-                    status_display = click.style(status_val.upper(), fg='green')
-                elif status_val == 'exited':
-                    status_display = click.style(status_val.upper(), fg='yellow')
-                else:
-                    status_display = click.style(status_val.upper(), fg='red')
+                status_display = click.style(
+                    status_val.upper(),
+                    fg=CONTAINER_STATUS_COLORS.get(status_val, 'red')
+                )
                 
-                container_data.append([name, status_display, created])
+                container_data.append([
+                    DockerService.container_name(container),
+                    status_display,
+                    DockerService.container_created(container)
+                ])
             
             # Print container table
-            from tabulate import tabulate
-            container_headers = ["CONTAINER NAME", "STATUS", "CREATED"]
-            container_table = tabulate(
-                container_data,
-                headers=container_headers,
-                tablefmt="simple"
-            )
-            click.echo(container_table)
+            print_table(["CONTAINER NAME", "STATUS", "CREATED"], container_data)
                 
     except DockerServiceError as e:
         click.echo(f"\n⚠️  Warning: Could not list Docker containers: {e}", err=True)
\ No newline at end of file
@@ -1,12 +1,57 @@
 """Logs task command."""
 
 import click
+import os
+import shutil
 import sys
-import subprocess
+import time
+from collections import deque
 from pathlib import Path
 
 from ....core.constants import DATA_DIR_NAME
-from ....core.task_storage import TaskStorageManager
+from claude_container.cli.helpers import get_task_storage, resolve_task_id, format_timestamp
+
+# Read size when copying or following a log
+_LOG_COPY_CHUNK_SIZE = 1 << 16
+# Lines shown before following, as with tail -f
+_FOLLOW_TAIL_LINES = 10
+_FOLLOW_POLL_INTERVAL = 0.25
+
+
+def _print_log(log_file: Path) -> None:
+    """Copy a log file to stdout without reading it into memory.
+    
+    Args:
+        log_file: Log file to print
+    """
+    stdout = click.get_binary_stream('stdout')
+    with open(log_file, 'rb') as f:
+        shutil.copyfileobj(f, stdout, _LOG_COPY_CHUNK_SIZE)
+    stdout.flush()
+    click.echo()
+
+
+def _follow_log(log_file: Path) -> None:
+    """Print the end of a log file, then print whatever is appended to it.
+    
+    Works like ``tail -f`` without spawning it: the open file is read until
+    it runs dry, then polled. A log rewritten in place starts over.
+    
+    Args:
+        log_file: Log file to follow
+    """
+    with open(log_file, 'rb') as f:
+        for line in deque(f, maxlen=_FOLLOW_TAIL_LINES):
+            click.echo(line, nl=False)
+        
+        while True:
+            chunk = f.read(_LOG_COPY_CHUNK_SIZE)
+            if chunk:
+                click.echo(chunk, nl=False)
+            elif os.fstat(f.fileno()).st_size < f.tell():
+                f.seek(0)
+            else:
+                time.sleep(_FOLLOW_POLL_INTERVAL)
 
 
 @click.command()
@@ -24,23 +69,11 @@ def logs(task_id, follow, feedback, log_type, continuation):
         click.echo("Error: No container configuration found.", err=True)
         sys.exit(1)
     
-    storage_manager = TaskStorageManager(data_dir)
+    storage_manager = get_task_storage(data_dir)
     
     # Get task (support short IDs)
-    task_metadata = storage_manager.get_task(task_id)
-    if not task_metadata:
-        # Try to find by short ID
-        all_tasks = storage_manager.list_tasks()
-        matching_tasks = [t for t in all_tasks if t.id.startswith(task_id)]
-        if len(matching_tasks) == 1:
-            task_metadata = matching_tasks[0]
-            task_id = task_metadata.id
-        elif len(matching_tasks) > 1:
-            click.echo(f"Error: Multiple tasks found starting with '{task_id}'", err=True)
-            sys.exit(1)
-        else:
-            click.echo(f"Error: No task found with ID: {task_id}", err=True)
-            sys.exit(1)
+    task_metadata = resolve_task_id(storage_manager, task_id)
+    task_id = task_metadata.id
     
     # Show feedback history if requested
     if feedback:
@@ -52,7 +85,7 @@ def logs(task_id, follow, feedback, log_type, continuation):
         click.echo("=" * 80)
         
         for i, entry in enumerate(task_metadata.feedback_history, 1):
-            click.echo(f"\n[{i}] {entry.timestamp.strftime('%Y-%m-%d %H:%M:%S')} ({entry.feedback_type})")
+            click.echo(f"\n[{i}] {format_timestamp(entry.timestamp)} ({entry.feedback_type})")
             click.echo("-" * 40)
             click.echo(entry.feedback)
             
@@ -69,38 +102,41 @@ def logs(task_id, follow, feedback, log_type, continuation):
         return
     
     # Find all log files
-    log_files = sorted(logs_dir.glob("*.log"))
+    log_names = sorted(entry.name for entry in os.scandir(logs_dir) if entry.name.endswith(".log"))
     
-    if not log_files:
+    if not log_names:
         click.echo(f"No log files found in {logs_dir}")
         return
     
-    # Filter by continuation if specified
-    if continuation is not None:
-        if continuation == 0:
-            # Initial task logs (no continuation suffix)
-            log_files = [f for f in log_files if not f.name.endswith(f"_cont_{continuation}.log") and "cont_" not in f.name]
-        else:
-            # Specific continuation logs
-            log_files = [f for f in log_files if f.name.endswith(f"_cont_{continuation}.log")]
-        
-        if not log_files:
-            click.echo(f"No logs found for continuation {continuation}")
-            return
-    
-    # Group logs by type
+    # Filter by continuation and group logs by type in one pass
+    cont_suffix = f"_cont_{continuation}.log"
+    log_files = []
     output_logs = []
     commit_logs = []
     other_logs = []
     
-    for log_file in log_files:
-        if "claude_output" in log_file.name:
+    for name in log_names:
+        if continuation == 0:
+            # Initial task logs (no continuation suffix)
+            if "cont_" in name:
+                continue
+        elif continuation is not None and not name.endswith(cont_suffix):
+            # Specific continuation logs
+            continue
+        
+        log_file = logs_dir / name
+        log_files.append(log_file)
+        if "claude_output" in name:
             output_logs.append(log_file)
-        elif "claude_commit" in log_file.name:
+        elif "claude_commit" in name:
             commit_logs.append(log_file)
         else:
             other_logs.append(log_file)
     
+    if not log_files:
+        click.echo(f"No logs found for continuation {continuation}")
+        return
+    
     # If there's only one log file, just display it
     if len(log_files) == 1:
         log_file = log_files[0]
@@ -135,8 +171,7 @@ def logs(task_id, follow, feedback, log_type, continuation):
             for log in log_files:
                 click.echo(f"\n\n{'='*20} {log.name} {'='*20}")
                 try:
-                    with open(log, 'r') as f:
-                        click.echo(f.read())
+                    _print_log(log)
                 except Exception as e:
                     click.echo(f"Error reading {log.name}: {e}")
             return
@@ -163,15 +198,14 @@ def logs(task_id, follow, feedback, log_type, continuation):
         click.echo("-" * 80)
     
     if follow:
-        # Follow mode - tail the log file
+        # Follow mode - keep printing as the log grows
         try:
-            subprocess.run(['tail', '-f', str(log_file)], check=True)
+            _follow_log(log_file)
         except KeyboardInterrupt:
             click.echo("\nStopped following logs.")
     else:
         # Just display the contents
         try:
-            with open(log_file, 'r') as f:
-                click.echo(f.read())
+            _print_log(log_file)
         except Exception as e:
             click.echo(f"Error reading log file: {e}", err=True)
\ No newline at end of file
@@ -1,8 +1,7 @@
 """Show task command."""
 
 import click
-from claude_container.cli.helpers import get_project_context, ensure_container_built, resolve_task_id
-from ....core.task_storage import TaskStorageManager
+from claude_container.cli.helpers import get_project_context, ensure_container_built, get_task_storage, resolve_task_id, format_timestamp
 
 
 @click.command()
@@ -13,7 +12,7 @@ def show(task_id, feedback_history):
     project_root, data_dir = get_project_context()
     ensure_container_built(data_dir)
     
-    storage_manager = TaskStorageManager(data_dir)
+    storage_manager = get_task_storage(data_dir)
     
     # Get task (support short IDs)
     task_metadata = resolve_task_id(storage_manager, task_id)
@@ -27,16 +26,16 @@ def show(task_id, feedback_history):
     click.echo(f"   ID: {task_metadata.id}")
     click.echo(f"   Status: {click.style(task_metadata.status.value.upper(), fg='yellow')}")
     click.echo(f"   Branch: {task_metadata.branch_name}")
-    click.echo(f"   Created: {task_metadata.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
+    click.echo(f"   Created: {format_timestamp(task_metadata.created_at)}")
     
     if task_metadata.started_at:
-        click.echo(f"   Started: {task_metadata.started_at.strftime('%Y-%m-%d %H:%M:%S')}")
+        click.echo(f"   Started: {format_timestamp(task_metadata.started_at)}")
     
     if task_metadata.completed_at:
-        click.echo(f"   Completed: {task_metadata.completed_at.strftime('%Y-%m-%d %H:%M:%S')}")
+        click.echo(f"   Completed: {format_timestamp(task_metadata.completed_at)}")
     
     if task_metadata.last_continued_at:
-        click.echo(f"   Last Continued: {task_metadata.last_continued_at.strftime('%Y-%m-%d %H:%M:%S')}")
+        click.echo(f"   Last Continued: {format_timestamp(task_metadata.last_continued_at)}")
     
     click.echo(f"   Continuations: {task_metadata.continuation_count}")
     
@@ -59,6 +58,6 @@ def show(task_id, feedback_history):
     if feedback_history and task_metadata.feedback_history:
         click.echo("\n💬 Feedback History:")
         for i, entry in enumerate(task_metadata.feedback_history, 1):
-            click.echo(f"\n   [{i}] {entry.timestamp.strftime('%Y-%m-%d %H:%M:%S')} ({entry.feedback_type})")
+            click.echo(f"\n   [{i}] {format_timestamp(entry.timestamp)} ({entry.feedback_type})")
             for line in entry.feedback.split('\n'):
                 click.echo(f"       {line}")
\ No newline at end of file
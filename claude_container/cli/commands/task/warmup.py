@@ -0,0 +1,40 @@
+"""Warm up task containers command."""
+
+import click
+import sys
+
+
+@click.command()
+@click.option('--count', '-n', type=click.IntRange(min=1), default=1,
+              help='Number of containers to start')
+def warmup(count):
+    """Start task containers ahead of time for 'task create' to claim"""
+    # deferred: helpers pull in the Docker SDK
+    from claude_container.cli.helpers import (
+        check_claude_permissions,
+        ensure_authenticated,
+        get_storage_and_runner,
+    )
+    
+    ensure_authenticated()
+    _, container_runner = get_storage_and_runner()
+    
+    for index in range(count):
+        try:
+            container = container_runner.create_warm_container()
+        except RuntimeError as e:
+            click.echo(f"❌ {e}", err=True)
+            sys.exit(1)
+        
+        # Probing once records the result for this image, so claiming tasks
+        # skip their own permissions check
+        if index == 0 and not check_claude_permissions(container_runner, container):
+            container.stop()
+            container.remove()
+            click.echo("❌ Claude permissions have not been accepted yet.", err=True)
+            click.echo("Please run 'claude-container accept-permissions' first.", err=True)
+            sys.exit(1)
+        
+        click.echo(f"🔥 Warm container {container.name} is ready")
+    
+    click.echo("\nThe next 'task create' runs will start in these containers.")
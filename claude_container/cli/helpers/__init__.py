@@ -12,21 +12,79 @@ The helpers provide:
 - Editor integration for user input
 """
 
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+import re
+import shlex
 import sys
-from typing import Tuple, Optional, List, Any
+from typing import BinaryIO, Dict, Tuple, Optional, List, Any, Sequence, Union
 import subprocess
 import tempfile
 import click
-from tabulate import tabulate
 
-from claude_container.core.constants import DATA_DIR_NAME, CONTAINER_PREFIX
+from claude_container.core.constants import (
+    DATA_DIR_NAME, CONTAINER_PREFIX, DEFAULT_WORKDIR,
+    CLAUDE_SKIP_PERMISSIONS_FLAG, CLAUDE_PERMISSIONS_ERROR
+)
+from claude_container.cli.helpers.claude_output_parser import parse_claude_stream_json
 from claude_container.core.task_storage import TaskStorageManager
 from claude_container.core.container_runner import ContainerRunner
 from claude_container.core.docker_client import DockerClient
 from claude_container.models.task import TaskStatus, TaskMetadata
 from claude_container.models.config import ContainerConfig
+from claude_container.services.docker_service import DockerService
+from claude_container.services.exceptions import DockerServiceError
 from claude_container.utils.config_manager import ConfigManager
+from claude_container.utils.mcp_manager import MCPManager
+from claude_container.utils.permission_cache import PermissionCache
+
+
+# Separator line used around multi-line CLI output blocks
+BANNER = "-" * 60
+
+# Claude invocation for task runs; the prompt is sent over stdin
+_CLAUDE_STREAM_COMMAND = (
+    "claude", "--model=opus", "-p", "--output-format", "stream-json", "--verbose",
+    CLAUDE_SKIP_PERMISSIONS_FLAG,
+)
+_CLAUDE_COMMAND_SUMMARY = f"{' '.join(_CLAUDE_STREAM_COMMAND[:6])}... [truncated]"
+
+# Files used to commit task changes with a generated message
+_COMMIT_PROMPT_PATH = "/tmp/claude-commit-prompt.md"
+_COMMIT_FALLBACK_PATH = "/tmp/claude-commit-fallback.txt"
+_COMMIT_MESSAGE_PATH = "/tmp/claude-commit-message.txt"
+# Exit code of the commit step when nothing is staged and no commits are left
+# to push; it stops the batch and is reported to callers as success
+_NOTHING_TO_COMMIT_RC = 3
+# Runs in a subshell so its early exit only ends the commit step of a batch.
+# {base_ref} is where the branch stood before the task ran
+_COMMIT_SCRIPT = "\n".join([
+    "(",
+    "git add -A || exit 1",
+    # Nothing staged: commits Claude made itself still have to be pushed
+    "if git diff --cached --quiet; then",
+    "if git rev-parse -q --verify {base_ref} >/dev/null "
+    "&& [ -z \"$(git rev-list -1 {base_ref}..HEAD)\" ]; then",
+    f"echo 'nothing to commit'; exit {_NOTHING_TO_COMMIT_RC}",
+    "fi",
+    "exit 0",
+    "fi",
+    # Claude only sees the change summary and writes the message. Without the
+    # skip-permissions flag, print mode denies edits and shell commands, so
+    # the reply is the only thing it can produce
+    f"{{{{ cat {_COMMIT_PROMPT_PATH}; git diff --cached --stat; }}}} "
+    f"| claude --model=haiku -p > {_COMMIT_MESSAGE_PATH} 2>/dev/null "
+    f"&& [ -s {_COMMIT_MESSAGE_PATH} ] || cp {_COMMIT_FALLBACK_PATH} {_COMMIT_MESSAGE_PATH}",
+    f"git commit -q -F {_COMMIT_MESSAGE_PATH}",
+    ")",
+])
+
+# Reads the hash and message of the new commit in one git call; the fields
+# are split on the ASCII unit separator, which cannot appear in a hash
+COMMIT_LOG_COMMAND = "git log -1 --pretty=format:%H%x1f%B"
 
 
 def ensure_authenticated() -> None:
@@ -40,6 +98,17 @@ def ensure_authenticated() -> None:
         sys.exit(1)
 
 
+def is_verbose() -> bool:
+    """Check whether the top-level ``--verbose`` flag was given.
+    
+    Returns:
+        True if verbose output was requested
+    """
+    ctx = click.get_current_context(silent=True)
+    obj = ctx.find_root().obj if ctx else None
+    return bool(isinstance(obj, dict) and obj.get('verbose'))
+
+
 def get_project_context() -> Tuple[Path, Path]:
     """Get project root and data directory with validation.
     
@@ -65,6 +134,70 @@ def ensure_container_built(data_dir: Path) -> None:
         sys.exit(1)
 
 
+@lru_cache(maxsize=4)
+def get_task_storage(data_dir: Path) -> TaskStorageManager:
+    """Get the process-wide TaskStorageManager for a data directory.
+    
+    Commands that invoke other commands share one instance instead of each
+    setting up the storage directories again.
+    
+    Args:
+        data_dir: The .claude-container directory for the project
+        
+    Returns:
+        Shared TaskStorageManager instance
+    """
+    return TaskStorageManager(data_dir)
+
+
+@lru_cache(maxsize=1)
+def get_docker_service() -> DockerService:
+    """Get the process-wide DockerService instance.
+    
+    Creating a Docker client involves socket setup and API version
+    negotiation, so one instance is shared by every command in the process.
+    
+    Returns:
+        Shared DockerService instance
+        
+    Raises:
+        DockerServiceError: If Docker is not available (failures are not cached)
+    """
+    return DockerService()
+
+
+@lru_cache(maxsize=4)
+def get_mcp_manager(project_root: Path) -> MCPManager:
+    """Get the process-wide MCPManager for a project.
+    
+    Sharing one instance keeps its parsed registry, so commands run in the
+    same process only re-read the registry file after it changes.
+    
+    Args:
+        project_root: Project root directory
+        
+    Returns:
+        Shared MCPManager instance
+    """
+    return MCPManager(project_root)
+
+
+@lru_cache(maxsize=4)
+def get_container_runner(project_root: Path, data_dir: Path, image_name: str) -> ContainerRunner:
+    """Get a cached ContainerRunner for the given project and image.
+    
+    Args:
+        project_root: Project root directory
+        data_dir: The .claude-container directory for the project
+        image_name: Docker image name
+        
+    Returns:
+        ContainerRunner sharing the process-wide DockerService
+    """
+    return ContainerRunner(project_root, data_dir, image_name,
+                           docker_service=get_docker_service())
+
+
 def get_storage_and_runner() -> Tuple[TaskStorageManager, ContainerRunner]:
     """Initialize TaskStorageManager and ContainerRunner from context.
     
@@ -77,12 +210,12 @@ def get_storage_and_runner() -> Tuple[TaskStorageManager, ContainerRunner]:
     project_root, data_dir = get_project_context()
     ensure_container_built(data_dir)
     
-    storage_manager = TaskStorageManager(data_dir)
+    storage_manager = get_task_storage(data_dir)
     
     image_name = f"{CONTAINER_PREFIX}-{project_root.name}".lower()
     try:
-        runner = ContainerRunner(project_root, data_dir, image_name)
-    except RuntimeError as e:
+        runner = get_container_runner(project_root, data_dir, image_name)
+    except (RuntimeError, DockerServiceError) as e:
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
     
@@ -123,7 +256,6 @@ def get_config_manager() -> Tuple[ConfigManager, ContainerConfig]:
     config_manager = ConfigManager(data_dir)
     config = config_manager.get_container_config()
     if not config:
-        from datetime import datetime
         config = ContainerConfig(type="cached", generated_at=datetime.now().isoformat())
         config_manager.save_container_config(config)
     
@@ -145,18 +277,20 @@ def resolve_task_id(storage_manager: TaskStorageManager, task_id: str) -> TaskMe
     """
     task_metadata = storage_manager.get_task(task_id)
     if not task_metadata:
-        # Try to find by short ID
-        all_tasks = storage_manager.list_tasks()
-        matching_tasks = [t for t in all_tasks if t.id.startswith(task_id)]
+        # Try to find by short ID without loading every task
+        matching_ids = storage_manager.lookup_by_prefix(task_id)
         
-        if len(matching_tasks) == 1:
-            task_metadata = matching_tasks[0]
-        elif len(matching_tasks) > 1:
+        if len(matching_ids) == 1:
+            task_metadata = storage_manager.get_task(matching_ids[0])
+        elif len(matching_ids) > 1:
             click.echo(f"Error: Multiple tasks found starting with '{task_id}':", err=True)
-            for task in matching_tasks:
-                click.echo(f"  - {task.id}: {task.description.split()[0]}...", err=True)
+            for match_id in matching_ids:
+                task = storage_manager.get_task(match_id)
+                if task:
+                    click.echo(f"  - {task.id}: {task.description.split(maxsplit=1)[0]}...", err=True)
             sys.exit(1)
-        else:
+        
+        if not task_metadata:
             click.echo(f"Error: No task found with ID: {task_id}", err=True)
             sys.exit(1)
     
@@ -175,23 +309,93 @@ def format_pr_display(pr_url: Optional[str]) -> str:
     if not pr_url:
         return ""
     
-    pr_parts = pr_url.split('/')
-    if len(pr_parts) >= 2 and pr_parts[-2] == 'pull':
-        pr_number = pr_parts[-1]
+    # Only the last two path segments matter, so split from the right once
+    pr_path, _, pr_number = pr_url.rpartition('/')
+    if pr_path.endswith('/pull') or pr_path == 'pull':
         return click.style(f"PR #{pr_number}", fg='cyan')
     else:
         return click.style("PR", fg='cyan')
 
 
+# Status colors for container tables; anything else is shown in red
+CONTAINER_STATUS_COLORS = {
+    'running': 'green',
+    'exited': 'yellow',
+}
+
+# Status colors for task tables; anything else is shown in white
+_TASK_STATUS_COLORS = {
+    TaskStatus.CREATED: 'green',
+    TaskStatus.CONTINUED: 'yellow',
+    TaskStatus.FAILED: 'red'
+}
+
+
+@lru_cache(maxsize=None)
+def _styled_task_status(status: TaskStatus) -> str:
+    """Get the colored status label, styled once per status."""
+    return click.style(status.value.upper(), fg=_TASK_STATUS_COLORS.get(status, 'white'))
+
+
+# Length of ``isoformat(sep=' ', timespec=...)`` output without a UTC offset
+_TIMESTAMP_WIDTHS = {'minutes': 16, 'seconds': 19}
+
+
+def format_timestamp(dt: datetime, timespec: str = 'seconds') -> str:
+    """Format a datetime as ``YYYY-MM-DD HH:MM[:SS]`` for display.
+    
+    Args:
+        dt: Datetime to format; any UTC offset is not shown
+        timespec: Either 'minutes' or 'seconds'
+        
+    Returns:
+        Formatted timestamp
+    """
+    # isoformat skips strftime's format parsing; the slice drops any UTC offset
+    return dt.isoformat(sep=' ', timespec=timespec)[:_TIMESTAMP_WIDTHS[timespec]]
+
+
+def format_task_row(task_item: TaskMetadata, max_desc_length: int = 50) -> List[str]:
+    """Format one task as a row of the task table.
+    
+    Args:
+        task_item: Task to format
+        max_desc_length: Maximum description length before truncation
+        
+    Returns:
+        Row of ID, status, branch, description, created time and PR columns
+    """
+    # Format description
+    desc_line = task_item.description.partition('\n')[0]
+    if len(desc_line) > max_desc_length:
+        desc_line = desc_line[:max_desc_length-3] + "..."
+    
+    # Add continuation count to description if exists
+    if hasattr(task_item, 'continuation_count') and task_item.continuation_count > 0:
+        desc_line += click.style(f" (cont: {task_item.continuation_count})", fg='yellow')
+    
+    return [
+        task_item.id[:8],  # Short ID
+        _styled_task_status(task_item.status),
+        task_item.branch_name or "",
+        desc_line,
+        format_timestamp(task_item.created_at, timespec='minutes'),
+        format_pr_display(task_item.pr_url)
+    ]
+
+
 def format_task_table(tasks: List[TaskMetadata], 
                      headers: Optional[List[str]] = None,
-                     max_desc_length: int = 50) -> str:
+                     max_desc_length: int = 50,
+                     status_counts: Optional[Counter] = None) -> str:
     """Format tasks as a table with consistent styling.
     
     Args:
         tasks: List of tasks to display
         headers: Optional custom headers (defaults to standard headers)
         max_desc_length: Maximum description length before truncation
+        status_counts: Optional counter that each task's status value is
+            added to while its row is built
         
     Returns:
         Formatted table string
@@ -199,52 +403,59 @@ def format_task_table(tasks: List[TaskMetadata],
     if headers is None:
         headers = ["ID", "STATUS", "BRANCH", "DESCRIPTION", "CREATED", "PR"]
     
-    status_colors = {
-        TaskStatus.CREATED: 'green',
-        TaskStatus.CONTINUED: 'yellow',
-        TaskStatus.FAILED: 'red'
-    }
-    
     table_data = []
     for task_item in tasks:
-        # Format description
-        desc_line = task_item.description.split('\n')[0]
-        if len(desc_line) > max_desc_length:
-            desc_line = desc_line[:max_desc_length-3] + "..."
-        
-        # Add continuation count to description if exists
-        if hasattr(task_item, 'continuation_count') and task_item.continuation_count > 0:
-            desc_line += click.style(f" (cont: {task_item.continuation_count})", fg='yellow')
-        
-        # Format status with color
-        status_display = click.style(
-            task_item.status.value.upper(), 
-            fg=status_colors.get(task_item.status, 'white')
-        )
-        
-        # Format PR
-        pr_display = format_pr_display(task_item.pr_url)
-        
-        # Format dates
-        created_str = task_item.created_at.strftime("%Y-%m-%d %H:%M")
+        if status_counts is not None:
+            status_counts[task_item.status.value] += 1
+        table_data.append(format_task_row(task_item, max_desc_length))
+    return format_simple_table(headers, table_data,
+                               colalign=("left", "left", "left", "left", "right", "left"))
+
+
+# Matches the color codes click.style adds, which take no width on screen
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+
+
+def _visible_len(text: str) -> int:
+    """Get the on-screen width of text, ignoring color codes."""
+    return len(_ANSI_RE.sub('', text)) if '\x1b' in text else len(text)
+
+
+def format_simple_table(headers: Sequence[str], rows: Sequence[Sequence[Any]],
+                        colalign: Optional[Sequence[str]] = None) -> str:
+    """Format rows in tabulate's "simple" layout without going through tabulate.
+    
+    Each cell is measured once, ignoring color codes, and headers get two
+    spaces of padding as tabulate gives them.
+    
+    Args:
+        headers: Table headers
+        rows: Table rows; None cells are shown empty
+        colalign: Optional "left" or "right" per column (default: all left)
         
-        # Build row
-        row = [
-            task_item.id[:8],  # Short ID
-            status_display,
-            task_item.branch_name or "",
-            desc_line,
-            created_str,
-            pr_display
+    Returns:
+        Formatted table string
+    """
+    cells = [["" if cell is None else str(cell) for cell in row] for row in rows]
+    cell_widths = [[_visible_len(cell) for cell in row] for row in cells]
+    widths = [len(header) + 2 for header in headers]
+    for row_widths in cell_widths:
+        widths = [max(width, cell_width) for width, cell_width in zip(widths, row_widths)]
+    right = [align == "right" for align in colalign or ()] + [False] * len(headers)
+    
+    def format_line(line_cells: Sequence[str], line_widths: Sequence[int]) -> str:
+        padded = [
+            " " * (width - cell_width) + cell if align_right else cell + " " * (width - cell_width)
+            for cell, cell_width, width, align_right in zip(line_cells, line_widths, widths, right)
         ]
-        
-        table_data.append(row)
+        return "  ".join(padded).rstrip()
     
-    if table_data:
-        return tabulate(table_data, headers=headers, tablefmt="simple", 
-                       colalign=("left", "left", "left", "left", "right", "left"))
-    else:
-        return tabulate(table_data, headers=headers, tablefmt="simple")
+    lines = [
+        format_line(headers, [len(header) for header in headers]),
+        "  ".join("-" * width for width in widths),
+    ]
+    lines.extend(map(format_line, cells, cell_widths))
+    return "\n".join(lines)
 
 
 def print_table(headers: List[str], rows: List[List[Any]], 
@@ -256,6 +467,11 @@ def print_table(headers: List[str], rows: List[List[Any]],
         rows: Table rows
         tablefmt: Table format (default: "simple")
     """
+    if tablefmt == "simple":
+        click.echo(format_simple_table(headers, rows))
+        return
+    
+    from tabulate import tabulate  # deferred: only needed for other table formats
     table_str = tabulate(rows, headers=headers, tablefmt=tablefmt)
     click.echo(table_str)
 
@@ -318,18 +534,249 @@ def cleanup_container(container: Any) -> None:
             click.echo(f"⚠️  Warning: Failed to remove container: {e}", err=True)
 
 
+def check_claude_permissions(
+    container_runner: ContainerRunner,
+    container: Any,
+    image_digest: Optional[str] = None,
+    force: bool = False
+) -> bool:
+    """Check that Claude permissions are accepted, skipping the probe on a cache hit.
+    
+    A successful probe is recorded against the image digest so later tasks
+    started from the same image do not pay for another ``claude -p`` exec.
+    
+    Args:
+        container_runner: Runner that owns the container
+        container: Running task container
+        image_digest: Digest of the task image if already looked up
+        force: Run the probe even if a cached result exists
+        
+    Returns:
+        False if Claude reported that permissions have not been accepted
+    """
+    cache = PermissionCache(container_runner.data_dir)
+    if image_digest is None:
+        image_digest = container_runner.docker_service.get_image_digest(container_runner.image_name)
+    if image_digest and not force and cache.get(image_digest):
+        return True
+    
+    click.echo("🔍 Checking Claude permissions...")
+    result = container_runner.exec_in_container_as_user(
+        container,
+        ["claude", "-p", "echo test", CLAUDE_SKIP_PERMISSIONS_FLAG],
+        user='node',
+        workdir=DEFAULT_WORKDIR
+    )
+    exit_code, output = result.exit_code, result.output
+    if exit_code != 0 and CLAUDE_PERMISSIONS_ERROR in output.decode():
+        return False
+    
+    if exit_code == 0 and image_digest:
+        cache.set(image_digest, True)
+    return True
+
+
+class BackgroundLogWriter:
+    """Save task logs on a worker thread so container work can continue.
+    
+    Writes run in submission order on a single thread. ``close`` must be
+    called (typically from a ``finally`` block) to wait for pending writes.
+    """
+    
+    def __init__(self, storage_manager: TaskStorageManager):
+        """Initialize the log writer.
+        
+        Args:
+            storage_manager: Storage manager that persists the logs
+        """
+        self._storage_manager = storage_manager
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="task-log")
+        self._pending: List[Future] = []
+    
+    def save_task_log(self, task_id: str, log_type: str, content: Union[str, bytes]) -> None:
+        """Queue a task log to be saved.
+        
+        Args:
+            task_id: The task ID
+            log_type: Type of log (e.g., 'claude_output', 'execution')
+            content: Log content to save, as text or raw bytes
+        """
+        self._pending.append(
+            self._executor.submit(self._storage_manager.save_task_log, task_id, log_type, content)
+        )
+    
+    def open_task_log(self, task_id: str, log_type: str) -> BinaryIO:
+        """Open a task log for output that is written while it streams.
+        
+        Args:
+            task_id: The task ID
+            log_type: Type of log (e.g., 'claude_output', 'claude_commit')
+            
+        Returns:
+            Binary file object; the caller is responsible for closing it
+        """
+        return self._storage_manager.open_task_log(task_id, log_type)
+    
+    def close(self) -> None:
+        """Wait for queued writes, warning about any that failed."""
+        self._executor.shutdown(wait=True)
+        for future in self._pending:
+            error = future.exception()
+            if error:
+                click.echo(f"⚠️  Warning: Failed to save task log: {error}", err=True)
+        self._pending.clear()
+
+
+def run_claude_streaming(container_runner: ContainerRunner, container: Any, prompt: str,
+                         mcp_path: Optional[str], log_writer: BackgroundLogWriter,
+                         task_id: str, log_type: str, show_command: bool = False) -> List[dict]:
+    """Run Claude in a container, display its output and save the raw log.
+    
+    The prompt is sent over the exec's stdin and the stream-json output is
+    parsed as it arrives. Raw output is written straight to the task log, so
+    the transcript is never held in memory.
+    
+    Args:
+        container_runner: Runner that owns the container
+        container: Running task container
+        prompt: Prompt for Claude
+        mcp_path: Path of the MCP config inside the container, if any
+        log_writer: Writer whose task log receives the raw output
+        task_id: The task ID the log belongs to
+        log_type: Log name (e.g., 'claude_output', 'claude_commit')
+        show_command: Whether to print the Claude command first
+        
+    Returns:
+        Parsed stream-json messages
+    """
+    claude_cmd = list(_CLAUDE_STREAM_COMMAND)
+    if mcp_path:
+        claude_cmd += ("--mcp-config", mcp_path)
+    
+    if show_command:
+        command_summary = f"\n🔍 Claude command:\n   {_CLAUDE_COMMAND_SUMMARY}"
+        if mcp_path:
+            command_summary += f"\n   MCP config: {mcp_path}"
+        click.echo(command_summary)
+    
+    output_stream = container_runner.exec_streaming(
+        container,
+        claude_cmd,
+        user='node',
+        workdir=DEFAULT_WORKDIR,
+        stdin_data=prompt.encode()
+    )
+    with log_writer.open_task_log(task_id, log_type) as log_file:
+        _, json_messages = parse_claude_stream_json(output_stream, echo_to_screen=True, raw_sink=log_file)
+    return json_messages
+
+
+def parse_commit_log(output: bytes) -> Tuple[str, str]:
+    """Split the output of ``COMMIT_LOG_COMMAND``.
+    
+    Args:
+        output: Raw output of the log command
+        
+    Returns:
+        Tuple of (commit hash, commit message)
+    """
+    commit_hash, _, message = output.decode().partition('\x1f')
+    return commit_hash.strip(), message.strip()
+
+
+def commit_task_changes(container_runner: ContainerRunner, container: Any, context: str,
+                        log_writer: BackgroundLogWriter, task_id: str, log_type: str,
+                        base_ref: str, then: Sequence[Tuple[str, str]] = (),
+                        stop_on_failure: Sequence[str] = ()) -> Dict[str, Tuple[int, bytes]]:
+    """Stage and commit all changes with a message written by a small Claude model.
+    
+    Only the message is generated: a ``claude --model=haiku -p`` call that
+    may not edit files or run commands sees the context and
+    ``git diff --cached --stat``, and the commit is made with git directly.
+    If no message comes back, one built from the context is used instead.
+    Follow-up steps such as reading the commit or pushing run in the same
+    exec as the commit, and only if the commit succeeded.
+    
+    If nothing is staged, no commit is made. The follow-up steps still run
+    when HEAD has commits ``base_ref`` lacks, such as ones Claude made
+    itself; otherwise there is nothing to commit or push.
+    
+    Args:
+        container_runner: Runner that owns the container
+        container: Running task container
+        context: Task description or feedback the changes address
+        log_writer: Writer used to save the commit output
+        task_id: The task ID the log belongs to
+        log_type: Log name (e.g., 'claude_commit')
+        base_ref: Ref the branch was at before the task ran
+        then: (name, shell command) steps to run after the commit
+        stop_on_failure: Names of ``then`` steps whose failure skips the rest
+        
+    Returns:
+        Mapping of step name to (exit_code, output); the commit itself is
+        under ``"commit"``. No ``then`` step is present if the commit failed,
+        or if there was nothing to commit, in which case the commit step
+        reports exit code 0
+    """
+    prompt = (
+        "Write a git commit message for the staged changes summarized below, following the "
+        "Conventional Commits specification.\n\n"
+        "Use one of these types: feat, fix, docs, style, refactor, test, chore, perf, build, ci\n"
+        "Format: <type>(<scope>): <description>, optionally followed by a blank line and a short body.\n\n"
+        f"Context: {context}\n\n"
+        "Reply with only the commit message. Do NOT include any attribution, emojis, "
+        "Co-Authored-By lines or code fences.\n\n"
+        "Staged changes:\n"
+    )
+    subject = context.strip().partition('\n')[0][:72] or "apply task changes"
+    container_runner.stream_files(container, {
+        _COMMIT_PROMPT_PATH: prompt,
+        _COMMIT_FALLBACK_PATH: f"chore: {subject}\n\n{context.strip()}\n",
+    })
+    
+    results = container_runner.run_batched(
+        container,
+        [("commit", _COMMIT_SCRIPT.format(base_ref=shlex.quote(base_ref))), *then],
+        user='node',
+        workdir=DEFAULT_WORKDIR,
+        # Reading or pushing HEAD after a failed commit would pick up the
+        # previous commit as if it were this one
+        stop_on_failure=("commit", *stop_on_failure)
+    )
+    exit_code, output = results.get("commit", (1, b""))
+    if exit_code == _NOTHING_TO_COMMIT_RC:
+        results["commit"] = (0, output)
+    log_writer.save_task_log(task_id, log_type, output)
+    return results
+
+
 # Re-export commonly used functions for convenience
 __all__ = [
     'ensure_authenticated',
+    'is_verbose',
     'get_project_context',
     'ensure_container_built',
+    'get_task_storage',
+    'get_docker_service',
+    'get_mcp_manager',
+    'get_container_runner',
     'get_storage_and_runner',
     'get_docker_client',
     'get_config_manager',
     'resolve_task_id',
     'format_pr_display',
+    'format_timestamp',
+    'format_task_row',
     'format_task_table',
+    'format_simple_table',
     'print_table',
     'open_in_editor',
     'cleanup_container',
+    'check_claude_permissions',
+    'run_claude_streaming',
+    'commit_task_changes',
+    'parse_commit_log',
+    'COMMIT_LOG_COMMAND',
+    'CONTAINER_STATUS_COLORS',
+    'BackgroundLogWriter',
 ]
\ No newline at end of file
@@ -2,95 +2,165 @@
 
 import json
 import click
-from typing import Iterator, Tuple, List
+from typing import BinaryIO, Iterator, Tuple, List, Optional
 
 
-def parse_claude_stream_json(output_stream: Iterator, echo_to_screen: bool = True) -> Tuple[List[str], List[dict]]:
+HAS_CHANGES_MARKER = "::HAS_CHANGES::"
+NO_CHANGES_MARKER = "::NO_CHANGES::"
+CHANGE_MARKER_INSTRUCTION = (
+    "\n\nWhen you are finished, print exactly one of the lines "
+    f"{HAS_CHANGES_MARKER} or {NO_CHANGES_MARKER} as the last line of your final response, "
+    "depending on whether you modified any files."
+)
+
+# Most integer bytes held before they are processed as one chunk
+_PENDING_BYTES_LIMIT = 4096
+
+
+def parse_claude_stream_json(output_stream: Iterator, echo_to_screen: bool = True,
+                             raw_sink: Optional[BinaryIO] = None) -> Tuple[bytes, List[dict]]:
     """
     Parse Claude's stream-json output format.
     
+    Lines are split on raw bytes and each complete line is handed to
+    ``json.loads`` as bytes, so the stream is never decoded as a whole and a
+    multi-byte character split across chunks cannot be corrupted (a newline
+    byte never occurs inside one). Each line is parsed as soon as it arrives. The
+    raw output is kept as undecoded bytes for saving to the task log, or
+    written to ``raw_sink`` chunk by chunk when one is given.
+    
     Args:
         output_stream: Iterator yielding chunks of output from Claude
         echo_to_screen: Whether to echo output to screen (currently outputs raw JSON)
+        raw_sink: Binary file that receives the raw output instead of memory
         
     Returns:
-        Tuple of (raw_output_lines, parsed_json_messages)
+        Tuple of (raw_output_bytes, parsed_json_messages); the bytes are
+        empty when ``raw_sink`` is given
     """
-    raw_output = []
+    # Chunks are joined once at the end, so the output is copied only once
+    raw_chunks: List[bytes] = []
+    append_raw = raw_sink.write if raw_sink is not None else raw_chunks.append
     json_messages = []
-    buffer = ""
+    partial_line = bytearray()
+    # Integer bytes are collected and handled in one go when a line ends
+    pending_bytes = bytearray()
     
     for chunk in output_stream:
-        # Handle different types of streaming output
-        if isinstance(chunk, bytes):
-            decoded_chunk = chunk.decode()
-        elif isinstance(chunk, int):
-            # Docker streaming sometimes yields individual bytes as integers
-            decoded_chunk = chr(chunk)
-        else:
-            decoded_chunk = str(chunk)
+        # exec_stream yields large bytes payloads; other shapes are only
+        # normalized for callers passing docker-py's own stream iterators
+        if not isinstance(chunk, (bytes, bytearray)):
+            if isinstance(chunk, int):
+                # docker-py streaming sometimes yields individual bytes as
+                # integers; nothing is parsed before the newline, so hold them
+                pending_bytes.append(chunk)
+                if chunk != 0x0A and len(pending_bytes) < _PENDING_BYTES_LIMIT:
+                    continue
+                chunk = bytes(pending_bytes)
+                pending_bytes.clear()
+            else:
+                chunk = str(chunk).encode('utf-8')
+        elif pending_bytes:
+            chunk = bytes(pending_bytes) + chunk
+            pending_bytes.clear()
+        append_raw(chunk)
         
-        raw_output.append(decoded_chunk)
-        buffer += decoded_chunk
+        if b'\n' not in chunk:
+            partial_line += chunk
+            continue
         
-        # Try to parse complete JSON objects from the buffer
-        lines = buffer.split('\n')
-        buffer = ""
+        # Parse every line completed by this chunk
+        first, *lines = chunk.split(b'\n')
+        partial_line += first
+        _parse_json_line(bytes(partial_line), json_messages, echo_to_screen)
+        for line in lines[:-1]:
+            _parse_json_line(line, json_messages, echo_to_screen)
+        partial_line = bytearray(lines[-1])
+    
+    # Handle any trailing line without a newline
+    if pending_bytes:
+        append_raw(bytes(pending_bytes))
+        partial_line += pending_bytes
+    _parse_json_line(bytes(partial_line), json_messages, echo_to_screen)
+    
+    return b''.join(raw_chunks), json_messages
+
+
+def find_change_marker(json_messages: List[dict]) -> Optional[bool]:
+    """Read the change marker Claude printed at the end of its final response.
+    
+    Args:
+        json_messages: Parsed stream-json messages
         
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if not line:
-                continue
-                
-            # If this is the last line and doesn't end with a newline, it might be incomplete
-            if i == len(lines) - 1 and not decoded_chunk.endswith('\n'):
-                buffer = line
-                continue
-            
-            try:
-                json_obj = json.loads(line)
-                json_messages.append(json_obj)
-                
-                # Display formatted output
-                if echo_to_screen:
-                    _display_json_message(json_obj)
-                    
-            except json.JSONDecodeError:
-                # Not valid JSON, skip
-                pass
+    Returns:
+        True or False for a has-changes/no-changes marker, None if there is none
+    """
+    for json_obj in reversed(json_messages):
+        if json_obj.get("type") != "result":
+            continue
+        result = json_obj.get("result")
+        lines = result.strip().splitlines() if isinstance(result, str) else []
+        last_line = lines[-1].strip() if lines else ""
+        if last_line == HAS_CHANGES_MARKER:
+            return True
+        if last_line == NO_CHANGES_MARKER:
+            return False
+        return None
+    return None
+
+
+def _parse_json_line(line: bytes, json_messages: List[dict], echo_to_screen: bool) -> None:
+    """Parse one line of stream-json output, skipping anything that isn't JSON."""
+    line = line.strip()
+    if not line:
+        return
     
-    # Handle any remaining buffer content
-    if buffer.strip():
+    try:
+        json_obj = json.loads(line)
+    except UnicodeDecodeError:
+        # Invalid UTF-8 is replaced rather than dropping the whole line
         try:
-            json_obj = json.loads(buffer)
-            json_messages.append(json_obj)
-            if echo_to_screen:
-                _display_json_message(json_obj)
+            json_obj = json.loads(line.decode('utf-8', errors='replace'))
         except json.JSONDecodeError:
-            pass
+            return
+    except json.JSONDecodeError:
+        # Not valid JSON, skip
+        return
     
-    return raw_output, json_messages
+    json_messages.append(json_obj)
+    
+    # Display formatted output
+    if echo_to_screen:
+        _display_json_message(json_obj)
 
 
 def _display_json_message(json_obj: dict) -> None:
     """Display a parsed JSON message in a user-friendly format.
     
     Based on the Anthropic SDK Message structure from the stream-json output.
+    The whole message is written with a single echo.
     """
+    text = _format_json_message(json_obj)
+    if text:
+        click.echo(text, nl=False)
+
+
+def _format_json_message(json_obj: dict) -> str:
+    """Build the screen text for a parsed JSON message ('' if it is not shown)."""
     msg_type = json_obj.get("type", "")
+    parts = []
     
     if msg_type == "system" and json_obj.get("subtype") == "init":
         # Initial system message - this one is useful to show
-        click.echo("\n\n🚀 Claude session initialized\n")
+        parts.append("\n\n🚀 Claude session initialized\n\n")
         tools = json_obj.get("tools", [])
         mcp_servers = json_obj.get("mcp_servers", [])
         if tools:
-            click.echo(f"   Tools: {len(tools)} available\n")
+            parts.append(f"   Tools: {len(tools)} available\n\n")
         if mcp_servers:
             active_servers = [s for s in mcp_servers if s.get("status") == "active"]
-            if mcp_servers:
-                click.echo(f"   MCP Servers: {len(active_servers)}/{len(mcp_servers)} active\n")
-        click.echo("")  # Extra line break after init
+            parts.append(f"   MCP Servers: {len(active_servers)}/{len(mcp_servers)} active\n\n")
+        parts.append("\n")  # Extra line break after init
         
     elif msg_type == "user":
         # User messages contain tool results - not very useful to display
@@ -103,7 +173,7 @@ def _display_json_message(json_obj: dict) -> None:
         content = message.get("content", [])
         
         # Add some spacing before assistant messages
-        click.echo("\n")
+        parts.append("\n\n")
         
         # Content is a list of content blocks
         if isinstance(content, list):
@@ -111,16 +181,14 @@ def _display_json_message(json_obj: dict) -> None:
                 if isinstance(block, dict):
                     block_type = block.get("type", "")
                     if block_type == "text":
-                        text = block.get("text", "")
-                        if text:
-                            click.echo(text, nl=False)
+                        parts.append(block.get("text", ""))
                     elif block_type == "tool_use":
                         # Show tool usage in a subtle way
                         tool_name = block.get("name", "unknown")
-                        click.echo(f"\n\n[Using {tool_name}...]\n", nl=False)
+                        parts.append(f"\n\n[Using {tool_name}...]\n")
         
         # Add spacing after assistant messages
-        click.echo("\n")
+        parts.append("\n\n")
             
     elif msg_type == "result":
         # Final result message with stats - this is useful
@@ -129,16 +197,20 @@ def _display_json_message(json_obj: dict) -> None:
         duration_ms = json_obj.get("duration_ms", 0)
         num_turns = json_obj.get("num_turns", 0)
         
-        click.echo("\n\n\n📊 Session Summary:\n")
-        click.echo(f"   Status: {subtype}\n")
-        click.echo(f"   Turns: {num_turns}\n")
-        click.echo(f"   Duration: {duration_ms/1000:.1f}s\n")
-        click.echo(f"   Cost: ${cost_usd:.4f}\n")
+        parts.append(
+            "\n\n\n📊 Session Summary:\n\n"
+            f"   Status: {subtype}\n\n"
+            f"   Turns: {num_turns}\n\n"
+            f"   Duration: {duration_ms/1000:.1f}s\n\n"
+            f"   Cost: ${cost_usd:.4f}\n\n"
+        )
         
         if subtype == "error_max_turns":
-            click.echo("   ⚠️  Maximum turns reached\n")
+            parts.append("   ⚠️  Maximum turns reached\n\n")
         elif subtype == "success" and json_obj.get("result"):
             result_text = json_obj.get("result", "")
             if result_text:
-                click.echo(f"   Result: {result_text[:100]}..." if len(result_text) > 100 else f"   Result: {result_text}")
-                click.echo("")  # Extra line break after result
\ No newline at end of file
+                parts.append(f"   Result: {result_text[:100]}...\n" if len(result_text) > 100 else f"   Result: {result_text}\n")
+                parts.append("\n")  # Extra line break after result
+    
+    return ''.join(parts)
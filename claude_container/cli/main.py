@@ -18,9 +18,13 @@ from .commands.copy import copy
 
 
 @click.group()
-def cli():
+@click.option('--verbose', '-v', is_flag=True, envvar='CLAUDE_CONTAINER_DEBUG', show_envvar=True,
+              help='Show debug output such as generated MCP configuration')
+@click.pass_context
+def cli(ctx, verbose):
     """Claude Container - Run Claude Code in isolated Docker environments"""
-    pass
+    ctx.ensure_object(dict)
+    ctx.obj['verbose'] = verbose
 
 
 # Register commands
@@ -1,9 +1,25 @@
 """Core functionality for Claude Container."""
 
-from .container_runner import ContainerRunner
-from .docker_client import DockerClient
-from .dockerfile_generator import DockerfileGenerator
-from .task_storage import TaskStorageManager
+from importlib import import_module
+
+# Exports are imported on first access: importing a light submodule such as
+# core.constants or core.task_storage should not load the Docker SDK
+_LAZY_EXPORTS = {
+    'ContainerRunner': '.container_runner',
+    'DockerClient': '.docker_client',
+    'DockerfileGenerator': '.dockerfile_generator',
+    'TaskStorageManager': '.task_storage',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'ContainerRunner',
@@ -44,12 +44,25 @@ DEFAULT_TIMEOUT = 120  # 2 minutes
 
 # Container configuration
 CONTAINER_PREFIX = "claude-container"
+TASK_ID_LABEL = "claude-container-task-id"
+# Marks pre-started task containers waiting to be claimed by `task create`
+WARM_CONTAINER_LABEL = "claude-container-warm"
 DATA_DIR_NAME = ".claude-container"
 DOCKERFILE_NAME = "Dockerfile.claude"
 CONFIG_FILE_NAME = "container_config.json"
 MCP_CONFIG_FILE = "mcp.json"
 MCP_CONFIG_PATH = ".mcp.json"
+MCP_CACHE_DIR = ".mcp_cache"
+
+# Task description file inside task containers (outside the workspace to avoid commits)
+TASK_DESCRIPTION_PATH = "/tmp/claude-task-description.md"
 
 # Claude permissions flag
 CLAUDE_SKIP_PERMISSIONS_FLAG = "--dangerously-skip-permissions"
-CLAUDE_PERMISSIONS_ERROR = "--dangerously-skip-permissions must be accepted in an interactive session first"
\ No newline at end of file
+CLAUDE_PERMISSIONS_ERROR = "--dangerously-skip-permissions must be accepted in an interactive session first"
+
+# Permission check cache
+PERMISSION_CACHE_FILE = ".perm_cache.json"
+PERMISSION_CACHE_TTL = 7 * 24 * 60 * 60  # 7 days
+AUTH_CACHE_FILE = ".auth_ok"
+AUTH_CACHE_TTL = 10 * 60  # 10 minutes
@@ -1,25 +1,60 @@
 """Container running functionality."""
 
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
 import subprocess
 import uuid
 import shlex
 
+from docker.models.containers import ExecResult
+
 from ..services.docker_service import DockerService
 from ..services.exceptions import DockerServiceError
-from ..core.constants import DEFAULT_WORKDIR, CONTAINER_PREFIX
+from .shell_session import ShellSession
+from ..core.constants import DEFAULT_WORKDIR, CONTAINER_PREFIX, TASK_ID_LABEL, WARM_CONTAINER_LABEL
+
+# Appended to a warm container's name when a task claims it
+_CLAIMED_SUFFIX = "-claimed"
+
+
+def _as_exec_result(result) -> ExecResult:
+    """Normalize an exec result so callers can always use its attributes.
+    
+    Args:
+        result: ``ExecResult``, plain ``(exit_code, output)`` tuple, or any
+            object with ``exit_code`` and ``output`` attributes
+            
+    Returns:
+        ExecResult with the same exit code and output
+    """
+    if isinstance(result, ExecResult):
+        return result
+    if isinstance(result, tuple):
+        return ExecResult(*result)
+    return ExecResult(result.exit_code, result.output)
 
 
 class ContainerRunner:
     """Handles running containers with Claude Code."""
     
-    def __init__(self, project_root: Path, data_dir: Path, image_name: str):
-        """Initialize container runner."""
+    def __init__(self, project_root: Path, data_dir: Path, image_name: str,
+                 docker_service: Optional[DockerService] = None):
+        """Initialize container runner.
+        
+        Args:
+            project_root: Project root directory
+            data_dir: The .claude-container directory for the project
+            image_name: Docker image name
+            docker_service: Existing DockerService to reuse (a new one is created if omitted)
+        """
         self.project_root = project_root
         self.data_dir = data_dir
         self.image_name = image_name
-        self.docker_service = DockerService()
+        self.docker_service = docker_service or DockerService()
+        # Containers whose /workspace has already been chowned to node
+        self._workspace_owned: Set[str] = set()
+        # Open shell sessions by container ID, with the user they run as
+        self._shell_sessions: Dict[str, Tuple[str, ShellSession]] = {}
     
     def _get_container_environment(self, auto_approve: bool = False, user: Optional[str] = None) -> Dict[str, str]:
         """Get standard environment variables for container.
@@ -343,7 +378,8 @@ class ContainerRunner:
             container.stop()
             container.remove()
     
-    def create_persistent_container(self, name_suffix: str = "task", user: Optional[str] = None):
+    def create_persistent_container(self, name_suffix: str = "task", user: Optional[str] = None,
+                                    labels: Optional[Dict[str, str]] = None):
         """Create a persistent container for multi-step operations.
         
         Container naming strategy:
@@ -355,6 +391,7 @@ class ContainerRunner:
         Args:
             name_suffix: Suffix for the container type (e.g., "task")
             user: The user that will run in the container ('node' or None/root)
+            labels: Extra labels to set on the container (e.g. the task ID)
         """
         # Generate a unique container name with deterministic prefix and random suffix
         random_suffix = uuid.uuid4().hex[:8]
@@ -377,6 +414,8 @@ class ContainerRunner:
             "claude-container-project": self.project_root.name.lower(),
             "claude-container-prefix": CONTAINER_PREFIX
         }
+        if labels:
+            config['labels'].update(labels)
         
         try:
             container = self.docker_service.run_container(**config)
@@ -384,6 +423,78 @@ class ContainerRunner:
         except Exception as e:
             raise RuntimeError(f"Failed to create container: {e}")
     
+    def find_task_container(self, task_id: str):
+        """Find a running container that was kept for a task.
+        
+        Args:
+            task_id: The task ID the container was labelled with
+            
+        Returns:
+            Docker container object, or None if no such container is running
+        """
+        try:
+            containers = self.docker_service.list_containers(
+                all=False, labels={TASK_ID_LABEL: task_id}
+            )
+        except DockerServiceError:
+            return None
+        return containers[0] if containers else None
+    
+    def create_warm_container(self):
+        """Start a task container ahead of time for ``claim_warm_container``.
+        
+        The workspace ownership fix-up is done now, so the task that claims
+        the container only has to run its own commands.
+        
+        Returns:
+            Docker container object
+        """
+        container = self.create_persistent_container(
+            "task", user="node", labels={WARM_CONTAINER_LABEL: "true"}
+        )
+        self._ensure_workspace_owned(container)
+        return container
+    
+    def claim_warm_container(self):
+        """Take a pre-started task container from the warm pool.
+        
+        Only containers started from the current image are used. A container
+        is claimed by renaming it; Docker rejects a second rename to the same
+        name, so two task runs can never claim the same container.
+        
+        Returns:
+            Docker container object, or None if no warm container is available
+        """
+        image_id = self.docker_service.get_image_digest(self.image_name)
+        if not image_id:
+            return None
+        try:
+            containers = self.docker_service.list_containers(
+                all=False,
+                sparse=True,
+                labels={
+                    WARM_CONTAINER_LABEL: "true",
+                    "claude-container-project": self.project_root.name.lower(),
+                },
+            )
+        except DockerServiceError:
+            return None
+        
+        for candidate in containers:
+            name = self.docker_service.container_name(candidate)
+            if name.endswith(_CLAIMED_SUFFIX) or candidate.attrs.get('ImageID') != image_id:
+                continue
+            try:
+                self.docker_service.rename_container(candidate, name + _CLAIMED_SUFFIX)
+                container = self.docker_service.get_container(candidate.id)
+            except DockerServiceError:
+                # Claimed by another task run or gone; try the next one
+                continue
+            # Ownership was fixed up when the container was warmed
+            self._workspace_owned.add(container.id)
+            return container
+        return None
+    
     def write_file(self, container, file_path: str, content: str) -> None:
         """Write a file inside a running container.
         
@@ -415,9 +526,8 @@ class ContainerRunner:
                     raise RuntimeError(f"Failed to write file: {stderr}")
             else:
                 # Handle ExecResult object (shouldn't happen with stream=False)
-                exit_code = result.exit_code if hasattr(result, 'exit_code') else result[0]
+                exit_code, output = _as_exec_result(result)
                 if exit_code != 0:
-                    output = result.output if hasattr(result, 'output') else result[1]
                     if isinstance(output, bytes):
                         output = output.decode('utf-8')
                     raise RuntimeError(f"Failed to write file: {output}")
@@ -425,38 +535,242 @@ class ContainerRunner:
         except Exception as e:
             raise RuntimeError(f"Failed to write file {file_path}: {e}")
     
-    def exec_in_container_as_user(self, container, command, user: str = "node", **kwargs):
-        """Execute command in container as specified user.
+    def stream_file(self, container, file_path: str, content: str) -> None:
+        """Write a file inside a running container in a single exec.
+        
+        The content is sent over the exec's stdin and the byte count reported
+        by ``wc -c`` verifies the write, so no separate read-back is needed.
+        Falls back to ``write_file`` if stdin cannot be attached.
+        
+        Args:
+            container: Docker container object
+            file_path: Path inside container to write to
+            content: Content to write to the file
+            
+        Raises:
+            RuntimeError: If the file could not be written or verified
+        """
+        data = content.encode('utf-8')
+        quoted_path = shlex.quote(file_path)
+        command = ['sh', '-c', f'cat > {quoted_path} && wc -c < {quoted_path}']
+        
+        try:
+            exit_code, output = self.docker_service.exec_with_stdin(container, command, data)
+        except DockerServiceError:
+            self.write_file(container, file_path, content)
+            return
+        
+        if exit_code != 0:
+            raise RuntimeError(f"Failed to write file {file_path}: {output.decode('utf-8', 'replace')}")
+        
+        written = output.strip()
+        if not written.isdigit() or int(written) != len(data):
+            raise RuntimeError(
+                f"Failed to write file {file_path}: expected {len(data)} bytes, "
+                f"got {written.decode('utf-8', 'replace')!r}"
+            )
+    
+    def stream_files(self, container, files: Dict[str, str]) -> None:
+        """Write several files inside a running container in one API call.
+        
+        The files are uploaded as a single archive with ``put_archive``, which
+        needs no exec or shell in the container. If the upload fails, each
+        file falls back to ``stream_file``.
+        
+        Args:
+            container: Docker container object
+            files: Mapping of absolute path inside the container to content
+            
+        Raises:
+            RuntimeError: If a file could not be written or verified
+        """
+        try:
+            self.docker_service.put_files(
+                container, {path: content.encode('utf-8') for path, content in files.items()}
+            )
+        except DockerServiceError:
+            for file_path, content in files.items():
+                self.stream_file(container, file_path, content)
+    
+    def _ensure_workspace_owned(self, container) -> None:
+        """Give the node user ownership of /workspace once per container.
+        
+        Args:
+            container: Docker container object
+        """
+        if container.id in self._workspace_owned:
+            return
+        exit_code, output = _as_exec_result(
+            container.exec_run(['chown', '-R', 'node:node', '/workspace'])
+        )
+        if exit_code != 0:
+            print(f"Warning: Failed to change ownership of /workspace: {output.decode('utf-8')}")
+        else:
+            self._workspace_owned.add(container.id)
+    
+    def _prepare_user_exec(self, container, command, user: str):
+        """Prepare a container for running a command as a user.
+        
+        Ensures /workspace is owned by the node user. The recursive chown is
+        an extra exec, so it only runs the first time a container is used.
+        
+        Argument lists are run by Docker directly as ``user``, with no shell in
+        between. Strings need a shell, so they are wrapped with ``su``.
         
         Args:
             container: Docker container object
             command: Command to execute (string or list)
-            user: User to run command as (default: "node")
-            **kwargs: Additional arguments passed to exec_run
+            user: User to run command as
             
         Returns:
-            Result from container.exec_run
+            Tuple of (command for exec, user to pass to the exec)
         """
         # First, ensure the workspace is owned by the target user
         if user == "node":
-            chown_result = container.exec_run(['chown', '-R', 'node:node', '/workspace'])
-            # Handle both tuple format (exit_code, output) and object format
-            if isinstance(chown_result, tuple):
-                exit_code, output = chown_result
-            else:
-                exit_code = chown_result.exit_code
-                output = chown_result.output
-            if exit_code != 0:
-                print(f"Warning: Failed to change ownership of /workspace: {output.decode('utf-8')}")
+            self._ensure_workspace_owned(container)
         
         # If command is a string, keep it as a string for proper shell execution
         if isinstance(command, str):
             # Use su without - to preserve current directory
-            command_with_user = ['su', user, '-c', command]
-        else:
-            # If command is a list, properly escape each argument for shell execution
-            escaped_args = [shlex.quote(str(arg)) for arg in command]
-            shell_command = ' '.join(escaped_args)
-            command_with_user = ['su', user, '-c', shell_command]
+            return ['su', user, '-c', command], ''
+        
+        # Argument lists skip the su and sh processes entirely
+        return [str(arg) for arg in command], user
+    
+    def exec_in_container_as_user(self, container, command, user: str = "node", **kwargs):
+        """Execute command in container as specified user.
+        
+        Args:
+            container: Docker container object
+            command: Command to execute (string or list)
+            user: User to run command as (default: "node")
+            **kwargs: Additional arguments passed to exec_run
+            
+        Returns:
+            ExecResult with ``exit_code`` and ``output``
+        """
+        session = self._shell_sessions.get(container.id)
+        if session and session[0] == user and set(kwargs) <= {'workdir'}:
+            if not isinstance(command, str):
+                command = ' '.join(shlex.quote(str(arg)) for arg in command)
+            try:
+                return ExecResult(*session[1].run(command, kwargs.get('workdir')))
+            except DockerServiceError:
+                # Fall back to a regular exec if the session has died
+                self.close_shell(container)
+        
+        command_with_user, exec_user = self._prepare_user_exec(container, command, user)
+        return _as_exec_result(container.exec_run(command_with_user, user=exec_user, **kwargs))
+    
+    def open_shell(self, container, user: str = "node") -> None:
+        """Start a long-lived shell that later commands are routed through.
+        
+        While the shell is open, ``exec_in_container_as_user`` calls for this
+        container and user reuse it instead of creating a new exec each time.
+        If the shell cannot be started, commands keep using regular execs.
+        
+        Args:
+            container: Docker container object
+            user: User the shell runs as (default: "node")
+        """
+        if container.id in self._shell_sessions:
+            return
+        command, exec_user = self._prepare_user_exec(container, ["sh"], user)
+        try:
+            channel = self.docker_service.exec_attach(container, command, user=exec_user)
+        except DockerServiceError:
+            return
+        self._shell_sessions[container.id] = (user, ShellSession(channel))
+    
+    def close_shell(self, container) -> None:
+        """Close the shell opened by ``open_shell`` for a container, if any.
+        
+        Args:
+            container: Docker container object
+        """
+        entry = self._shell_sessions.pop(container.id, None)
+        if entry:
+            entry[1].close()
+    
+    def exec_streaming(self, container, command, user: str = "node",
+                       workdir: Optional[str] = DEFAULT_WORKDIR,
+                       stdin_data: Optional[bytes] = None) -> Iterator[bytes]:
+        """Execute a long-running command as a user and stream its output.
+        
+        Output is read from the raw exec socket in large chunks, which keeps
+        per-chunk Python overhead low for high-volume output such as Claude's
+        stream-json.
+        
+        Args:
+            container: Docker container object
+            command: Command to execute (string or list)
+            user: User to run command as (default: "node")
+            workdir: Working directory for the command
+            stdin_data: Bytes written to the command's stdin, if any
+            
+        Returns:
+            Iterator over combined stdout/stderr bytes
+        """
+        command_with_user, exec_user = self._prepare_user_exec(container, command, user)
+        return self.docker_service.exec_stream(
+            container, command_with_user, workdir=workdir, stdin_data=stdin_data, user=exec_user
+        )
+    
+    def run_batched(self, container, steps: Sequence[Tuple[str, str]], user: str = "node",
+                    workdir: Optional[str] = DEFAULT_WORKDIR,
+                    stop_on_failure: Sequence[str] = ()) -> Dict[str, Tuple[int, bytes]]:
+        """Run several shell commands in a single exec and split their results.
+        
+        Each step's combined output is framed by marker lines carrying the
+        step name and exit code, so N commands cost one Docker exec round-trip
+        instead of N.
         
-        return container.exec_run(command_with_user, **kwargs)
\ No newline at end of file
+        Args:
+            container: Docker container object
+            steps: Ordered (name, shell command) pairs
+            user: User to run the commands as (default: "node")
+            workdir: Working directory for the commands
+            stop_on_failure: Step names whose non-zero exit code aborts the
+                remaining steps
+            
+        Returns:
+            Mapping of step name to (exit_code, output) for every step that ran
+        """
+        marker = f"::claude-container-{uuid.uuid4().hex[:8]}"
+        script_parts = []
+        for name, command in steps:
+            script_parts.append(
+                f"echo '{marker} STEP {name}'; {command} 2>&1; rc=$?; echo; echo \"{marker} RC $rc\""
+            )
+            if name in stop_on_failure:
+                script_parts.append('[ "$rc" -eq 0 ] || exit "$rc"')
+        
+        result = self.exec_in_container_as_user(
+            container,
+            "; ".join(script_parts),
+            user=user,
+            workdir=workdir
+        )
+        return self._parse_batched_output(result.output, marker.encode())
+    
+    @staticmethod
+    def _parse_batched_output(output: bytes, marker: bytes) -> Dict[str, Tuple[int, bytes]]:
+        """Split marker-delimited batch output into per-step results."""
+        results = {}
+        current_step = None
+        step_lines: List[bytes] = []
+        
+        for line in output.split(b'\n'):
+            if not line.startswith(marker + b' '):
+                step_lines.append(line)
+                continue
+            
+            kind, _, value = line[len(marker) + 1:].partition(b' ')
+            if kind == b'STEP':
+                current_step = value.decode()
+                step_lines = []
+            elif kind == b'RC' and current_step is not None:
+                results[current_step] = (int(value), b'\n'.join(step_lines).rstrip(b'\n'))
+                current_step = None
+        
+        return results
@@ -0,0 +1,77 @@
+"""Long-lived shell session for running many commands over one exec."""
+
+import shlex
+import uuid
+from typing import Optional, Tuple
+
+from ..services.docker_service import ExecChannel
+from ..services.exceptions import DockerServiceError
+
+
+class ShellSession:
+    """Runs shell commands one after another through a single ``sh`` exec.
+
+    Each command is written to the shell's stdin followed by a marker line
+    carrying its exit code, so a command costs one write and a read instead
+    of a Docker exec create/start/inspect round-trip.
+    """
+
+    def __init__(self, channel: ExecChannel):
+        """Initialize the session.
+
+        Args:
+            channel: Open exec running ``sh`` with stdin attached
+        """
+        self._channel = channel
+        self._marker = f"::claude-container-shell-{uuid.uuid4().hex[:8]} ".encode()
+        self._buffer = bytearray()
+        self.closed = False
+
+    def run(self, command: str, workdir: Optional[str] = None) -> Tuple[int, bytes]:
+        """Run a command in the session and wait for it to finish.
+
+        The command runs in a subshell with stdin from /dev/null, so ``cd``,
+        ``exit`` or reads from stdin cannot disturb the session.
+
+        Args:
+            command: Shell command to run
+            workdir: Directory to run the command in
+
+        Returns:
+            Tuple of (exit_code, combined stdout/stderr bytes)
+
+        Raises:
+            DockerServiceError: If the session is closed or the shell exits
+        """
+        if self.closed:
+            raise DockerServiceError("Shell session is closed")
+
+        if workdir:
+            command = f"cd {shlex.quote(workdir)} && {command}"
+        marker = self._marker.decode()
+        self._channel.send(
+            f"(\n{command}\n) </dev/null 2>&1; printf '\\n{marker}%d\\n' $?\n".encode()
+        )
+
+        terminator = b"\n" + self._marker
+        while True:
+            start = self._buffer.find(terminator)
+            end = self._buffer.find(b"\n", start + len(terminator)) if start != -1 else -1
+            if end != -1:
+                break
+            try:
+                self._buffer += next(self._channel.output)
+            except StopIteration:
+                self.closed = True
+                raise DockerServiceError("Shell session ended unexpectedly")
+
+        output = bytes(self._buffer[:start])
+        exit_code = int(self._buffer[start + len(terminator):end])
+        del self._buffer[:end + 1]
+        return exit_code, output
+
+    def close(self) -> None:
+        """End the shell by closing its stdin."""
+        if not self.closed:
+            self.closed = True
+            self._channel.close()
@@ -1,14 +1,55 @@
 """Task storage manager for persistent task tracking."""
+import bisect
 import json
 import shutil
 import uuid
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Union
 
 from claude_container.models.task import FeedbackEntry, TaskMetadata, TaskStatus
 
 
+class TaskUpdateBatch:
+    """Collects task field updates and writes them with a single ``update_task``.
+    
+    Can be used as a context manager, in which case pending updates are
+    flushed when the block exits, or flushed explicitly with ``flush``.
+    """
+
+    def __init__(self, storage_manager: "TaskStorageManager", task_id: str):
+        """Initialize the batch.
+        
+        Args:
+            storage_manager: Storage manager that writes the task
+            task_id: The task ID
+        """
+        self._storage_manager = storage_manager
+        self.task_id = task_id
+        self._updates: Dict[str, Any] = {}
+
+    def update(self, **updates) -> None:
+        """Record field updates; later values for a field replace earlier ones.
+        
+        Args:
+            **updates: Fields to update
+        """
+        self._updates.update(updates)
+
+    def flush(self) -> None:
+        """Write all pending updates to disk."""
+        if self._updates:
+            updates, self._updates = self._updates, {}
+            self._storage_manager.update_task(self.task_id, **updates)
+
+    def __enter__(self) -> "TaskUpdateBatch":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.flush()
+
+
 class TaskStorageManager:
     """Manages persistent storage of task metadata and history."""
 
@@ -20,6 +61,8 @@ class TaskStorageManager:
         """
         self.tasks_dir = data_dir / "tasks"
         self.registry_file = self.tasks_dir / "task_registry.json"
+        # Lowercased descriptions for search, kept apart so the registry stays small
+        self.descriptions_file = self.tasks_dir / "descriptions.idx"
         self._ensure_storage_structure()
 
     def _ensure_storage_structure(self) -> None:
@@ -43,6 +86,28 @@ class TaskStorageManager:
         with open(self.registry_file, 'w') as f:
             json.dump(registry, f, indent=2, sort_keys=True)
 
+    def _load_description_index(self) -> Dict[str, str]:
+        """Load the lowercased task descriptions used by search.
+        
+        Each line is a JSON ``[task_id, description]`` pair; tasks created
+        before the index existed have no line.
+        """
+        if not self.descriptions_file.exists():
+            return {}
+        with open(self.descriptions_file, 'r') as f:
+            return dict(json.loads(line) for line in f if line.strip())
+
+    def _index_description(self, task_id: str, description: str) -> None:
+        """Append a task's lowercased description to the search index."""
+        with open(self.descriptions_file, 'a') as f:
+            f.write(json.dumps([task_id, description.lower()]) + "\n")
+
+    def _save_description_index(self, index: Dict[str, str]) -> None:
+        """Rewrite the search index, e.g. after a task is changed or removed."""
+        with open(self.descriptions_file, 'w') as f:
+            f.writelines(json.dumps([task_id, description]) + "\n"
+                         for task_id, description in index.items())
+
     def _get_task_dir(self, task_id: str) -> Path:
         """Get the directory for a specific task."""
         return self.tasks_dir / "tasks" / task_id
@@ -144,6 +209,7 @@ class TaskStorageManager:
             "pr_url": None
         }
         self._save_registry(registry)
+        self._index_description(task_id, description)
         
         return task
 
@@ -189,7 +255,16 @@ class TaskStorageManager:
         with open(metadata_file, 'w') as f:
             json.dump(self._serialize_task(task), f, indent=2)
         
-        # Update registry if needed
+        if "description" in updates:
+            index = self._load_description_index()
+            index[task_id] = task.description.lower()
+            self._save_description_index(index)
+        
+        # Only status and pr_url are mirrored in the registry; skip reading
+        # and rewriting it for updates that touch neither
+        if "status" not in updates and "pr_url" not in updates:
+            return
+        
         registry = self._load_registry()
         if task_id in registry:
             if "status" in updates:
@@ -198,6 +273,17 @@ class TaskStorageManager:
                 registry[task_id]["pr_url"] = updates["pr_url"]
             self._save_registry(registry)
 
+    def batch_update(self, task_id: str) -> TaskUpdateBatch:
+        """Start a batch of updates that is written to disk once.
+        
+        Args:
+            task_id: The task ID
+            
+        Returns:
+            TaskUpdateBatch collecting updates for the task
+        """
+        return TaskUpdateBatch(self, task_id)
+
     def add_feedback(self, task_id: str, feedback: str, feedback_type: str = "text") -> None:
         """Add feedback to a task.
         
@@ -210,9 +296,10 @@ class TaskStorageManager:
         if not task:
             raise ValueError(f"Task {task_id} not found")
         
-        # Create feedback entry
+        # Create feedback entry; the same timestamp marks the continuation
+        now = datetime.now()
         entry = FeedbackEntry(
-            timestamp=datetime.now(),
+            timestamp=now,
             feedback=feedback,
             feedback_type=feedback_type
         )
@@ -220,7 +307,7 @@ class TaskStorageManager:
         # Add to task history
         task.feedback_history.append(entry)
         task.continuation_count += 1
-        task.last_continued_at = datetime.now()
+        task.last_continued_at = now
         task.status = TaskStatus.CONTINUED
         
         # Save feedback to file
@@ -258,20 +345,73 @@ class TaskStorageManager:
             status: Optional status filter
             
         Returns:
-            List of TaskMetadata instances
+            List of TaskMetadata instances, newest first
         """
-        registry = self._load_registry()
-        tasks = []
+        return list(self.iter_tasks(status))
+
+    def iter_tasks(self, status: Optional[TaskStatus] = None,
+                   branch: Optional[str] = None) -> Iterator[TaskMetadata]:
+        """Iterate over tasks newest first, reading each one only when reached.
         
-        for task_id in registry:
+        Tasks are ordered by the creation time kept in the registry, so a
+        caller that stops early never reads the metadata of the remaining
+        tasks. The branch and status filters are also answered from the
+        registry, so a filter nothing matches reads no task at all.
+        
+        Args:
+            status: Optional status filter
+            branch: Optional branch name filter
+            
+        Yields:
+            TaskMetadata instances
+        """
+        registry = self._load_registry()
+        for task_id in self._newest_first(registry):
+            task_info = registry[task_id]
+            if branch is not None and task_info.get("branch_name") != branch:
+                continue
+            if status is not None and task_info.get("status", status.value) != status.value:
+                continue
             task = self.get_task(task_id)
-            if task:
-                if status is None or task.status == status:
-                    tasks.append(task)
+            if task and (status is None or task.status == status):
+                yield task
+
+    @staticmethod
+    def _newest_first(registry: dict) -> List[str]:
+        """Order registry task IDs by creation time, newest first."""
+        # ISO timestamps from one clock sort the same as the datetimes they encode
+        return sorted(
+            registry, key=lambda task_id: registry[task_id].get("created_at") or "", reverse=True
+        )
+
+    def list_task_ids(self) -> List[str]:
+        """List all task IDs without loading any task metadata.
         
-        # Sort by created_at, newest first
-        tasks.sort(key=lambda t: t.created_at, reverse=True)
-        return tasks
+        Returns:
+            Sorted list of task IDs
+        """
+        # The registry is saved with sorted keys, so this sort is a single pass
+        return sorted(self._load_registry())
+
+    def lookup_by_prefix(self, prefix: str) -> List[str]:
+        """Find task IDs that start with a prefix.
+        
+        Only the registry is read, so no task metadata is deserialized.
+        The IDs are sorted, so matches form one contiguous run whose ends
+        are both found with a binary search; two or more matches means the
+        prefix is ambiguous.
+        
+        Args:
+            prefix: Full or partial task ID
+            
+        Returns:
+            Sorted list of matching task IDs
+        """
+        task_ids = self.list_task_ids()
+        start = bisect.bisect_left(task_ids, prefix)
+        # Every ID starting with the prefix sorts below prefix + U+FFFF
+        end = bisect.bisect_left(task_ids, prefix + '\uffff', lo=start)
+        return task_ids[start:end]
 
     def delete_task(self, task_id: str) -> None:
         """Delete a task and all associated data.
@@ -285,6 +425,10 @@ class TaskStorageManager:
             del registry[task_id]
             self._save_registry(registry)
         
+        index = self._load_description_index()
+        if index.pop(task_id, None) is not None:
+            self._save_description_index(index)
+        
         # Remove task directory
         task_dir = self._get_task_dir(task_id)
         if task_dir.exists():
@@ -299,13 +443,20 @@ class TaskStorageManager:
         Returns:
             List of matching TaskMetadata instances
         """
-        tasks = self.list_tasks()
         query_lower = query.lower()
-        
-        matching_tasks = [
-            task for task in tasks
-            if query_lower in task.description.lower()
-        ]
+        registry = self._load_registry()
+        descriptions = self._load_description_index()
+        
+        # Descriptions are matched in the search index, so only matching tasks
+        # are read; tasks missing from the index are read to check them
+        matching_tasks = []
+        for task_id in self._newest_first(registry):
+            description = descriptions.get(task_id)
+            if description is not None and query_lower not in description:
+                continue
+            task = self.get_task(task_id)
+            if task and query_lower in task.description.lower():
+                matching_tasks.append(task)
         
         return matching_tasks
 
@@ -326,19 +477,37 @@ class TaskStorageManager:
         
         return None
 
-    def save_task_log(self, task_id: str, log_type: str, content: str) -> None:
+    def save_task_log(self, task_id: str, log_type: str, content: Union[str, bytes]) -> None:
         """Save a log file for a task.
         
         Args:
             task_id: The task ID
             log_type: Type of log (e.g., 'claude_output', 'execution')
-            content: Log content to save
+            content: Log content to save; bytes are written as-is
         """
         task_dir = self._get_task_dir(task_id)
         log_file = task_dir / "logs" / f"{log_type}.log"
         
-        with open(log_file, 'w') as f:
-            f.write(content)
+        if isinstance(content, bytes):
+            log_file.write_bytes(content)
+        else:
+            with open(log_file, 'w') as f:
+                f.write(content)
+
+    def open_task_log(self, task_id: str, log_type: str) -> BinaryIO:
+        """Open a task log file for writing raw bytes as they arrive.
+        
+        Any existing log of the same type is replaced, as with ``save_task_log``.
+        
+        Args:
+            task_id: The task ID
+            log_type: Type of log (e.g., 'claude_output', 'execution')
+            
+        Returns:
+            Binary file object; the caller is responsible for closing it
+        """
+        task_dir = self._get_task_dir(task_id)
+        return open(task_dir / "logs" / f"{log_type}.log", 'wb')
 
     def get_task_log(self, task_id: str, log_type: str) -> Optional[str]:
         """Get a log file for a task.
@@ -354,7 +523,8 @@ class TaskStorageManager:
         log_file = task_dir / "logs" / f"{log_type}.log"
         
         if log_file.exists():
-            with open(log_file, 'r') as f:
+            # Raw Claude output is stored undecoded
+            with open(log_file, 'r', errors='replace') as f:
                 return f.read()
         
         return None
@@ -369,14 +539,6 @@ class TaskStorageManager:
         Returns:
             List of TaskMetadata instances sorted by creation time (newest first)
         """
-        tasks = self.list_tasks()
-        
-        # Filter by branch if specified
-        if branch:
-            tasks = [task for task in tasks if task.branch_name == branch]
-        
-        # Apply limit if specified
-        if limit:
-            tasks = tasks[:limit]
-        
-        return tasks
\ No newline at end of file
+        # Tasks past the limit are never read
+        tasks = self.iter_tasks(branch=branch or None)
+        return list(islice(tasks, limit or None))
\ No newline at end of file
@@ -2,10 +2,12 @@
 
 from .docker_service import DockerService
 from .git_service import GitService
+from .github_service import GitHubService
 from .exceptions import (
     ServiceError,
     DockerServiceError,
     GitServiceError,
+    GitHubServiceError,
     ImageNotFoundError,
     ContainerNotFoundError,
     BranchNotFoundError,
@@ -14,9 +16,11 @@ from .exceptions import (
 __all__ = [
     "DockerService",
     "GitService",
+    "GitHubService",
     "ServiceError",
     "DockerServiceError",
     "GitServiceError",
+    "GitHubServiceError",
     "ImageNotFoundError",
     "ContainerNotFoundError",
     "BranchNotFoundError",
@@ -2,12 +2,17 @@
 
 import io
 import logging
+import re
+import socket
+import struct
 import tarfile
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 import docker
 import docker.errors
+from docker.utils.socket import read as socket_read
 from docker.models.containers import Container
 from docker.models.images import Image
 
@@ -19,6 +24,140 @@ from .exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Size of each raw read from an exec socket
+EXEC_STREAM_CHUNK_SIZE = 65536
+
+# Idle seconds before TCP keepalive probes start on exec sockets to a remote daemon
+EXEC_KEEPALIVE_IDLE = 30
+
+# Docker multiplexed stream frame header: 1 byte stream type, 3 padding bytes, 4 byte size
+_FRAME_HEADER = struct.Struct('>BxxxL')
+
+
+def _enable_tcp_keepalive(sock: Any) -> None:
+    """Enable TCP keepalive on an exec socket connected to a remote daemon.
+
+    Claude can go quiet for minutes while it thinks; keepalive probes stop
+    NATs and load balancers from dropping the idle stream. Unix sockets are
+    left untouched.
+    """
+    raw_sock = getattr(sock, '_sock', sock)
+    if not isinstance(raw_sock, socket.socket) or raw_sock.family not in (socket.AF_INET, socket.AF_INET6):
+        return
+    raw_sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    if hasattr(socket, 'TCP_KEEPIDLE'):
+        raw_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, EXEC_KEEPALIVE_IDLE)
+
+
+def _write_exec_stdin(sock: Any, data: bytes) -> None:
+    """Send ``data`` to an exec's stdin and half-close it.
+
+    Raises:
+        DockerServiceError: If the socket cannot be written
+    """
+    try:
+        # exec_start hands back a SocketIO wrapper on Unix sockets; the
+        # half-close has to go to the underlying socket
+        raw_sock = getattr(sock, '_sock', sock)
+        raw_sock.sendall(data)
+        raw_sock.shutdown(socket.SHUT_WR)
+    except (AttributeError, OSError) as e:
+        sock.close()
+        raise DockerServiceError(f"Failed to write to exec stdin: {e}") from e
+
+
+def _socket_reader(sock: Any) -> Callable[[int], bytes]:
+    """Return a function reading up to n bytes from an exec socket.
+
+    On Unix sockets ``exec_start`` returns a SocketIO wrapper around a
+    socket that still carries the client's timeout (60 s by default).
+    docker-py's generic ``read`` helper polls before every recv so a quiet
+    stream never times out. Making the socket blocking keeps that behaviour
+    and lets it be read directly, skipping the poll on every call.
+    """
+    raw_sock = getattr(sock, '_sock', None)
+    if isinstance(raw_sock, socket.socket):
+        # Claude can go quiet for minutes; a timed-out recv would end the stream
+        raw_sock.settimeout(None)
+        return raw_sock.recv
+    return lambda n: socket_read(sock, n)
+
+
+def _iter_exec_socket(sock: Any, chunk_size: int) -> Iterator[bytes]:
+    """Read a non-TTY exec socket in large chunks and strip frame headers.
+
+    Every chunk read from the socket is demultiplexed in one pass, so a
+    single yielded payload may contain many Docker frames.
+
+    Args:
+        sock: Socket returned by ``exec_start(socket=True)``
+        chunk_size: Maximum number of bytes per read
+
+    Yields:
+        Combined stdout/stderr payload bytes
+    """
+    read = _socket_reader(sock)
+    pending = bytearray()
+    try:
+        while True:
+            data = read(chunk_size)
+            if not data:
+                break
+            pending += data
+
+            payload = bytearray()
+            offset = 0
+            # Slicing the memoryview copies each payload only once
+            with memoryview(pending) as view:
+                while len(pending) - offset >= _FRAME_HEADER.size:
+                    _, size = _FRAME_HEADER.unpack_from(view, offset)
+                    start = offset + _FRAME_HEADER.size
+                    end = start + size
+                    if end > len(pending):
+                        break
+                    payload += view[start:end]
+                    offset = end
+            del pending[:offset]
+
+            if payload:
+                yield bytes(payload)
+    finally:
+        sock.close()
+
+
+class ExecChannel:
+    """An open exec whose stdin can be written while its output is read."""
+
+    def __init__(self, sock: Any, chunk_size: int = EXEC_STREAM_CHUNK_SIZE):
+        """Wrap a socket returned by ``exec_start(socket=True)``.
+
+        Args:
+            sock: Exec socket with stdin attached
+            chunk_size: Maximum number of bytes per socket read
+        """
+        self._sock = sock
+        self.output = _iter_exec_socket(sock, chunk_size)
+
+    def send(self, data: bytes) -> None:
+        """Write bytes to the command's stdin.
+
+        Raises:
+            DockerServiceError: If the socket cannot be written
+        """
+        try:
+            getattr(self._sock, '_sock', self._sock).sendall(data)
+        except (AttributeError, OSError) as e:
+            raise DockerServiceError(f"Failed to write to exec stdin: {e}") from e
+
+    def close(self) -> None:
+        """Close stdin and the exec socket."""
+        try:
+            getattr(self._sock, '_sock', self._sock).shutdown(socket.SHUT_WR)
+        except (AttributeError, OSError):
+            pass
+        self.output.close()
+        self._sock.close()
+
 
 class DockerService:
     """Service for Docker operations with clean abstractions."""
@@ -163,6 +302,127 @@ class DockerService:
         except Exception as e:
             raise DockerServiceError(f"Unexpected error executing in container: {e}") from e
 
+    def _start_exec(
+        self,
+        container: Container,
+        command: Any,
+        workdir: Optional[str],
+        stdin: bool,
+        user: str = '',
+    ) -> Tuple[str, Any]:
+        """Create and start an exec, returning its ID and raw socket.
+
+        Raises:
+            ContainerNotFoundError: If container not found
+            DockerServiceError: If execution fails
+        """
+        try:
+            exec_id = self.client.api.exec_create(
+                container.id, command, stdin=stdin, workdir=workdir, user=user
+            )['Id']
+            sock = self.client.api.exec_start(exec_id, socket=True)
+            _enable_tcp_keepalive(sock)
+        except docker.errors.NotFound as e:
+            raise ContainerNotFoundError("Container not found") from e
+        except docker.errors.APIError as e:
+            raise DockerServiceError(f"Failed to execute in container: {e}") from e
+        except Exception as e:
+            raise DockerServiceError(f"Unexpected error executing in container: {e}") from e
+        return exec_id, sock
+
+    def exec_stream(
+        self,
+        container: Container,
+        command: Any,
+        workdir: Optional[str] = None,
+        chunk_size: int = EXEC_STREAM_CHUNK_SIZE,
+        stdin_data: Optional[bytes] = None,
+        user: str = '',
+    ) -> Iterator[bytes]:
+        """Execute a command and stream its output from the raw exec socket.
+
+        Unlike ``exec_run(stream=True)``, which yields one Python-level item
+        per Docker frame, this reads the socket in ``chunk_size`` blocks.
+
+        Args:
+            container: Container object
+            command: Command to execute (string or list)
+            workdir: Working directory for the command
+            chunk_size: Maximum number of bytes per socket read
+            stdin_data: Bytes sent to the command's stdin before output is
+                read; stdin is not attached when None
+            user: User to run the command as; the container's default if empty
+
+        Returns:
+            Iterator over combined stdout/stderr bytes
+
+        Raises:
+            ContainerNotFoundError: If container not found
+            DockerServiceError: If execution fails
+        """
+        _, sock = self._start_exec(
+            container, command, workdir, stdin=stdin_data is not None, user=user
+        )
+        if stdin_data is not None:
+            _write_exec_stdin(sock, stdin_data)
+        return _iter_exec_socket(sock, chunk_size)
+
+    def exec_with_stdin(
+        self,
+        container: Container,
+        command: Any,
+        data: bytes,
+        workdir: Optional[str] = None,
+    ) -> Tuple[int, bytes]:
+        """Execute a command, writing ``data`` to its stdin over the exec socket.
+
+        Args:
+            container: Container object
+            command: Command to execute (string or list)
+            data: Bytes sent to the command's stdin before it is closed
+            workdir: Working directory for the command
+
+        Returns:
+            Tuple of (exit_code, combined stdout/stderr bytes)
+
+        Raises:
+            ContainerNotFoundError: If container not found
+            DockerServiceError: If execution fails or stdin cannot be attached
+        """
+        exec_id, sock = self._start_exec(container, command, workdir, stdin=True)
+        _write_exec_stdin(sock, data)
+        output = b''.join(_iter_exec_socket(sock, EXEC_STREAM_CHUNK_SIZE))
+        try:
+            exit_code = self.client.api.exec_inspect(exec_id)['ExitCode']
+        except docker.errors.APIError as e:
+            raise DockerServiceError(f"Failed to inspect exec: {e}") from e
+        return exit_code, output
+
+    def exec_attach(
+        self,
+        container: Container,
+        command: Any,
+        workdir: Optional[str] = None,
+        user: str = '',
+    ) -> ExecChannel:
+        """Start a command with stdin attached and keep the exec open.
+
+        Args:
+            container: Container object
+            command: Command to execute (string or list)
+            workdir: Working directory for the command
+            user: User to run the command as; the container's default if empty
+
+        Returns:
+            ExecChannel for writing to the command's stdin and reading its output
+
+        Raises:
+            ContainerNotFoundError: If container not found
+            DockerServiceError: If execution fails
+        """
+        _, sock = self._start_exec(container, command, workdir, stdin=True, user=user)
+        return ExecChannel(sock)
+
     def remove_container(self, container: Container, force: bool = False) -> None:
         """Remove a container.
 
@@ -183,6 +443,29 @@ class DockerService:
         except Exception as e:
             raise DockerServiceError(f"Unexpected error removing container: {e}") from e
 
+    def rename_container(self, container: Container, name: str) -> None:
+        """Rename a container.
+
+        Docker refuses the rename if the name is already taken, so a rename
+        to a name derived from the container's own can be used as a claim.
+
+        Args:
+            container: Container object
+            name: New container name
+
+        Raises:
+            ContainerNotFoundError: If container not found
+            DockerServiceError: If the rename fails
+        """
+        try:
+            container.rename(name)
+        except docker.errors.NotFound as e:
+            raise ContainerNotFoundError("Container not found") from e
+        except docker.errors.APIError as e:
+            raise DockerServiceError(f"Failed to rename container: {e}") from e
+        except Exception as e:
+            raise DockerServiceError(f"Unexpected error renaming container: {e}") from e
+
     def image_exists(self, image_name: str) -> bool:
         """Check if an image exists.
 
@@ -201,6 +484,23 @@ class DockerService:
             logger.warning(f"Error checking image existence: {e}")
             return False
 
+    def get_image_digest(self, image_name: str) -> Optional[str]:
+        """Get the content-addressed ID of an image.
+
+        Args:
+            image_name: Name of the image
+
+        Returns:
+            Image ID (sha256 digest), or None if the image does not exist
+        """
+        try:
+            return self.client.images.get(image_name).id
+        except docker.errors.ImageNotFound:
+            return None
+        except Exception as e:
+            logger.warning(f"Error getting image digest: {e}")
+            return None
+
     def remove_image(self, image_name: str, force: bool = True) -> None:
         """Remove a Docker image.
 
@@ -248,11 +548,49 @@ class DockerService:
         except Exception as e:
             raise DockerServiceError(f"Failed to copy to container: {e}") from e
 
+    def put_files(self, container: Container, files: Dict[str, bytes]) -> None:
+        """Write files into a container with a single archive upload.
+
+        The files are packed into an in-memory tar and extracted by the
+        daemon, so no process runs in the container and no shell quoting is
+        involved. The daemon's reply is the only check, so no read-back exec
+        is needed.
+
+        Args:
+            container: Container object
+            files: Mapping of absolute path inside the container to content
+
+        Raises:
+            ContainerNotFoundError: If container not found
+            DockerServiceError: If the upload fails
+        """
+        tar_stream = io.BytesIO()
+        mtime = datetime.now().timestamp()
+        with tarfile.open(fileobj=tar_stream, mode='w') as tar:
+            for path, data in files.items():
+                info = tarfile.TarInfo(path.lstrip('/'))
+                info.size = len(data)
+                info.mode = 0o644
+                info.mtime = mtime
+                tar.addfile(info, io.BytesIO(data))
+
+        try:
+            written = container.put_archive('/', tar_stream.getvalue())
+        except docker.errors.NotFound as e:
+            raise ContainerNotFoundError("Container not found") from e
+        except Exception as e:
+            raise DockerServiceError(f"Failed to write files to container: {e}") from e
+
+        if written is False:
+            raise DockerServiceError("Failed to write files to container: archive was rejected")
+
     def list_containers(
         self,
         all: bool = True,
         filters: Optional[Dict[str, Any]] = None,
         labels: Optional[Dict[str, str]] = None,
+        sparse: bool = False,
+        name_prefix: Optional[str] = None,
     ) -> List[Container]:
         """List containers with optional filters.
 
@@ -260,6 +598,13 @@ class DockerService:
             all: Include stopped containers
             filters: Docker filters
             labels: Label filters
+            name_prefix: Only include containers whose name starts with this;
+                applied by the daemon, so other containers are never sent
+            sparse: Only use the list response instead of inspecting every
+                container (one API call instead of N + 1). Sparse containers
+                are never reloaded behind the caller's back, so use
+                container_name() and container_created() to read the
+                partial attributes. Sizes are not requested either way.
 
         Returns:
             List of containers
@@ -271,13 +616,48 @@ class DockerService:
             filter_dict = filters or {}
             if labels:
                 filter_dict['label'] = [f"{k}={v}" for k, v in labels.items()]
+            if name_prefix:
+                # Docker matches the name filter as a regex against "/<name>"
+                filter_dict['name'] = [f"^/{re.escape(name_prefix)}"]
 
-            return self.client.containers.list(all=all, filters=filter_dict)
+            return self.client.containers.list(all=all, filters=filter_dict, sparse=sparse)
         except docker.errors.APIError as e:
             raise DockerServiceError(f"Failed to list containers: {e}") from e
         except Exception as e:
             raise DockerServiceError(f"Unexpected error listing containers: {e}") from e
 
+    @staticmethod
+    def container_name(container: Container) -> str:
+        """Get a container's name from either a full or a sparse container.
+
+        Args:
+            container: Container object
+
+        Returns:
+            Container name without the leading slash
+        """
+        if container.name:
+            return container.name
+        return container.attrs['Names'][0].lstrip('/')
+
+    @staticmethod
+    def container_created(container: Container) -> str:
+        """Get a container's creation time as ``YYYY-MM-DDTHH:MM:SS`` (UTC).
+
+        Sparse containers carry a Unix timestamp from the list endpoint while
+        inspected containers carry an RFC 3339 string.
+
+        Args:
+            container: Container object
+
+        Returns:
+            Creation timestamp truncated to seconds
+        """
+        created = container.attrs['Created']
+        if isinstance(created, int):
+            return datetime.fromtimestamp(created, timezone.utc).isoformat(timespec='seconds')[:19]
+        return created[:19]
+
     def get_container(self, container_id: str) -> Container:
         """Get a container by ID or name.
 
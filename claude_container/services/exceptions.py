@@ -19,6 +19,12 @@ class GitServiceError(ServiceError):
     pass
 
 
+class GitHubServiceError(ServiceError):
+    """Exception raised for GitHub API operations."""
+
+    pass
+
+
 class ImageNotFoundError(DockerServiceError):
     """Exception raised when a Docker image is not found."""
 
@@ -10,6 +10,60 @@ from .exceptions import GitServiceError, BranchNotFoundError
 logger = logging.getLogger(__name__)
 
 
+def _find_git_dir(repo_path: Path) -> Optional[Path]:
+    """Find the directory holding a repository's refs without running git.
+
+    Follows the ``gitdir:`` file used by worktrees and submodules, and the
+    ``commondir`` file that points worktrees at the shared refs.
+    """
+    git_dir = repo_path / ".git"
+    if git_dir.is_file():
+        content = git_dir.read_text(encoding="utf-8").strip()
+        if not content.startswith("gitdir:"):
+            return None
+        git_dir = repo_path / content[len("gitdir:"):].strip()
+    if not git_dir.is_dir():
+        return None
+
+    commondir = git_dir / "commondir"
+    if commondir.is_file():
+        git_dir = git_dir / commondir.read_text(encoding="utf-8").strip()
+    return git_dir
+
+
+def local_branch_exists(repo_path: Path, branch_name: str) -> Optional[bool]:
+    """Check for a local branch by reading the repository's refs directly.
+
+    Avoids starting a git process for the lookup: the loose ref file is
+    checked first, then ``packed-refs``.
+
+    Args:
+        repo_path: Path to the git repository
+        branch_name: Name of the branch
+
+    Returns:
+        Whether the branch exists, or None if the refs cannot be read
+        directly (no ``.git`` at ``repo_path`` or a reftable repository) and
+        git should be asked instead
+    """
+    git_dir = _find_git_dir(repo_path)
+    if git_dir is None or (git_dir / "reftable").exists():
+        return None
+
+    ref = f"refs/heads/{branch_name}"
+    if (git_dir / ref).is_file():
+        return True
+
+    try:
+        packed_refs = (git_dir / "packed-refs").read_bytes()
+    except FileNotFoundError:
+        return False
+    # Lines are "<sha> <ref>"; peeled tag lines start with "^" and never match
+    return any(
+        line.partition(b" ")[2] == ref.encode() for line in packed_refs.splitlines()
+    )
+
+
 class GitService:
     """Service for Git operations with clean abstractions."""
 
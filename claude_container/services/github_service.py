@@ -0,0 +1,143 @@
+"""GitHub service for talking to the GitHub REST API directly."""
+
+import json
+import os
+import re
+import subprocess
+import urllib.error
+import urllib.request
+from typing import Optional, Tuple
+
+from .exceptions import GitHubServiceError
+
+GITHUB_API_URL = "https://api.github.com"
+
+# Matches https://github.com/owner/repo(.git), git@github.com:owner/repo(.git)
+# and ssh://git@github.com/owner/repo(.git)
+_REPO_PATTERN = re.compile(r"github\.com[:/](?P<owner>[^/]+)/(?P<repo>[^/]+?)(?:\.git)?/?$")
+
+
+def parse_github_repo(remote_url: str) -> Tuple[str, str]:
+    """Get the owner and repository name from a GitHub remote URL.
+
+    Args:
+        remote_url: URL of the git remote
+
+    Returns:
+        Tuple of (owner, repo)
+
+    Raises:
+        GitHubServiceError: If the URL does not point at a GitHub repository
+    """
+    match = _REPO_PATTERN.search(remote_url.strip())
+    if not match:
+        raise GitHubServiceError(f"Not a GitHub repository URL: {remote_url.strip()}")
+    return match.group("owner"), match.group("repo")
+
+
+class GitHubService:
+    """Service for GitHub operations over the REST API."""
+
+    def __init__(self, token: Optional[str] = None):
+        """Initialize GitHub service.
+
+        Args:
+            token: API token; looked up from the environment or the GitHub
+                CLI on first use if omitted
+        """
+        self._token = token
+
+    def _get_token(self) -> str:
+        """Get the API token, asking the GitHub CLI only if no env var is set.
+
+        Raises:
+            GitHubServiceError: If no token is available
+        """
+        if self._token:
+            return self._token
+
+        token = os.environ.get("GITHUB_TOKEN") or os.environ.get("GH_TOKEN")
+        if not token:
+            try:
+                result = subprocess.run(
+                    ["gh", "auth", "token"], capture_output=True, text=True, check=True
+                )
+                token = result.stdout.strip()
+            except (OSError, subprocess.CalledProcessError) as e:
+                raise GitHubServiceError(
+                    "No GitHub token found; set GITHUB_TOKEN or run 'gh auth login'"
+                ) from e
+
+        self._token = token
+        return token
+
+    def has_token(self) -> bool:
+        """Check whether an API token is available.
+
+        Returns:
+            True if a token was given or could be looked up
+        """
+        try:
+            self._get_token()
+        except GitHubServiceError:
+            return False
+        return True
+
+    def prefetch_token(self) -> None:
+        """Look up the API token ahead of the first request.
+
+        Lets the lookup overlap other work. Failures are ignored here and
+        raised again when a request needs the token.
+        """
+        try:
+            self._get_token()
+        except GitHubServiceError:
+            pass
+
+    def create_pull_request(
+        self,
+        owner: str,
+        repo: str,
+        title: str,
+        body: str,
+        head: str,
+        base: str,
+        draft: bool = True,
+    ) -> str:
+        """Create a pull request.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            title: Pull request title
+            body: Pull request body
+            head: Branch with the changes
+            base: Branch to merge into
+            draft: Whether to open the pull request as a draft
+
+        Returns:
+            URL of the new pull request
+
+        Raises:
+            GitHubServiceError: If the request fails
+        """
+        payload = {"title": title, "body": body, "head": head, "base": base, "draft": draft}
+        request = urllib.request.Request(
+            f"{GITHUB_API_URL}/repos/{owner}/{repo}/pulls",
+            data=json.dumps(payload).encode(),
+            headers={
+                "Authorization": f"Bearer {self._get_token()}",
+                "Accept": "application/vnd.github+json",
+                "Content-Type": "application/json",
+            },
+            method="POST",
+        )
+
+        try:
+            with urllib.request.urlopen(request) as response:
+                return json.load(response)["html_url"]
+        except urllib.error.HTTPError as e:
+            detail = e.read().decode("utf-8", "replace")
+            raise GitHubServiceError(f"GitHub API error {e.code}: {detail}") from e
+        except (urllib.error.URLError, ValueError, KeyError) as e:
+            raise GitHubServiceError(f"Failed to create pull request: {e}") from e
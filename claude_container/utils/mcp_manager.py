@@ -1,10 +1,11 @@
 """MCP (Model Context Protocol) registry management utilities."""
 
+import hashlib
 import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Collection, Dict, List, Optional, Tuple
 
-from ..core.constants import DATA_DIR_NAME, MCP_CONFIG_FILE
+from ..core.constants import DATA_DIR_NAME, MCP_CACHE_DIR, MCP_CONFIG_FILE
 from ..models.mcp import MCPRegistry, MCPServerConfig
 
 
@@ -16,9 +17,32 @@ class MCPManager:
         self.project_root = project_root
         self.config_dir = project_root / DATA_DIR_NAME
         self.config_file = self.config_dir / MCP_CONFIG_FILE
+        self.cache_dir = self.config_dir / MCP_CACHE_DIR
+        # Parsed registry and the (mtime_ns, size) of the file it was read from
+        self._registry_cache: Optional[Tuple[Tuple[int, int], MCPRegistry]] = None
 
     def load_registry(self) -> MCPRegistry:
-        """Load MCP registry from disk."""
+        """Load MCP registry from disk.
+
+        The parsed registry is reused until the file's mtime or size changes,
+        so repeated lookups in one process parse the JSON once. Callers must
+        not modify the returned registry.
+        """
+        try:
+            stat = self.config_file.stat()
+        except FileNotFoundError:
+            return MCPRegistry()
+
+        key = (stat.st_mtime_ns, stat.st_size)
+        if self._registry_cache and self._registry_cache[0] == key:
+            return self._registry_cache[1]
+
+        registry = self._read_registry()
+        self._registry_cache = (key, registry)
+        return registry
+
+    def _read_registry(self) -> MCPRegistry:
+        """Parse the registry file without using the in-process cache."""
         if not self.config_file.exists():
             return MCPRegistry()
 
@@ -33,6 +57,7 @@ class MCPManager:
         """Save MCP registry to disk."""
         # Ensure directory exists
         self.config_dir.mkdir(parents=True, exist_ok=True)
+        self._registry_cache = None
 
         # Save with pretty formatting
         with open(self.config_file, 'w') as f:
@@ -40,7 +65,7 @@ class MCPManager:
 
     def add_server(self, name: str, config: Dict[str, Any]) -> None:
         """Add or update an MCP server configuration."""
-        registry = self.load_registry()
+        registry = self._read_registry()
         
         # Validate and create server config
         server = MCPServerConfig.model_validate(config)
@@ -50,7 +75,7 @@ class MCPManager:
 
     def remove_server(self, name: str) -> bool:
         """Remove an MCP server configuration. Returns True if removed."""
-        registry = self.load_registry()
+        registry = self._read_registry()
         
         if name not in registry.mcpServers:
             return False
@@ -74,8 +99,50 @@ class MCPManager:
         registry = self.load_registry()
         return registry.filter_servers(names)
 
-    def validate_server_names(self, names: List[str]) -> List[str]:
-        """Validate server names exist and return missing ones."""
-        existing = set(self.list_servers())
-        requested = set(names)
-        return list(requested - existing)
\ No newline at end of file
+    def get_mcp_config_json(self, names: List[str]) -> str:
+        """Get the serialized .mcp.json config for the specified servers.
+
+        The result is cached on disk keyed by the registry file contents and
+        the sorted server names, so repeated continuations with the same
+        selection skip filtering and serialization.
+
+        Args:
+            names: Server names to include in the config
+
+        Returns:
+            The MCP config as a compact JSON string (it is only read by Claude)
+        """
+        registry_bytes = self.config_file.read_bytes() if self.config_file.exists() else b""
+        key = hashlib.sha256(
+            b"compact\0" + registry_bytes + b"\0" + ",".join(sorted(names)).encode()
+        ).hexdigest()
+        cache_file = self.cache_dir / f"{key}.json"
+
+        try:
+            return cache_file.read_text()
+        except OSError:
+            pass
+
+        config_str = json.dumps(self.filter_registry(names).to_mcp_json(), separators=(",", ":"))
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(config_str)
+        except OSError:
+            # Caching is best-effort
+            pass
+        return config_str
+
+    def validate_server_names(self, names: List[str],
+                              available: Optional[Collection[str]] = None) -> List[str]:
+        """Validate server names exist and return missing ones.
+
+        Args:
+            names: Server names to check
+            available: Server names already listed by the caller; the
+                registry is consulted if omitted
+
+        Returns:
+            Names that are not registered, in the order they were given
+        """
+        existing = set(self.list_servers() if available is None else available)
+        return [name for name in dict.fromkeys(names) if name not in existing]
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""Cache of Claude permission-check results keyed by container image."""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..core.constants import PERMISSION_CACHE_FILE, PERMISSION_CACHE_TTL
+
+
+class PermissionCache:
+    """Remembers which container images passed the Claude permission check."""
+    
+    def __init__(self, data_dir: Path, ttl: int = PERMISSION_CACHE_TTL):
+        """Initialize permission cache.
+        
+        Args:
+            data_dir: Project data directory holding the cache file
+            ttl: Seconds a cached result stays valid
+        """
+        self.cache_file = data_dir / PERMISSION_CACHE_FILE
+        self.ttl = ttl
+    
+    def _load(self) -> Dict[str, Any]:
+        """Load cache entries, treating a missing or corrupt file as empty."""
+        try:
+            data = json.loads(self.cache_file.read_text())
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+    
+    def _is_fresh(self, entry: Any) -> bool:
+        """Check whether a cache entry is well-formed and within the TTL."""
+        if not isinstance(entry, dict):
+            return False
+        try:
+            checked_at = datetime.fromisoformat(entry['checked_at'])
+        except (KeyError, TypeError, ValueError):
+            return False
+        return (datetime.now() - checked_at).total_seconds() <= self.ttl
+    
+    def get(self, image_digest: str) -> Optional[bool]:
+        """Get the cached permission-check result for an image.
+        
+        Args:
+            image_digest: Image ID or digest
+            
+        Returns:
+            Cached result, or None if there is no fresh entry
+        """
+        entry = self._load().get(image_digest)
+        if not self._is_fresh(entry):
+            return None
+        return bool(entry.get('accepted'))
+    
+    def set(self, image_digest: str, accepted: bool) -> None:
+        """Record the permission-check result for an image.
+        
+        Expired entries for other images are dropped so the file read on
+        every task start stays small as images are rebuilt.
+        
+        Args:
+            image_digest: Image ID or digest
+            accepted: Whether the permission check passed
+        """
+        data = {digest: entry for digest, entry in self._load().items() if self._is_fresh(entry)}
+        data[image_digest] = {
+            'accepted': accepted,
+            'checked_at': datetime.now().isoformat()
+        }
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            self.cache_file.write_text(json.dumps(data, indent=2))
+        except OSError:
+            # The cache is an optimization; a failed write only costs a re-check
+            pass
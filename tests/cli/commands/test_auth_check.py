@@ -6,6 +6,7 @@ from click.testing import CliRunner
 from pathlib import Path
 
 from claude_container.cli.commands.auth_check import auth_check, check_claude_auth
+from claude_container.core.constants import AUTH_CACHE_FILE
 
 
 class TestAuthCheckCommand:
@@ -108,13 +109,11 @@ class TestAuthCheckCommand:
     
     @patch('claude_container.cli.commands.auth_check.ContainerRunner')
     @patch('claude_container.cli.commands.auth_check.get_project_context')
-    def test_check_claude_auth_function_success(self, mock_get_context, mock_runner_class):
+    def test_check_claude_auth_function_success(self, mock_get_context, mock_runner_class, tmp_path):
         """Test check_claude_auth function returns True when authenticated."""
         # Mock get_project_context to return existing data dir
         mock_project_root = MagicMock()
-        mock_data_dir = MagicMock()
-        mock_data_dir.exists.return_value = True
-        mock_get_context.return_value = (mock_project_root, mock_data_dir)
+        mock_get_context.return_value = (mock_project_root, tmp_path)
         
         # Mock ContainerRunner
         mock_runner = MagicMock()
@@ -129,16 +128,27 @@ class TestAuthCheckCommand:
         
         assert result is True
         mock_container.remove.assert_called_once()
+        
+        # A second check within the TTL is answered from the marker
+        assert check_claude_auth(quiet=True) is True
+        mock_runner.docker_service.run_container.assert_called_once()
+        
+        # The result is also remembered in memory for the rest of the process
+        (tmp_path / AUTH_CACHE_FILE).unlink()
+        assert check_claude_auth(quiet=True) is True
+        mock_runner.docker_service.run_container.assert_called_once()
+        
+        # Bypassing the cache always runs the check
+        assert check_claude_auth(quiet=True, use_cache=False) is True
+        assert mock_runner.docker_service.run_container.call_count == 2
     
     @patch('claude_container.cli.commands.auth_check.ContainerRunner')
     @patch('claude_container.cli.commands.auth_check.get_project_context')
-    def test_check_claude_auth_function_failure(self, mock_get_context, mock_runner_class):
+    def test_check_claude_auth_function_failure(self, mock_get_context, mock_runner_class, tmp_path):
         """Test check_claude_auth function returns False when not authenticated."""
         # Mock get_project_context to return existing data dir
         mock_project_root = MagicMock()
-        mock_data_dir = MagicMock()
-        mock_data_dir.exists.return_value = True
-        mock_get_context.return_value = (mock_project_root, mock_data_dir)
+        mock_get_context.return_value = (mock_project_root, tmp_path)
         
         # Mock ContainerRunner
         mock_runner = MagicMock()
@@ -149,7 +159,11 @@ class TestAuthCheckCommand:
         mock_runner._get_container_config.return_value = {'test': 'config'}
         mock_runner_class.return_value = mock_runner
         
-        result = check_claude_auth(quiet=True)
+        (tmp_path / AUTH_CACHE_FILE).touch()
+        
+        result = check_claude_auth(quiet=True, use_cache=False)
         
         assert result is False
-        mock_container.remove.assert_called_once()
\ No newline at end of file
+        mock_container.remove.assert_called_once()
+        # A failed check clears the recorded success
+        assert not (tmp_path / AUTH_CACHE_FILE).exists()
\ No newline at end of file
@@ -1,12 +1,14 @@
 """Tests for task command."""
 
 import pytest
-from unittest.mock import MagicMock, patch, call
+from unittest.mock import ANY, MagicMock, patch, call
 from click.testing import CliRunner
 from pathlib import Path
 from datetime import datetime
 
 from claude_container.cli.commands.task import task
+from claude_container.core.constants import TASK_DESCRIPTION_PATH
+from claude_container.core.task_storage import TaskUpdateBatch
 from claude_container.models.task import TaskStatus, TaskMetadata, FeedbackEntry
 
 
@@ -53,7 +55,7 @@ class TestTaskCommand:
         assert result.exit_code == 1
         mock_auth.assert_called_once()
     
-    @patch('claude_container.cli.commands.task.create.get_storage_and_runner')
+    @patch('claude_container.cli.helpers.get_storage_and_runner')
     def test_create_no_container(self, mock_get_storage_runner, cli_runner):
         """Test task create when no container exists."""
         mock_get_storage_runner.side_effect = SystemExit(1)
@@ -63,11 +65,27 @@ class TestTaskCommand:
             
             assert result.exit_code == 1
     
-    @patch('claude_container.cli.commands.task.create.MCPManager')
-    @patch('claude_container.cli.commands.task.create.subprocess.run')
-    @patch('claude_container.cli.commands.task.create.get_storage_and_runner')
-    @patch('claude_container.cli.commands.task.create.ensure_authenticated')
-    def test_create_success(self, mock_auth, mock_get_storage_runner, mock_subprocess, mock_mcp_manager_class, cli_runner, mock_task):
+    @patch('claude_container.cli.helpers.get_storage_and_runner')
+    @patch('claude_container.cli.helpers.ensure_authenticated')
+    def test_create_blank_branch(self, mock_auth, mock_get_storage_runner, cli_runner):
+        """Test task create rejects a branch name made only of whitespace."""
+        mock_storage = MagicMock()
+        mock_get_storage_runner.return_value = (mock_storage, MagicMock())
+        
+        with cli_runner.isolated_filesystem():
+            Path("task.md").write_text("Do the thing")
+            result = cli_runner.invoke(task, ['create', '--branch', '   ', '--file', 'task.md'])
+            
+            assert result.exit_code == 1
+            assert "Branch name cannot be empty" in result.output
+            mock_storage.create_task.assert_not_called()
+    
+    @patch('claude_container.cli.helpers.MCPManager')
+    @patch('claude_container.cli.commands.task.create.subprocess.Popen')
+    @patch('claude_container.services.github_service.GitHubService')
+    @patch('claude_container.cli.helpers.get_storage_and_runner')
+    @patch('claude_container.cli.helpers.ensure_authenticated')
+    def test_create_success(self, mock_auth, mock_get_storage_runner, mock_github_class, mock_popen, mock_mcp_manager_class, cli_runner, mock_task):
         """Test successful task create."""
         mock_auth.return_value = True
         
@@ -79,6 +97,7 @@ class TestTaskCommand:
         # Mock get_storage_and_runner to return storage and runner
         mock_storage = MagicMock()
         mock_storage.create_task.return_value = mock_task
+        mock_storage.batch_update.side_effect = lambda task_id: TaskUpdateBatch(mock_storage, task_id)
         
         mock_runner = MagicMock()
         mock_runner.project_root = Path.cwd()
@@ -88,68 +107,56 @@ class TestTaskCommand:
         mock_get_storage_runner.return_value = (mock_storage, mock_runner)
         
         # Create a helper to properly mock exec_run results
-        def create_exec_result(exit_code, output, is_stream=False):
+        def create_exec_result(exit_code, output):
             result = MagicMock()
             result.exit_code = exit_code
-            if is_stream:
-                # For streaming commands, output should be an iterable that yields bytes
-                result.output = iter(output) if isinstance(output, list) else iter([output])
-            else:
-                result.output = output
+            result.output = output
             return result
         
         # Mock container
         mock_container = MagicMock()
         mock_container.id = "container-123"
         
+        # No image digest means no cached permission result, so the probe runs
+        mock_runner.docker_service.get_image_digest.return_value = None
+        
         # Mock exec_in_container_as_user instead of exec_run
         mock_runner.exec_in_container_as_user.side_effect = [
             # Permission check
             create_exec_result(0, b"test"),
-            # git config --global --add safe.directory /workspace
-            create_exec_result(0, b""),
-            # git branch --show-current (check current branch)
-            create_exec_result(0, b"feature-branch"),
-            # git checkout master
-            create_exec_result(0, b"Switched to branch 'master'"),
-            # git pull origin master
-            create_exec_result(0, b"Already up to date."),
-            # git checkout -b branch
-            create_exec_result(0, b"Switched to a new branch 'test-branch'"),
-            # claude command - first run (stream=True)
-            create_exec_result(0, [b"Task completed"], is_stream=True),
             # git status --porcelain
             create_exec_result(0, b"M src/index.js"),
-            # claude command - second run for commit (stream=True)
-            create_exec_result(0, [b"Committing changes"], is_stream=True),
-            # git log -1 --pretty=%B
-            create_exec_result(0, b"Add feature X\n\nImplemented feature X as requested"),
-            # git rev-parse HEAD
-            create_exec_result(0, b"abc123def456"),
-            # git push
-            create_exec_result(0, b"Branch pushed")
+        ]
+        mock_runner.run_batched.side_effect = [
+            # safe.directory, checkout master, pull and new branch
+            {
+                "safe_directory": (0, b""),
+                "checkout_master": (0, b"Switched to branch 'master'"),
+                "pull": (0, b"Already up to date."),
+                "branch": (0, b"Switched to a new branch 'test-branch'"),
+            },
+            # git commit, git log -1 (hash and message), git push
+            {
+                "commit": (0, b""),
+                "log": (0, b"abc123def456\x1fAdd feature X\n\nImplemented feature X as requested"),
+                "push": (0, b"Branch pushed"),
+                "remote": (0, b"git@github.com:example/repo.git\n"),
+            },
+        ]
+        # Claude runs stream their output through exec_streaming
+        mock_runner.exec_streaming.side_effect = [
+            # claude command
+            iter([b"Task completed"]),
         ]
         mock_runner.create_persistent_container.return_value = mock_container
+        mock_runner.claim_warm_container.return_value = None
         
-        # Mock subprocess.run calls
-        def subprocess_side_effect(*args, **kwargs):
-            # Check what command is being run
-            if args[0][0:2] == ["git", "fetch"]:
-                # git fetch
-                return MagicMock(returncode=0)
-            elif args[0][0:3] == ["git", "show-ref", "--verify"]:
-                # Branch doesn't exist (both local and remote)
-                return MagicMock(returncode=1)
-            elif args[0][0:2] == ["gh", "pr"]:
-                # gh pr create
-                return MagicMock(
-                    returncode=0,
-                    stdout="https://github.com/example/repo/pull/123"
-                )
-            else:
-                return MagicMock(returncode=0)
-        
-        mock_subprocess.side_effect = subprocess_side_effect
+        # The pull request is created through the GitHub API
+        mock_github = mock_github_class.return_value
+        mock_github.create_pull_request.return_value = "https://github.com/example/repo/pull/123"
+        # Branch doesn't exist (both local and remote)
+        mock_popen.return_value.wait.return_value = 2
+        mock_popen.return_value.communicate.return_value = ("", None)
         
         with cli_runner.isolated_filesystem():
             Path(".claude-container").mkdir()
@@ -176,14 +183,218 @@ class TestTaskCommand:
             mock_storage.create_task.assert_called_once_with("Implement test feature", "test-branch")
             assert mock_storage.update_task.call_count >= 3  # started, commit hash, completed
             
+            # Short commands go through one shell session for the container
+            mock_runner.open_shell.assert_called_once_with(mock_container)
+            mock_runner.close_shell.assert_called_once_with(mock_container)
+            
+            # Branch setup and the commit lookups/push each run as one batched exec
+            assert mock_runner.run_batched.call_count == 2
+            steps = dict(mock_runner.run_batched.call_args_list[0][0][1])
+            assert steps["branch"] == "git checkout -b test-branch"
+            steps = dict(mock_runner.run_batched.call_args_list[1][0][1])
+            assert steps["push"] == "git push -u origin test-branch"
+            mock_github.create_pull_request.assert_called_once_with(
+                "example", "repo", "Add feature X", ANY, head="test-branch", base="master"
+            )
+            mock_storage.update_task.assert_any_call(
+                mock_task.id, commit_hash="abc123def456", pr_url="https://github.com/example/repo/pull/123",
+                completed_at=ANY, container_id=None
+            )
+            
             # Verify cleanup
             mock_container.stop.assert_called_once()
             mock_container.remove.assert_called_once()
     
+    @patch('claude_container.cli.helpers.MCPManager')
+    @patch('claude_container.services.git_service.local_branch_exists', return_value=False)
     @patch('claude_container.cli.commands.task.create.subprocess.run')
-    @patch('claude_container.cli.commands.task.create.get_storage_and_runner')
-    @patch('claude_container.cli.commands.task.create.ensure_authenticated')
-    def test_create_branch_exists(self, mock_auth, mock_get_storage_runner, mock_subprocess, cli_runner):
+    @patch('claude_container.cli.commands.task.create.subprocess.Popen')
+    @patch('claude_container.services.github_service.GitHubService')
+    @patch('claude_container.cli.helpers.get_storage_and_runner')
+    @patch('claude_container.cli.helpers.ensure_authenticated')
+    def test_create_pr_falls_back_to_gh_cli(self, mock_auth, mock_get_storage_runner, mock_github_class, mock_popen, mock_run, mock_local_exists, mock_mcp_manager_class, cli_runner, mock_task):
+        """Test the GitHub CLI creates the PR when origin is not on github.com."""
+        mock_mcp_manager_class.return_value.list_servers.return_value = []
+        
+        mock_storage = MagicMock()
+        mock_storage.create_task.return_value = mock_task
+        mock_storage.batch_update.side_effect = lambda task_id: TaskUpdateBatch(mock_storage, task_id)
+        mock_runner = MagicMock()
+        mock_runner.project_root = Path.cwd()
+        mock_runner.docker_service.get_image_digest.return_value = None
+        mock_get_storage_runner.return_value = (mock_storage, mock_runner)
+        mock_runner.create_persistent_container.return_value = MagicMock(id="container-123")
+        mock_runner.claim_warm_container.return_value = None
+        
+        mock_runner.exec_in_container_as_user.side_effect = [
+            # Permission check
+            MagicMock(exit_code=0, output=b"test"),
+            # git status --porcelain
+            MagicMock(exit_code=0, output=b"M src/index.js"),
+        ]
+        mock_runner.run_batched.side_effect = [
+            {
+                "safe_directory": (0, b""),
+                "checkout_master": (0, b""),
+                "pull": (0, b""),
+                "branch": (0, b""),
+            },
+            {
+                "commit": (0, b""),
+                "log": (0, b"abc123def456\x1fAdd feature X"),
+                "push": (0, b"Branch pushed"),
+                "remote": (0, b"git@github.example.com:example/repo.git\n"),
+            },
+        ]
+        mock_runner.exec_streaming.side_effect = [iter([b"Task completed"])]
+        mock_popen.return_value.wait.return_value = 2
+        mock_run.return_value = MagicMock(stdout="https://github.example.com/example/repo/pull/7\n")
+        
+        with cli_runner.isolated_filesystem():
+            Path(".claude-container").mkdir()
+            result = cli_runner.invoke(
+                task,
+                ['create', '--branch', 'test-branch'],
+                input="Implement test feature\n"
+            )
+            
+            assert result.exit_code == 0
+            mock_github_class.return_value.create_pull_request.assert_not_called()
+            args = mock_run.call_args[0][0]
+            assert args[:3] == ["gh", "pr", "create"]
+            assert "--draft" in args
+            mock_storage.update_task.assert_any_call(
+                mock_task.id, commit_hash="abc123def456",
+                pr_url="https://github.example.com/example/repo/pull/7",
+                completed_at=ANY, container_id=None
+            )
+    
+    @patch('claude_container.cli.helpers.MCPManager')
+    @patch('claude_container.services.git_service.local_branch_exists', return_value=False)
+    @patch('claude_container.cli.commands.task.create.subprocess.run')
+    @patch('claude_container.cli.commands.task.create.subprocess.Popen')
+    @patch('claude_container.services.github_service.GitHubService')
+    @patch('claude_container.cli.helpers.get_storage_and_runner')
+    @patch('claude_container.cli.helpers.ensure_authenticated')
+    def test_create_commit_fails(self, mock_auth, mock_get_storage_runner, mock_github_class, mock_popen, mock_run, mock_local_exists, mock_mcp_manager_class, cli_runner, mock_task):
+        """Test a failed git commit fails the task without a push or PR."""
+        mock_mcp_manager_class.return_value.list_servers.return_value = []
+        
+        mock_storage = MagicMock()
+        mock_storage.create_task.return_value = mock_task
+        mock_storage.batch_update.side_effect = lambda task_id: TaskUpdateBatch(mock_storage, task_id)
+        mock_runner = MagicMock()
+        mock_runner.project_root = Path.cwd()
+        mock_runner.docker_service.get_image_digest.return_value = None
+        mock_get_storage_runner.return_value = (mock_storage, mock_runner)
+        mock_runner.create_persistent_container.return_value = MagicMock(id="container-123")
+        mock_runner.claim_warm_container.return_value = None
+        
+        mock_runner.exec_in_container_as_user.side_effect = [
+            # Permission check
+            MagicMock(exit_code=0, output=b"test"),
+            # git status --porcelain
+            MagicMock(exit_code=0, output=b"M src/index.js"),
+        ]
+        mock_runner.run_batched.side_effect = [
+            {
+                "safe_directory": (0, b""),
+                "checkout_master": (0, b""),
+                "pull": (0, b""),
+                "branch": (0, b""),
+            },
+            # The commit fails, so the rest of the batch is skipped
+            {"commit": (1, b"error: pre-commit hook failed")},
+        ]
+        mock_runner.exec_streaming.side_effect = [iter([b"Task completed"])]
+        mock_popen.return_value.wait.return_value = 2
+        
+        with cli_runner.isolated_filesystem():
+            Path(".claude-container").mkdir()
+            result = cli_runner.invoke(
+                task,
+                ['create', '--branch', 'test-branch'],
+                input="Implement test feature\n"
+            )
+            
+            assert result.exit_code == 1
+            assert "Failed to commit changes" in result.output
+            assert "pre-commit hook failed" in result.output
+            assert "Changes committed successfully" not in result.output
+            assert "Pushing branch" not in result.output
+            assert mock_runner.run_batched.call_args[1]["stop_on_failure"][0] == "commit"
+            mock_github_class.return_value.create_pull_request.assert_not_called()
+            assert not any(call[0][0][0] == "gh" for call in mock_run.call_args_list)
+            for update in mock_storage.update_task.call_args_list:
+                assert "commit_hash" not in update[1]
+                assert "pr_url" not in update[1]
+            mock_storage.update_task.assert_any_call(
+                mock_task.id, status=TaskStatus.FAILED, error_message="Failed to commit changes",
+                completed_at=ANY, container_id=None
+            )
+    
+    @patch('claude_container.cli.helpers.MCPManager')
+    @patch('claude_container.services.git_service.local_branch_exists', return_value=False)
+    @patch('claude_container.cli.commands.task.create.subprocess.run')
+    @patch('claude_container.cli.commands.task.create.subprocess.Popen')
+    @patch('claude_container.services.github_service.GitHubService')
+    @patch('claude_container.cli.helpers.get_storage_and_runner')
+    @patch('claude_container.cli.helpers.ensure_authenticated')
+    def test_create_marker_changes_but_index_clean(self, mock_auth, mock_get_storage_runner, mock_github_class, mock_popen, mock_run, mock_local_exists, mock_mcp_manager_class, cli_runner, mock_task):
+        """Test Claude reporting changes that leave nothing staged completes without a commit."""
+        mock_mcp_manager_class.return_value.list_servers.return_value = []
+        
+        mock_storage = MagicMock()
+        mock_storage.create_task.return_value = mock_task
+        mock_storage.batch_update.side_effect = lambda task_id: TaskUpdateBatch(mock_storage, task_id)
+        mock_runner = MagicMock()
+        mock_runner.project_root = Path.cwd()
+        mock_runner.docker_service.get_image_digest.return_value = None
+        mock_get_storage_runner.return_value = (mock_storage, mock_runner)
+        mock_runner.create_persistent_container.return_value = MagicMock(id="container-123")
+        mock_runner.claim_warm_container.return_value = None
+        
+        mock_runner.exec_in_container_as_user.side_effect = [
+            # Permission check
+            MagicMock(exit_code=0, output=b"test"),
+        ]
+        mock_runner.run_batched.side_effect = [
+            {
+                "safe_directory": (0, b""),
+                "checkout_master": (0, b""),
+                "pull": (0, b""),
+                "branch": (0, b""),
+            },
+            # The edits were reverted, so the commit step stops the batch cleanly
+            {"commit": (0, b"nothing to commit")},
+        ]
+        mock_runner.exec_streaming.side_effect = [iter([b'{"type": "result", "result": "Done\\n::HAS_CHANGES::"}\n'])]
+        mock_popen.return_value.wait.return_value = 2
+        
+        with cli_runner.isolated_filesystem():
+            Path(".claude-container").mkdir()
+            result = cli_runner.invoke(
+                task,
+                ['create', '--branch', 'test-branch'],
+                input="Implement test feature\n"
+            )
+            
+            assert result.exit_code == 0
+            assert "No changes to commit" in result.output
+            assert "Failed to commit changes" not in result.output
+            assert "Pushing branch" not in result.output
+            mock_github_class.return_value.create_pull_request.assert_not_called()
+            assert not any(call[0][0][0] == "gh" for call in mock_run.call_args_list)
+            for update in mock_storage.update_task.call_args_list:
+                assert update[1].get("status") != TaskStatus.FAILED
+                assert "commit_hash" not in update[1]
+    
+    @patch('claude_container.services.git_service.local_branch_exists', return_value=False)
+    @patch('claude_container.cli.commands.task.create.subprocess.Popen')
+    @patch('claude_container.cli.commands.task.create.subprocess.run')
+    @patch('claude_container.cli.helpers.get_storage_and_runner')
+    @patch('claude_container.cli.helpers.ensure_authenticated')
+    def test_create_branch_exists(self, mock_auth, mock_get_storage_runner, mock_subprocess, mock_popen, mock_local_exists, cli_runner):
         """Test task create when branch already exists."""
         mock_auth.return_value = True
         
@@ -195,18 +406,14 @@ class TestTaskCommand:
         mock_runner.docker_service.image_exists.return_value = True
         mock_get_storage_runner.return_value = (mock_storage, mock_runner)
         
-        # Mock subprocess.run calls - branch exists on remote
-        def subprocess_side_effect(*args, **kwargs):
-            if args[0][0:2] == ["git", "fetch"]:
-                return MagicMock(returncode=0)
-            elif "refs/remotes/origin" in str(args[0]):
-                # Remote branch exists
-                return MagicMock(returncode=0)
-            else:
-                # Local branch doesn't exist
-                return MagicMock(returncode=1)
+        # Branch exists on remote only
+        def popen_side_effect(*args, **kwargs):
+            process = MagicMock()
+            process.wait.return_value = 0 if args[0][1] == "ls-remote" else 1
+            process.communicate.return_value = ("", None)
+            return process
         
-        mock_subprocess.side_effect = subprocess_side_effect
+        mock_popen.side_effect = popen_side_effect
         
         with cli_runner.isolated_filesystem():
             Path(".claude-container").mkdir()
@@ -218,10 +425,16 @@ class TestTaskCommand:
             
             assert result.exit_code == 1
             assert "Branch 'existing-branch' already exists" in result.output
+            assert "Found on remote origin" in result.output
+            assert "Found as local branch" not in result.output
             assert "Use 'claude-container task continue'" in result.output
             
             # Verify task was not created
             mock_storage.create_task.assert_not_called()
+            
+            # The local ref is looked up without running git; only ls-remote is spawned
+            mock_local_exists.assert_called_once_with(mock_runner.project_root, 'existing-branch')
+            mock_popen.assert_called_once()
     
     # Tests for CONTINUE command
     @patch('claude_container.cli.commands.task.continue_task.check_claude_auth')
@@ -234,11 +447,11 @@ class TestTaskCommand:
         assert result.exit_code == 1
         mock_auth.assert_called_once()
     
-    @patch('claude_container.cli.commands.task.continue_task.MCPManager')
-    @patch('claude_container.cli.commands.task.continue_task.TaskStorageManager')
-    @patch('claude_container.cli.commands.task.continue_task.ContainerRunner')
+    @patch('claude_container.cli.helpers.MCPManager')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
+    @patch('claude_container.cli.helpers.get_container_runner')
     @patch('claude_container.cli.commands.task.continue_task.check_claude_auth')
-    def test_continue_success(self, mock_auth, mock_runner_class, mock_storage_class, mock_mcp_manager_class, cli_runner, mock_task):
+    def test_continue_success(self, mock_auth, mock_get_runner, mock_storage_class, mock_mcp_manager_class, cli_runner, mock_task):
         """Test successful task continue."""
         mock_auth.return_value = True
         
@@ -260,31 +473,37 @@ class TestTaskCommand:
         mock_container = MagicMock()
         mock_container.id = "container-456"
         
+        # No image digest means no cached permission result, so the probe runs
+        mock_runner.docker_service.get_image_digest.return_value = None
+        
         # Mock exec_in_container_as_user instead of exec_run
         mock_runner.exec_in_container_as_user.side_effect = [
             # Permission check
             MagicMock(exit_code=0, output=b"test"),
-            # git fetch --all
-            MagicMock(exit_code=0, output=b"Fetching origin"),
-            # git checkout branch
-            MagicMock(exit_code=0, output=b"Switched to branch 'test-branch'"),
-            # git pull origin test-branch
-            MagicMock(exit_code=0, output=b"Already up to date"),
-            # claude command
-            MagicMock(exit_code=0, output=iter([b"Continuing task"])),
             # git status --porcelain
             MagicMock(exit_code=0, output=b"M src/index.js"),
-            # claude commit
-            MagicMock(exit_code=0, output=iter([b"Committing changes"])),
-            # git log -1 --pretty=%B
-            MagicMock(exit_code=0, output=b"Update components based on feedback"),
-            # git rev-parse HEAD
-            MagicMock(exit_code=0, output=b"def456"),
-            # git push
-            MagicMock(exit_code=0, output=b"Branch pushed")
+        ]
+        mock_runner.run_batched.side_effect = [
+            # git fetch origin test-branch, git checkout branch, git pull origin test-branch
+            {
+                "fetch": (0, b"Fetching origin"),
+                "checkout": (0, b"Switched to branch 'test-branch'"),
+                "pull": (0, b"Already up to date"),
+            },
+            # git commit, git log -1 (hash and message), git push
+            {
+                "commit": (0, b""),
+                "log": (0, b"def456\x1fUpdate components based on feedback"),
+                "push": (0, b"Branch pushed"),
+            },
+        ]
+        mock_runner.exec_streaming.side_effect = [
+            # claude command
+            iter([b"Continuing task"]),
         ]
         mock_runner.create_persistent_container.return_value = mock_container
-        mock_runner_class.return_value = mock_runner
+        mock_runner.find_task_container.return_value = None  # No container kept from a previous run
+        mock_get_runner.return_value = mock_runner
         
         with cli_runner.isolated_filesystem():
             Path(".claude-container").mkdir()
@@ -303,13 +522,128 @@ class TestTaskCommand:
             )
             
             # Verify logs were saved
-            assert mock_storage.save_task_log.call_count == 2  # claude_output and claude_commit
+            assert mock_storage.open_task_log.call_count == 1  # claude_output
+            mock_storage.save_task_log.assert_called_once()  # claude_commit
+            
+            # Only the task branch is fetched
+            fetch_step = dict(mock_runner.run_batched.call_args_list[0][0][1])["fetch"]
+            assert fetch_step == "git fetch origin test-branch"
+            
+            # The container created for this run is removed afterwards
+            mock_container.remove.assert_called_once()
+            
+            # The description is written to the new container, not sent in the prompt
+            mock_runner.stream_files.assert_any_call(
+                mock_container, {TASK_DESCRIPTION_PATH: mock_task.description}
+            )
+            prompt = mock_runner.exec_streaming.call_args_list[0][1]['stdin_data'].decode()
+            assert TASK_DESCRIPTION_PATH in prompt
+            assert mock_task.description not in prompt
+    
+    @patch('claude_container.cli.helpers.MCPManager')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
+    @patch('claude_container.cli.helpers.get_container_runner')
+    @patch('claude_container.cli.commands.task.continue_task.check_claude_auth')
+    def test_continue_reuses_running_container(self, mock_auth, mock_get_runner, mock_storage_class, mock_mcp_manager_class, cli_runner, mock_task):
+        """Test task continue reusing a container kept running for the task."""
+        mock_auth.return_value = True
+        mock_mcp_manager_class.return_value.list_servers.return_value = []
+        
+        mock_storage = MagicMock()
+        mock_storage.get_task.return_value = mock_task
+        mock_storage_class.return_value = mock_storage
+        
+        mock_container = MagicMock()
+        mock_container.id = "container-456"
+        mock_container.name = "claude-container-task-project-abc12345"
+        
+        mock_runner = MagicMock()
+        mock_runner.find_task_container.return_value = mock_container
+        # No permission probe: the kept container already passed it
+        mock_runner.exec_in_container_as_user.side_effect = [
+            # git status --porcelain
+            MagicMock(exit_code=0, output=b""),
+        ]
+        mock_runner.run_batched.side_effect = [
+            {
+                "fetch": (0, b"Fetching origin"),
+                "checkout": (0, b"Switched to branch 'test-branch'"),
+                "pull": (0, b"Already up to date"),
+            },
+        ]
+        mock_runner.exec_streaming.side_effect = [iter([b"Continuing task"])]
+        mock_get_runner.return_value = mock_runner
+        
+        with cli_runner.isolated_filesystem():
+            Path(".claude-container").mkdir()
+            result = cli_runner.invoke(
+                task,
+                ['continue', 'test-task-id-123', '--feedback', 'Fix the bug']
+            )
+            
+            assert result.exit_code == 0
+            assert "Reusing running container" in result.output
+            mock_runner.find_task_container.assert_called_once_with('test-task-id-123')
+            mock_runner.create_persistent_container.assert_not_called()
+            mock_container.stop.assert_not_called()
+            mock_container.remove.assert_not_called()
+            # The kept container already holds the task description
+            mock_runner.stream_files.assert_not_called()
+    
+    @patch('claude_container.cli.helpers.MCPManager')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
+    @patch('claude_container.cli.helpers.get_container_runner')
+    @patch('claude_container.cli.commands.task.continue_task.check_claude_auth')
+    def test_continue_reuses_previous_mcp_selection(self, mock_auth, mock_get_runner, mock_storage_class, mock_mcp_manager_class, cli_runner, mock_task):
+        """Test task continue reusing the previous MCP selection without reading the registry."""
+        mock_auth.return_value = True
+        mock_task.mcp_servers = ["github"]
+        mock_mcp_manager = mock_mcp_manager_class.return_value
+        mock_mcp_manager.get_mcp_config_json.return_value = '{"mcpServers": {}}'
+        
+        mock_storage = MagicMock()
+        mock_storage.get_task.return_value = mock_task
+        mock_storage_class.return_value = mock_storage
+        
+        mock_container = MagicMock()
+        mock_container.id = "container-456"
+        
+        mock_runner = MagicMock()
+        mock_runner.find_task_container.return_value = mock_container
+        mock_runner.exec_in_container_as_user.side_effect = [
+            # git status --porcelain
+            MagicMock(exit_code=0, output=b""),
+        ]
+        mock_runner.run_batched.side_effect = [
+            {
+                "fetch": (0, b"Fetching origin"),
+                "checkout": (0, b"Switched to branch 'test-branch'"),
+                "pull": (0, b"Already up to date"),
+            },
+        ]
+        mock_runner.exec_streaming.side_effect = [iter([b"Continuing task"])]
+        mock_get_runner.return_value = mock_runner
+        
+        with cli_runner.isolated_filesystem():
+            Path(".claude-container").mkdir()
+            result = cli_runner.invoke(
+                task,
+                ['continue', 'test-task-id-123', '--feedback', 'Fix the bug']
+            )
+            
+            assert result.exit_code == 0
+            assert "Using MCP servers from previous run: github" in result.output
+            mock_mcp_manager.list_servers.assert_not_called()
+            mock_mcp_manager.get_mcp_config_json.assert_called_once_with(["github"])
+            mock_runner.stream_files.assert_called_once_with(
+                mock_container, {"/tmp/.mcp.json": '{"mcpServers": {}}'}
+            )
     
-    @patch('claude_container.cli.commands.task.continue_task.MCPManager')
-    @patch('claude_container.cli.commands.task.continue_task.TaskStorageManager')
-    @patch('claude_container.cli.commands.task.continue_task.ContainerRunner')
+    @patch('claude_container.cli.helpers.MCPManager')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
+    @patch('claude_container.cli.helpers.get_container_runner')
     @patch('claude_container.cli.commands.task.continue_task.check_claude_auth')
-    def test_continue_no_commit(self, mock_auth, mock_runner_class, mock_storage_class, mock_mcp_manager_class, cli_runner, mock_task):
+    def test_continue_no_commit(self, mock_auth, mock_get_runner, mock_storage_class, mock_mcp_manager_class, cli_runner, mock_task):
         """Test task continue when Claude doesn't make a commit."""
         mock_auth.return_value = True
         
@@ -331,27 +665,33 @@ class TestTaskCommand:
         mock_container = MagicMock()
         mock_container.id = "container-456"
         
+        # No image digest means no cached permission result, so the probe runs
+        mock_runner.docker_service.get_image_digest.return_value = None
+        
         # Mock exec_in_container_as_user instead of exec_run
         mock_runner.exec_in_container_as_user.side_effect = [
             # Permission check
             MagicMock(exit_code=0, output=b"test"),
-            # git fetch --all
-            MagicMock(exit_code=0, output=b"Fetching origin"),
-            # git checkout branch
-            MagicMock(exit_code=0, output=b"Switched to branch 'test-branch'"),
-            # git pull origin test-branch
-            MagicMock(exit_code=0, output=b"Already up to date"),
-            # claude command
-            MagicMock(exit_code=0, output=iter([b"Continuing task"])),
             # git status --porcelain
             MagicMock(exit_code=0, output=b"M src/index.js"),
-            # claude commit
-            MagicMock(exit_code=0, output=iter([b"Claude responded but didn't commit"])),
-            # git log -1 --pretty=%B (fails because no new commit)
-            MagicMock(exit_code=1, output=b"")
+        ]
+        mock_runner.run_batched.side_effect = [
+            # git fetch origin test-branch, git checkout branch, git pull origin test-branch
+            {
+                "fetch": (0, b"Fetching origin"),
+                "checkout": (0, b"Switched to branch 'test-branch'"),
+                "pull": (0, b"Already up to date"),
+            },
+            # git commit finds nothing, so nothing else runs
+            {"commit": (1, b"nothing to commit")},
+        ]
+        mock_runner.exec_streaming.side_effect = [
+            # claude command
+            iter([b"Continuing task"]),
         ]
         mock_runner.create_persistent_container.return_value = mock_container
-        mock_runner_class.return_value = mock_runner
+        mock_runner.find_task_container.return_value = None  # No container kept from a previous run
+        mock_get_runner.return_value = mock_runner
         
         with cli_runner.isolated_filesystem():
             Path(".claude-container").mkdir()
@@ -363,14 +703,17 @@ class TestTaskCommand:
             assert result.exit_code == 0
             assert "Continuing task" in result.output
             assert "No commit was made" in result.output
-            assert "Claude may not have executed the commit command" in result.output
+            assert "git commit did not complete" in result.output
             assert "Changes pushed successfully" not in result.output
+            for update in mock_storage.update_task.call_args_list:
+                assert "commit_hash" not in update[1]
             
             # Verify logs were saved (commit output should still be saved even if no commit made)
-            assert mock_storage.save_task_log.call_count == 2  # claude_output and claude_commit
+            assert mock_storage.open_task_log.call_count == 1  # claude_output
+            mock_storage.save_task_log.assert_called_once()  # claude_commit
     
     # Tests for LIST command
-    @patch('claude_container.cli.commands.task.list_tasks.TaskStorageManager')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
     @patch('claude_container.core.docker_client.DockerClient')
     def test_list_with_tasks(self, mock_docker_client_class, mock_storage_class, cli_runner, mock_task):
         """Test list command with stored tasks."""
@@ -393,7 +736,29 @@ class TestTaskCommand:
             assert mock_task.id[:8] in result.output
             assert mock_task.branch_name in result.output
     
-    @patch('claude_container.cli.commands.task.list_tasks.TaskStorageManager')
+    @patch('claude_container.cli.commands.task.list_tasks.get_docker_service')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
+    def test_list_shows_task_containers(self, mock_storage_class, mock_get_docker_service, cli_runner):
+        """Test task containers are filtered by the daemon and listed from sparse results."""
+        mock_storage_class.return_value.list_tasks.return_value = []
+        mock_container = MagicMock(status='running')
+        mock_container.name = None
+        mock_container.attrs = {'Names': ['/claude-container-task-proj-abc'], 'Created': 1700000000}
+        mock_docker_service = mock_get_docker_service.return_value
+        mock_docker_service.list_containers.return_value = [mock_container]
+        
+        with cli_runner.isolated_filesystem():
+            Path(".claude-container").mkdir()
+            result = cli_runner.invoke(task, ['list'])
+            
+            assert result.exit_code == 0
+            assert "claude-container-task-proj-abc" in result.output
+            assert "2023-11-14T22:13:20" in result.output
+            kwargs = mock_docker_service.list_containers.call_args[1]
+            assert kwargs['labels']["claude-container-type"] == "task"
+            assert kwargs['sparse'] is True
+    
+    @patch('claude_container.cli.helpers.TaskStorageManager')
     def test_list_filter_by_status(self, mock_storage_class, cli_runner):
         """Test list command with status filter."""
         # Mock storage
@@ -409,7 +774,7 @@ class TestTaskCommand:
             mock_storage.list_tasks.assert_called_once_with(TaskStatus.FAILED)
     
     # Tests for SHOW command
-    @patch('claude_container.cli.commands.task.show.TaskStorageManager')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
     def test_show_task(self, mock_storage_class, cli_runner, mock_task):
         """Test show command."""
         # Add some data to the mock task
@@ -439,13 +804,13 @@ class TestTaskCommand:
             assert mock_task.pr_url in result.output
             assert "Feedback History" in result.output
     
-    @patch('claude_container.cli.commands.task.show.TaskStorageManager')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
     def test_show_task_not_found(self, mock_storage_class, cli_runner):
         """Test show command when task not found."""
         # Mock storage
         mock_storage = MagicMock()
         mock_storage.get_task.return_value = None
-        mock_storage.list_tasks.return_value = []
+        mock_storage.lookup_by_prefix.return_value = []
         mock_storage_class.return_value = mock_storage
         
         with cli_runner.isolated_filesystem():
@@ -456,13 +821,13 @@ class TestTaskCommand:
             assert "No task found" in result.output
     
     # Tests for DELETE command
-    @patch('claude_container.cli.commands.task.delete.TaskStorageManager')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
     def test_delete_task(self, mock_storage_class, cli_runner, mock_task):
         """Test delete command."""
         # Mock storage - simulate short ID lookup
         mock_storage = MagicMock()
         mock_storage.get_task.side_effect = lambda id: mock_task if id == 'test-task-id-123' else None
-        mock_storage.list_tasks.return_value = [mock_task]
+        mock_storage.lookup_by_prefix.return_value = ['test-task-id-123']
         mock_storage_class.return_value = mock_storage
         
         with cli_runner.isolated_filesystem():
@@ -474,7 +839,7 @@ class TestTaskCommand:
             # Should delete with full ID after resolving
             mock_storage.delete_task.assert_called_once_with('test-task-id-123')
     
-    @patch('claude_container.cli.commands.task.delete.TaskStorageManager')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
     def test_delete_task_cancelled(self, mock_storage_class, cli_runner, mock_task):
         """Test delete command when cancelled."""
         # Mock storage
@@ -490,13 +855,13 @@ class TestTaskCommand:
             mock_storage.delete_task.assert_not_called()
     
     # Test edge cases
-    @patch('claude_container.cli.commands.task.show.TaskStorageManager')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
     def test_short_id_support(self, mock_storage_class, cli_runner, mock_task):
         """Test that short IDs work for various commands."""
         # Mock storage
         mock_storage = MagicMock()
-        mock_storage.get_task.return_value = None  # Not found by full ID
-        mock_storage.list_tasks.return_value = [mock_task]  # Found by searching
+        mock_storage.get_task.side_effect = lambda id: mock_task if id == mock_task.id else None
+        mock_storage.lookup_by_prefix.return_value = [mock_task.id]  # Found by prefix
         mock_storage_class.return_value = mock_storage
         
         with cli_runner.isolated_filesystem():
@@ -507,10 +872,10 @@ class TestTaskCommand:
             assert result.exit_code == 0
             assert mock_task.id in result.output
     
-    @patch('claude_container.cli.commands.task.continue_task.TaskStorageManager')
-    @patch('claude_container.cli.commands.task.continue_task.ContainerRunner')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
+    @patch('claude_container.cli.helpers.get_container_runner')
     @patch('claude_container.cli.commands.task.continue_task.check_claude_auth')
-    def test_continue_by_pr_url(self, mock_auth, mock_runner_class, mock_storage_class, cli_runner, mock_task):
+    def test_continue_by_pr_url(self, mock_auth, mock_get_runner, mock_storage_class, cli_runner, mock_task):
         """Test continuing a task by PR URL."""
         mock_auth.return_value = True
         
@@ -528,7 +893,7 @@ class TestTaskCommand:
         mock_container.id = "container-789"
         mock_container.exec_run.return_value = MagicMock(exit_code=0, output=b"")
         mock_runner.create_persistent_container.return_value = mock_container
-        mock_runner_class.return_value = mock_runner
+        mock_get_runner.return_value = mock_runner
         
         with cli_runner.isolated_filesystem():
             Path(".claude-container").mkdir()
@@ -541,16 +906,18 @@ class TestTaskCommand:
             mock_storage.lookup_task_by_pr.assert_called_once_with('https://github.com/test/repo/pull/123')
     
     # Test error handling
+    @patch('claude_container.cli.commands.task.create.subprocess.Popen')
     @patch('claude_container.cli.commands.task.create.subprocess.run')
-    @patch('claude_container.cli.commands.task.create.get_storage_and_runner')
-    @patch('claude_container.cli.commands.task.create.ensure_authenticated')
-    def test_create_with_error_after_task_created(self, mock_auth, mock_get_storage_runner, mock_subprocess, cli_runner, mock_task):
+    @patch('claude_container.cli.helpers.get_storage_and_runner')
+    @patch('claude_container.cli.helpers.ensure_authenticated')
+    def test_create_with_error_after_task_created(self, mock_auth, mock_get_storage_runner, mock_subprocess, mock_popen, cli_runner, mock_task):
         """Test task create when an error occurs after task is created."""
         mock_auth.return_value = True
         
         # Mock storage manager and runner
         mock_storage = MagicMock()
         mock_storage.create_task.return_value = mock_task
+        mock_storage.batch_update.side_effect = lambda task_id: TaskUpdateBatch(mock_storage, task_id)
         
         mock_runner = MagicMock()
         mock_runner.project_root = Path.cwd()
@@ -565,6 +932,11 @@ class TestTaskCommand:
         # Mock exec_in_container_as_user to fail
         mock_runner.exec_in_container_as_user.side_effect = Exception("Container execution failed")
         mock_runner.create_persistent_container.return_value = mock_container
+        mock_runner.claim_warm_container.return_value = None
+        
+        # Branch doesn't exist (both local and remote)
+        mock_popen.return_value.wait.return_value = 2
+        mock_popen.return_value.communicate.return_value = ("", None)
         
         with cli_runner.isolated_filesystem():
             Path(".claude-container").mkdir()
@@ -588,7 +960,7 @@ class TestTaskCommand:
             assert 'error_message' in failed_call[1]
     
     # Tests for LOGS command
-    @patch('claude_container.cli.commands.task.logs.TaskStorageManager')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
     def test_logs_command(self, mock_storage_class, cli_runner, mock_task, tmp_path):
         """Test task logs command."""
         # Create task directory structure with logs
@@ -620,7 +992,84 @@ class TestTaskCommand:
             assert "Execution Logs for Task" in result.output
             assert log_content in result.output
     
-    @patch('claude_container.cli.commands.task.logs.TaskStorageManager')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
+    def test_logs_command_all(self, mock_storage_class, cli_runner, mock_task):
+        """Test task logs -t all prints every log after its own header."""
+        mock_storage = MagicMock()
+        mock_storage.get_task.return_value = mock_task
+        mock_storage_class.return_value = mock_storage
+        
+        with cli_runner.isolated_filesystem():
+            logs_dir = Path(".claude-container") / "tasks" / "tasks" / mock_task.id / "logs"
+            logs_dir.mkdir(parents=True)
+            (logs_dir / "claude_commit.log").write_bytes(b"commit output\n")
+            (logs_dir / "claude_output.log").write_bytes(b"claude output \xff\n")
+            
+            result = cli_runner.invoke(task, ['logs', mock_task.id, '-t', 'all'])
+            
+            assert result.exit_code == 0
+            output = result.stdout_bytes
+            assert output.index(b"claude_commit.log ====") < output.index(b"commit output")
+            assert output.index(b"commit output") < output.index(b"claude_output.log ====")
+            assert output.index(b"claude_output.log ====") < output.index(b"claude output \xff")
+    
+    @patch('claude_container.cli.helpers.TaskStorageManager')
+    def test_logs_command_continuation(self, mock_storage_class, cli_runner, mock_task):
+        """Test task logs -c picks the logs of one continuation."""
+        mock_storage = MagicMock()
+        mock_storage.get_task.return_value = mock_task
+        mock_storage_class.return_value = mock_storage
+        
+        with cli_runner.isolated_filesystem():
+            logs_dir = Path(".claude-container") / "tasks" / "tasks" / mock_task.id / "logs"
+            logs_dir.mkdir(parents=True)
+            (logs_dir / "claude_output.log").write_text("initial run")
+            (logs_dir / "claude_output_cont_1.log").write_text("first continuation")
+            (logs_dir / "claude_output_cont_2.log").write_text("second continuation")
+            
+            result = cli_runner.invoke(task, ['logs', mock_task.id, '-c', '1'])
+            assert result.exit_code == 0
+            assert "first continuation" in result.output
+            assert "Log file: claude_output_cont_1.log" in result.output
+            
+            result = cli_runner.invoke(task, ['logs', mock_task.id, '-c', '0'])
+            assert "initial run" in result.output
+            assert "continuation" not in result.output
+            
+            result = cli_runner.invoke(task, ['logs', mock_task.id, '-c', '3'])
+            assert "No logs found for continuation 3" in result.output
+    
+    @patch('claude_container.cli.commands.task.logs.time.sleep')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
+    def test_logs_command_follow(self, mock_storage_class, mock_sleep, cli_runner, mock_task):
+        """Test task logs --follow prints the tail and then appended output."""
+        mock_storage = MagicMock()
+        mock_storage.get_task.return_value = mock_task
+        mock_storage_class.return_value = mock_storage
+        
+        with cli_runner.isolated_filesystem():
+            logs_dir = Path(".claude-container") / "tasks" / "tasks" / mock_task.id / "logs"
+            logs_dir.mkdir(parents=True)
+            log_file = logs_dir / "claude_output.log"
+            log_file.write_text("".join(f"line {i}\n" for i in range(15)))
+            
+            # Append once while following, then stop as Ctrl+C would
+            def grow_then_interrupt(_):
+                if mock_sleep.call_count > 1:
+                    raise KeyboardInterrupt
+                with open(log_file, 'a') as f:
+                    f.write("appended\n")
+            mock_sleep.side_effect = grow_then_interrupt
+            
+            result = cli_runner.invoke(task, ['logs', mock_task.id, '--follow'])
+            
+            assert result.exit_code == 0
+            assert "line 4\n" not in result.output
+            assert "line 5\nline 6" in result.output
+            assert "line 14\nappended\n" in result.output
+            assert "Stopped following logs." in result.output
+    
+    @patch('claude_container.cli.helpers.TaskStorageManager')
     def test_logs_command_with_feedback(self, mock_storage_class, cli_runner, mock_task):
         """Test task logs command with --feedback flag."""
         # Add feedback history to mock task
@@ -654,7 +1103,7 @@ class TestTaskCommand:
             assert "Add type hints" in result.output
             assert "Claude's Response: Added type hints to all functions" in result.output
     
-    @patch('claude_container.cli.commands.task.logs.TaskStorageManager')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
     def test_logs_command_no_logs(self, mock_storage_class, cli_runner, mock_task):
         """Test task logs command when no logs exist."""
         # Mock storage manager
@@ -671,7 +1120,7 @@ class TestTaskCommand:
             assert f"No logs found for task {mock_task.id[:8]}" in result.output
     
     # Tests for SEARCH command
-    @patch('claude_container.cli.commands.task.search.TaskStorageManager')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
     def test_search_command_with_results(self, mock_storage_class, cli_runner, mock_task):
         """Test task search command with matching results."""
         # Mock storage manager
@@ -692,7 +1141,7 @@ class TestTaskCommand:
             # Verify search was called with correct query
             mock_storage.search_tasks.assert_called_once_with('test')
     
-    @patch('claude_container.cli.commands.task.search.TaskStorageManager')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
     def test_search_command_no_results(self, mock_storage_class, cli_runner):
         """Test task search command with no matching results."""
         # Mock storage manager
@@ -708,7 +1157,7 @@ class TestTaskCommand:
             assert result.exit_code == 0
             assert "No tasks found matching 'nonexistent'" in result.output
     
-    @patch('claude_container.cli.commands.task.search.TaskStorageManager')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
     def test_search_command_multiple_results(self, mock_storage_class, cli_runner):
         """Test task search command with multiple matching results."""
         # Create multiple mock tasks
@@ -744,7 +1193,7 @@ class TestTaskCommand:
             assert "Found 2 matching task(s)" in result.output
     
     # Tests for HISTORY command
-    @patch('claude_container.cli.commands.task.history.TaskStorageManager')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
     def test_history_command_default(self, mock_storage_class, cli_runner, mock_task):
         """Test task history command with default options."""
         # Mock storage manager
@@ -765,7 +1214,7 @@ class TestTaskCommand:
             # Verify history was called with default limit
             mock_storage.get_task_history.assert_called_once_with(limit=10, branch=None)
     
-    @patch('claude_container.cli.commands.task.history.TaskStorageManager')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
     def test_history_command_with_limit(self, mock_storage_class, cli_runner):
         """Test task history command with custom limit."""
         # Mock storage manager
@@ -783,7 +1232,7 @@ class TestTaskCommand:
             # Verify history was called with custom limit
             mock_storage.get_task_history.assert_called_once_with(limit=5, branch=None)
     
-    @patch('claude_container.cli.commands.task.history.TaskStorageManager')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
     def test_history_command_with_branch(self, mock_storage_class, cli_runner, mock_task):
         """Test task history command filtered by branch."""
         # Mock storage manager
@@ -802,7 +1251,7 @@ class TestTaskCommand:
             # Verify history was called with branch filter
             mock_storage.get_task_history.assert_called_once_with(limit=10, branch='feature-x')
     
-    @patch('claude_container.cli.commands.task.history.TaskStorageManager')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
     def test_history_command_no_results(self, mock_storage_class, cli_runner):
         """Test task history command with no results."""
         # Mock storage manager
@@ -818,7 +1267,7 @@ class TestTaskCommand:
             assert result.exit_code == 0
             assert "No task history found" in result.output
     
-    @patch('claude_container.cli.commands.task.history.TaskStorageManager')
+    @patch('claude_container.cli.helpers.TaskStorageManager')
     def test_history_command_with_status_breakdown(self, mock_storage_class, cli_runner):
         """Test task history command shows status breakdown when multiple statuses."""
         # Create tasks with different statuses
@@ -850,8 +1299,8 @@ class TestTaskCommand:
             assert "Failed: 1" in result.output
     
     # Tests for CLEANUP command
-    @patch('claude_container.cli.commands.task.cleanup.DockerService')
-    def test_cleanup_command_with_containers(self, mock_docker_service_class, cli_runner):
+    @patch('claude_container.cli.commands.task.cleanup.get_docker_service')
+    def test_cleanup_command_with_containers(self, mock_get_docker_service, cli_runner):
         """Test cleanup command with containers to remove."""
         # Mock containers
         mock_container1 = MagicMock()
@@ -867,7 +1316,7 @@ class TestTaskCommand:
         # Mock Docker service
         mock_docker_service = MagicMock()
         mock_docker_service.list_containers.return_value = [mock_container1, mock_container2]
-        mock_docker_service_class.return_value = mock_docker_service
+        mock_get_docker_service.return_value = mock_docker_service
         
         # Run with force flag to skip confirmation
         result = cli_runner.invoke(task, ['cleanup', '--force'])
@@ -883,21 +1332,21 @@ class TestTaskCommand:
         mock_container2.stop.assert_called_once()  # Only running container
         assert mock_docker_service.remove_container.call_count == 2
     
-    @patch('claude_container.cli.commands.task.cleanup.DockerService')
-    def test_cleanup_command_no_containers(self, mock_docker_service_class, cli_runner):
+    @patch('claude_container.cli.commands.task.cleanup.get_docker_service')
+    def test_cleanup_command_no_containers(self, mock_get_docker_service, cli_runner):
         """Test cleanup command when no containers exist."""
         # Mock Docker service with no containers
         mock_docker_service = MagicMock()
         mock_docker_service.list_containers.return_value = []
-        mock_docker_service_class.return_value = mock_docker_service
+        mock_get_docker_service.return_value = mock_docker_service
         
         result = cli_runner.invoke(task, ['cleanup'])
         
         assert result.exit_code == 0
         assert "No task containers found" in result.output
     
-    @patch('claude_container.cli.commands.task.cleanup.DockerService')
-    def test_cleanup_command_cancelled(self, mock_docker_service_class, cli_runner):
+    @patch('claude_container.cli.commands.task.cleanup.get_docker_service')
+    def test_cleanup_command_cancelled(self, mock_get_docker_service, cli_runner):
         """Test cleanup command when user cancels."""
         # Mock container
         mock_container = MagicMock()
@@ -908,7 +1357,7 @@ class TestTaskCommand:
         # Mock Docker service
         mock_docker_service = MagicMock()
         mock_docker_service.list_containers.return_value = [mock_container]
-        mock_docker_service_class.return_value = mock_docker_service
+        mock_get_docker_service.return_value = mock_docker_service
         
         # User cancels
         result = cli_runner.invoke(task, ['cleanup'], input='n\n')
@@ -920,8 +1369,8 @@ class TestTaskCommand:
         # Verify container was not removed
         mock_docker_service.remove_container.assert_not_called()
     
-    @patch('claude_container.cli.commands.task.cleanup.DockerService')
-    def test_cleanup_command_with_failures(self, mock_docker_service_class, cli_runner):
+    @patch('claude_container.cli.commands.task.cleanup.get_docker_service')
+    def test_cleanup_command_with_failures(self, mock_get_docker_service, cli_runner):
         """Test cleanup command when some containers fail to remove."""
         # Mock containers
         mock_container1 = MagicMock()
@@ -939,7 +1388,7 @@ class TestTaskCommand:
         mock_docker_service.list_containers.return_value = [mock_container1, mock_container2]
         # First remove succeeds, second fails
         mock_docker_service.remove_container.side_effect = [None, Exception("Permission denied")]
-        mock_docker_service_class.return_value = mock_docker_service
+        mock_get_docker_service.return_value = mock_docker_service
         
         # Run with force flag
         result = cli_runner.invoke(task, ['cleanup', '--force'])
@@ -0,0 +1,115 @@
+"""Unit tests for the Claude stream-json output parser."""
+
+from unittest.mock import patch
+
+from claude_container.cli.helpers.claude_output_parser import (
+    find_change_marker,
+    parse_claude_stream_json,
+)
+
+
+class TestParseClaudeStreamJson:
+    """Test parse_claude_stream_json function."""
+    
+    @patch('claude_container.cli.helpers.claude_output_parser.click.echo')
+    def test_each_message_is_echoed_once(self, mock_echo):
+        """Test that every displayed message is written with a single echo."""
+        chunks = [
+            b'{"type": "assistant", "message": {"content": [{"type": "text", "text": "Hi"}, '
+            b'{"type": "tool_use", "name": "Bash"}]}}\n',
+            b'{"type": "user"}\n',
+            b'{"type": "result", "subtype": "success", "num_turns": 2, "duration_ms": 1500, '
+            b'"cost_usd": 0.5, "result": "Done"}\n',
+        ]
+        
+        parse_claude_stream_json(iter(chunks))
+        
+        assert mock_echo.call_count == 2
+        assert mock_echo.call_args_list[0][0][0] == "\n\nHi\n\n[Using Bash...]\n\n\n"
+        summary = mock_echo.call_args_list[1][0][0]
+        assert "Turns: 2" in summary and "Duration: 1.5s" in summary and "Result: Done" in summary
+    
+    def test_lines_split_across_chunks(self):
+        """Test that JSON lines and multi-byte characters split across chunks are parsed."""
+        data = '{"type": "system", "text": "café"}\n{"type": "result"}\n'.encode()
+        # Split inside the two-byte UTF-8 sequence and inside the second line
+        chunks = [data[:32], data[32:45], data[45:]]
+        
+        raw_output, messages = parse_claude_stream_json(iter(chunks), echo_to_screen=False)
+        
+        assert raw_output == data
+        assert messages == [{"type": "system", "text": "café"}, {"type": "result"}]
+    
+    def test_skips_non_json_and_parses_trailing_line(self):
+        """Test that non-JSON lines are skipped and a final unterminated line is parsed."""
+        chunks = [b'not json\n', b'\n{"type": "res', b'ult"}']
+        
+        raw_output, messages = parse_claude_stream_json(iter(chunks), echo_to_screen=False)
+        
+        assert raw_output == b'not json\n\n{"type": "result"}'
+        assert messages == [{"type": "result"}]
+    
+    def test_integer_chunks_and_invalid_bytes(self):
+        """Test byte-at-a-time streams and that invalid UTF-8 is replaced, not raised."""
+        data = '{"text": "日本"}\n'.encode()
+        chunks = list(data) + [b'\xff\n']
+        
+        raw_output, messages = parse_claude_stream_json(iter(chunks), echo_to_screen=False)
+        
+        # Raw output keeps the original bytes; only parsing replaces invalid UTF-8
+        assert raw_output == data + b'\xff\n'
+        assert messages == [{"text": "日本"}]
+    
+    def test_integer_chunks_are_written_per_line(self):
+        """Test byte-at-a-time streams reach the sink a line at a time, not per byte."""
+        from unittest.mock import Mock
+        sink = Mock()
+        data = b'{"type": "system"}\n{"type": "user"}'
+        
+        _, messages = parse_claude_stream_json(iter(list(data)), echo_to_screen=False, raw_sink=sink)
+        
+        assert [c[0][0] for c in sink.write.call_args_list] == [b'{"type": "system"}\n', b'{"type": "user"}']
+        assert messages == [{"type": "system"}, {"type": "user"}]
+    
+    def test_invalid_utf8_inside_json_line(self):
+        """Test a JSON line with invalid UTF-8 is parsed with replacement characters."""
+        raw_output, messages = parse_claude_stream_json(
+            iter([b'{"text": "a\xffb"}\n']), echo_to_screen=False
+        )
+        
+        assert messages == [{"text": "a\ufffdb"}]
+    
+    def test_raw_sink_receives_output(self):
+        """Test raw output goes to the sink as it streams instead of being kept."""
+        import io
+        sink = io.BytesIO()
+        chunks = [b'{"type": "sys', b'tem"}\n']
+        
+        raw_output, messages = parse_claude_stream_json(iter(chunks), echo_to_screen=False, raw_sink=sink)
+        
+        assert raw_output == b''
+        assert sink.getvalue() == b'{"type": "system"}\n'
+        assert messages == [{"type": "system"}]
+
+
+class TestFindChangeMarker:
+    """Test find_change_marker function."""
+    
+    def test_markers_on_last_line_of_result(self):
+        """Test that the marker is read from the last line of the final result."""
+        assert find_change_marker([
+            {"type": "assistant"},
+            {"type": "result", "result": "Updated the parser.\n::HAS_CHANGES::\n"},
+        ]) is True
+        assert find_change_marker([
+            {"type": "result", "result": "Nothing needed.\n::NO_CHANGES::"},
+        ]) is False
+    
+    def test_missing_marker(self):
+        """Test that a missing or misplaced marker yields None."""
+        assert find_change_marker([]) is None
+        assert find_change_marker([{"type": "assistant"}]) is None
+        assert find_change_marker([
+            {"type": "result", "result": "::HAS_CHANGES::\nbut then kept talking"},
+        ]) is None
+
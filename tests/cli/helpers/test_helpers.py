@@ -3,7 +3,7 @@
 import sys
 import tempfile
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 from unittest import mock
 
 import pytest
@@ -12,23 +12,62 @@ from click.testing import CliRunner
 
 from claude_container.cli.helpers import (
     ensure_authenticated,
+    is_verbose,
     get_project_context,
     ensure_container_built,
     get_storage_and_runner,
+    get_docker_service,
+    get_container_runner,
+    get_mcp_manager,
+    get_task_storage,
     get_docker_client,
     get_config_manager,
     resolve_task_id,
     format_pr_display,
+    format_timestamp,
+    format_task_row,
     format_task_table,
+    format_simple_table,
     print_table,
     open_in_editor,
     cleanup_container,
+    check_claude_permissions,
+    run_claude_streaming,
+    commit_task_changes,
+    parse_commit_log,
+    BackgroundLogWriter,
 )
 from claude_container.core.constants import DATA_DIR_NAME
 from claude_container.models.task import TaskStatus, TaskMetadata
 from claude_container.models.config import ContainerConfig
 
 
+class TestIsVerbose:
+    """Test is_verbose function."""
+    
+    def test_reads_root_context_flag(self):
+        """Test that the flag set on the top-level group is visible to subcommands."""
+        from claude_container.cli.main import cli
+        
+        @cli.command(name='verbose-probe')
+        def probe():
+            click.echo(f"verbose={is_verbose()}")
+        
+        try:
+            runner = CliRunner()
+            assert "verbose=True" in runner.invoke(cli, ['--verbose', 'verbose-probe']).output
+            assert "verbose=False" in runner.invoke(cli, ['verbose-probe']).output
+            assert "verbose=True" in runner.invoke(
+                cli, ['verbose-probe'], env={'CLAUDE_CONTAINER_DEBUG': '1'}
+            ).output
+        finally:
+            cli.commands.pop('verbose-probe')
+    
+    def test_false_without_context(self):
+        """Test that it is False outside of a click command."""
+        assert is_verbose() is False
+
+
 class TestEnsureAuthenticated:
     """Test ensure_authenticated function."""
     
@@ -94,10 +133,11 @@ class TestEnsureContainerBuilt:
 class TestGetStorageAndRunner:
     """Test get_storage_and_runner function."""
     
+    @mock.patch('claude_container.cli.helpers.DockerService')
     @mock.patch('claude_container.cli.helpers.ContainerRunner')
     @mock.patch('claude_container.cli.helpers.TaskStorageManager')
     @mock.patch('claude_container.cli.helpers.get_project_context')
-    def test_success_case(self, mock_context, mock_storage_cls, mock_runner_cls, tmp_path):
+    def test_success_case(self, mock_context, mock_storage_cls, mock_runner_cls, mock_service_cls, tmp_path):
         """Test successful initialization."""
         # Setup mocks
         project_root = tmp_path / "project"
@@ -134,6 +174,77 @@ class TestGetStorageAndRunner:
         assert excinfo.value.code == 1
 
 
+class TestGetDockerService:
+    """Test get_docker_service function."""
+    
+    @mock.patch('claude_container.cli.helpers.DockerService')
+    def test_instance_is_reused(self, mock_service_cls):
+        """Test that the Docker service is only created once per process."""
+        first = get_docker_service()
+        second = get_docker_service()
+        
+        assert first is second
+        mock_service_cls.assert_called_once()
+    
+    @mock.patch('claude_container.cli.helpers.DockerService')
+    def test_failure_is_not_cached(self, mock_service_cls):
+        """Test that a failed connection is retried on the next call."""
+        mock_service = mock.Mock()
+        mock_service_cls.side_effect = [RuntimeError("Docker not running"), mock_service]
+        
+        with pytest.raises(RuntimeError):
+            get_docker_service()
+        assert get_docker_service() is mock_service
+
+
+class TestGetContainerRunner:
+    """Test get_container_runner function."""
+    
+    @mock.patch('claude_container.cli.helpers.ContainerRunner')
+    @mock.patch('claude_container.cli.helpers.DockerService')
+    def test_runner_is_reused_per_project(self, mock_service_cls, mock_runner_cls, tmp_path):
+        """Test that runners are memoized per project and share one Docker service."""
+        data_dir = tmp_path / DATA_DIR_NAME
+        
+        first = get_container_runner(tmp_path, data_dir, "image-a")
+        second = get_container_runner(tmp_path, data_dir, "image-a")
+        get_container_runner(tmp_path, data_dir, "image-b")
+        
+        assert first is second
+        assert mock_runner_cls.call_count == 2
+        mock_service_cls.assert_called_once()
+        mock_runner_cls.assert_any_call(
+            tmp_path, data_dir, "image-a", docker_service=mock_service_cls.return_value
+        )
+
+
+class TestGetMcpManager:
+    """Test get_mcp_manager function."""
+    
+    @mock.patch('claude_container.cli.helpers.MCPManager')
+    def test_manager_is_reused_per_project(self, mock_manager_cls, tmp_path):
+        """Test that one manager is shared per project root."""
+        first = get_mcp_manager(tmp_path)
+        second = get_mcp_manager(tmp_path)
+        get_mcp_manager(tmp_path / "other")
+        
+        assert first is second
+        assert mock_manager_cls.call_count == 2
+
+
+class TestGetTaskStorage:
+    """Test get_task_storage function."""
+    
+    def test_storage_is_reused_per_data_dir(self, tmp_path):
+        """Test that one storage manager is shared per data directory."""
+        first = get_task_storage(tmp_path / DATA_DIR_NAME)
+        second = get_task_storage(tmp_path / DATA_DIR_NAME)
+        
+        assert first is second
+        assert first.tasks_dir == tmp_path / DATA_DIR_NAME / "tasks"
+        assert get_task_storage(tmp_path / "other") is not first
+
+
 class TestGetDockerClient:
     """Test get_docker_client function."""
     
@@ -236,11 +347,13 @@ class TestResolveTaskId:
             created_at=datetime.now(),
             branch_name="feature/test"
         )
-        mock_storage.get_task.return_value = None
-        mock_storage.list_tasks.return_value = [task]
+        mock_storage.get_task.side_effect = lambda task_id: task if task_id == task.id else None
+        mock_storage.lookup_by_prefix.return_value = [task.id]
         
         result = resolve_task_id(mock_storage, "task-123")
         assert result == task
+        mock_storage.lookup_by_prefix.assert_called_once_with("task-123")
+        mock_storage.list_tasks.assert_not_called()
     
     def test_exits_on_multiple_matches(self):
         """Test that it exits when multiple tasks match."""
@@ -259,8 +372,9 @@ class TestResolveTaskId:
             created_at=datetime.now(),
             branch_name="feature/test2"
         )
-        mock_storage.get_task.return_value = None
-        mock_storage.list_tasks.return_value = [task1, task2]
+        tasks = {task1.id: task1, task2.id: task2}
+        mock_storage.get_task.side_effect = tasks.get
+        mock_storage.lookup_by_prefix.return_value = [task1.id, task2.id]
         
         with pytest.raises(SystemExit) as excinfo:
             resolve_task_id(mock_storage, "task-123")
@@ -270,7 +384,7 @@ class TestResolveTaskId:
         """Test that it exits when no task matches."""
         mock_storage = mock.Mock()
         mock_storage.get_task.return_value = None
-        mock_storage.list_tasks.return_value = []
+        mock_storage.lookup_by_prefix.return_value = []
         
         with pytest.raises(SystemExit) as excinfo:
             resolve_task_id(mock_storage, "task-123")
@@ -296,6 +410,61 @@ class TestFormatPrDisplay:
         url = "https://github.com/owner/repo/pr/123"
         result = format_pr_display(url)
         assert result == click.style("PR", fg='cyan')
+    
+    def test_lookalike_segments(self):
+        """Test only a path segment named exactly 'pull' is recognized."""
+        assert format_pr_display("https://example.com/mypull/7") == click.style("PR", fg='cyan')
+        assert format_pr_display("https://github.com/owner/repo/pull/7/") == click.style("PR", fg='cyan')
+        assert format_pr_display("pull/7") == click.style("PR #7", fg='cyan')
+
+
+class TestFormatTimestamp:
+    """Test format_timestamp function."""
+    
+    def test_seconds(self):
+        """Test microseconds and the UTC offset are dropped."""
+        dt = datetime(2024, 1, 2, 3, 4, 5, 678, tzinfo=timezone.utc)
+        assert format_timestamp(dt) == "2024-01-02 03:04:05"
+    
+    def test_minutes(self):
+        """Test the minutes format omits seconds."""
+        assert format_timestamp(datetime(2024, 1, 2, 3, 4, 5), timespec='minutes') == "2024-01-02 03:04"
+
+
+class TestFormatTaskRow:
+    """Test format_task_row function."""
+    
+    def test_row_columns(self):
+        """Test a task is formatted into the table columns."""
+        task = TaskMetadata(
+            id="task-12345678",
+            description="First line\nSecond line",
+            status=TaskStatus.FAILED,
+            created_at=datetime(2024, 1, 2, 3, 4, 5),
+            branch_name="feature/test",
+            pr_url="https://github.com/owner/repo/pull/42"
+        )
+        
+        assert format_task_row(task) == [
+            "task-123",
+            click.style("FAILED", fg='red'),
+            "feature/test",
+            "First line",
+            "2024-01-02 03:04",
+            click.style("PR #42", fg='cyan')
+        ]
+    
+    def test_timezone_aware_created_at(self):
+        """Test the UTC offset of an aware creation time is not shown."""
+        task = TaskMetadata(
+            id="task-12345678",
+            description="Task",
+            status=TaskStatus.CREATED,
+            created_at=datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            branch_name="feature/test"
+        )
+        
+        assert format_task_row(task)[4] == "2024-01-02 03:04"
 
 
 class TestFormatTaskTable:
@@ -323,6 +492,19 @@ class TestFormatTaskTable:
         assert "feature/test" in result
         assert "Test task description" in result
     
+    def test_status_counts(self):
+        """Test statuses are counted into the given counter while rows are built."""
+        from collections import Counter
+        tasks = [
+            TaskMetadata(id=f"task-{i}", description="Task", status=status,
+                         created_at=datetime.now(), branch_name="feature/test")
+            for i, status in enumerate([TaskStatus.CREATED, TaskStatus.FAILED, TaskStatus.CREATED])
+        ]
+        
+        status_counts = Counter()
+        format_task_table(tasks, status_counts=status_counts)
+        assert status_counts == {"created": 2, "failed": 1}
+    
     def test_long_description_truncation(self):
         """Test that long descriptions are truncated."""
         task = TaskMetadata(
@@ -351,6 +533,27 @@ class TestFormatTaskTable:
         assert "(cont: 3)" in result
 
 
+class TestFormatSimpleTable:
+    """Test format_simple_table function."""
+    
+    def test_matches_tabulate_simple_layout(self):
+        """Test colored cells and alignment match tabulate's simple format."""
+        from tabulate import tabulate
+        headers = ["ID", "STATUS", "CREATED"]
+        rows = [
+            ["abc", click.style("FAILED", fg='red'), "2024-01-02 03:04"],
+            ["abcdefghij", None, "2024-01-02"],
+        ]
+        colalign = ("left", "left", "right")
+        
+        expected = tabulate(rows, headers=headers, tablefmt="simple", colalign=colalign)
+        assert format_simple_table(headers, rows, colalign) == expected
+    
+    def test_empty_rows(self):
+        """Test an empty table still has its header."""
+        assert format_simple_table(["ID", "STATUS"], []) == "ID    STATUS\n----  --------"
+
+
 class TestPrintTable:
     """Test print_table function."""
     
@@ -460,4 +663,204 @@ class TestCleanupContainer:
         
         result = runner.invoke(cmd)
         assert result.exit_code == 0
-        # Should not output anything for None container
\ No newline at end of file
+        # Should not output anything for None container
+
+
+class TestCheckClaudePermissions:
+    """Test check_claude_permissions function."""
+    
+    def _make_runner(self, data_dir, digest="sha256:abc"):
+        runner = mock.Mock()
+        runner.data_dir = data_dir
+        runner.image_name = "claude-container-test"
+        runner.docker_service.get_image_digest.return_value = digest
+        return runner
+    
+    def test_probe_success_is_cached(self, tmp_path):
+        """Test that a successful probe is skipped on the next check."""
+        runner = self._make_runner(tmp_path)
+        runner.exec_in_container_as_user.return_value = mock.Mock(exit_code=0, output=b"test")
+        
+        assert check_claude_permissions(runner, mock.Mock()) is True
+        assert check_claude_permissions(runner, mock.Mock()) is True
+        
+        runner.exec_in_container_as_user.assert_called_once()
+    
+    def test_permissions_not_accepted(self, tmp_path):
+        """Test that a permissions error is reported and not cached."""
+        from claude_container.core.constants import CLAUDE_PERMISSIONS_ERROR
+        runner = self._make_runner(tmp_path)
+        runner.exec_in_container_as_user.return_value = mock.Mock(
+            exit_code=1, output=CLAUDE_PERMISSIONS_ERROR.encode()
+        )
+        
+        assert check_claude_permissions(runner, mock.Mock()) is False
+        assert check_claude_permissions(runner, mock.Mock()) is False
+        
+        assert runner.exec_in_container_as_user.call_count == 2
+    
+    def test_no_digest_always_probes(self, tmp_path):
+        """Test that the probe runs every time when the image digest is unknown."""
+        runner = self._make_runner(tmp_path, digest=None)
+        runner.exec_in_container_as_user.return_value = mock.Mock(exit_code=0, output=b"test")
+        
+        check_claude_permissions(runner, mock.Mock())
+        check_claude_permissions(runner, mock.Mock())
+        
+        assert runner.exec_in_container_as_user.call_count == 2
+    
+    def test_prefetched_digest_skips_lookup(self, tmp_path):
+        """Test that a digest passed by the caller is used without another lookup."""
+        runner = self._make_runner(tmp_path)
+        runner.exec_in_container_as_user.return_value = mock.Mock(exit_code=0, output=b"test")
+        
+        assert check_claude_permissions(runner, mock.Mock(), image_digest="sha256:def") is True
+        assert check_claude_permissions(runner, mock.Mock(), image_digest="sha256:def") is True
+        
+        runner.docker_service.get_image_digest.assert_not_called()
+        runner.exec_in_container_as_user.assert_called_once()
+    
+    def test_force_probes_despite_cache(self, tmp_path):
+        """Test that force re-runs the probe even after a cached success."""
+        runner = self._make_runner(tmp_path)
+        runner.exec_in_container_as_user.return_value = mock.Mock(exit_code=0, output=b"test")
+        
+        check_claude_permissions(runner, mock.Mock())
+        assert check_claude_permissions(runner, mock.Mock(), force=True) is True
+        
+        assert runner.exec_in_container_as_user.call_count == 2
+
+
+class TestRunClaudeStreaming:
+    """Test run_claude_streaming function."""
+    
+    def test_runs_claude_and_saves_log(self):
+        """Test the prompt goes over stdin and the raw output is logged."""
+        runner = mock.Mock()
+        raw = b'{"type": "user"}\n'
+        runner.exec_streaming.return_value = iter([raw])
+        log_writer = mock.MagicMock()
+        log_file = log_writer.open_task_log.return_value.__enter__.return_value
+        container = mock.Mock()
+        
+        messages = run_claude_streaming(
+            runner, container, "Do it", "/tmp/.mcp.json", log_writer, "task-1", "claude_output"
+        )
+        
+        assert messages == [{"type": "user"}]
+        args, kwargs = runner.exec_streaming.call_args
+        assert args[0] is container
+        assert args[1][:3] == ["claude", "--model=opus", "-p"]
+        assert args[1][-2:] == ["--mcp-config", "/tmp/.mcp.json"]
+        assert kwargs["stdin_data"] == b"Do it"
+        log_writer.open_task_log.assert_called_once_with("task-1", "claude_output")
+        log_file.write.assert_called_once_with(raw)
+
+
+
+class TestParseCommitLog:
+    """Test parse_commit_log function."""
+    
+    def test_splits_hash_and_message(self):
+        """Test the hash and multi-line message are separated."""
+        output = b"abc123\x1fAdd feature\n\nDetails here\n"
+        assert parse_commit_log(output) == ("abc123", "Add feature\n\nDetails here")
+    
+    def test_missing_separator(self):
+        """Test output without a separator yields an empty message."""
+        assert parse_commit_log(b"abc123\n") == ("abc123", "")
+
+
+class TestCommitTaskChanges:
+    """Test commit_task_changes function."""
+    
+    def test_commits_with_git_and_saves_log(self):
+        """Test the prompt and fallback message are written and git commits as node."""
+        runner = mock.Mock()
+        results = {"commit": (0, b"committed"), "push": (0, b"pushed")}
+        runner.run_batched.return_value = results
+        log_writer = mock.Mock()
+        container = mock.Mock()
+        
+        assert commit_task_changes(
+            runner, container, "Add feature X\nwith details", log_writer, "task-1", "claude_commit",
+            base_ref="origin/feature-x", then=[("push", "git push")], stop_on_failure=("push",)
+        ) == results
+        
+        files = runner.stream_files.call_args[0][1]
+        assert runner.stream_files.call_args[0][0] is container
+        assert len(files) == 2
+        assert "chore: Add feature X\n\nAdd feature X\nwith details\n" in files.values()
+        args, kwargs = runner.run_batched.call_args
+        steps = args[1]
+        assert steps[0][0] == "commit" and "git commit" in steps[0][1]
+        # The message is generated without permission to use tools
+        assert "--model=haiku -p >" in steps[0][1]
+        assert "--dangerously-skip-permissions" not in steps[0][1]
+        # A clean index only stops the batch when HEAD has nothing new to push
+        assert "git rev-list -1 origin/feature-x..HEAD" in steps[0][1]
+        assert steps[1:] == [("push", "git push")]
+        assert kwargs["user"] == "node"
+        assert kwargs["stop_on_failure"] == ("commit", "push")
+        log_writer.save_task_log.assert_called_once_with("task-1", "claude_commit", b"committed")
+    
+    def test_reports_failed_commit(self):
+        """Test a failed commit's exit code is returned to the caller."""
+        runner = mock.Mock()
+        runner.run_batched.return_value = {"commit": (1, b"nothing to commit")}
+        
+        results = commit_task_changes(
+            runner, mock.Mock(), "Fix it", mock.Mock(), "task-1", "claude_commit",
+            base_ref="master", then=[("push", "git push")]
+        )
+        assert results["commit"][0] == 1
+        # Follow-up steps never run after a failed commit
+        assert runner.run_batched.call_args[1]["stop_on_failure"] == ("commit",)
+    
+    def test_nothing_to_commit(self):
+        """Test an empty index with no new commits is reported as a successful commit step."""
+        runner = mock.Mock()
+        runner.run_batched.return_value = {"commit": (3, b"nothing to commit")}
+        log_writer = mock.Mock()
+        
+        results = commit_task_changes(
+            runner, mock.Mock(), "Fix it", log_writer, "task-1", "claude_commit",
+            base_ref="master", then=[("push", "git push")]
+        )
+        assert results == {"commit": (0, b"nothing to commit")}
+        log_writer.save_task_log.assert_called_once_with("task-1", "claude_commit", b"nothing to commit")
+
+
+class TestBackgroundLogWriter:
+    """Test BackgroundLogWriter class."""
+    
+    def test_writes_complete_on_close(self):
+        """Test that queued logs are saved in order by the time close returns."""
+        mock_storage = mock.Mock()
+        writer = BackgroundLogWriter(mock_storage)
+        
+        writer.save_task_log("task-1", "claude_output", "output")
+        writer.save_task_log("task-1", "claude_commit", "commit")
+        writer.close()
+        
+        assert mock_storage.save_task_log.call_args_list == [
+            mock.call("task-1", "claude_output", "output"),
+            mock.call("task-1", "claude_commit", "commit"),
+        ]
+    
+    def test_failed_write_warns(self):
+        """Test that a failed write is reported instead of raised."""
+        mock_storage = mock.Mock()
+        mock_storage.save_task_log.side_effect = OSError("disk full")
+        
+        runner = CliRunner()
+        
+        @click.command()
+        def cmd():
+            writer = BackgroundLogWriter(mock_storage)
+            writer.save_task_log("task-1", "claude_output", "output")
+            writer.close()
+        
+        result = runner.invoke(cmd)
+        assert result.exit_code == 0
+        assert "Failed to save task log: disk full" in result.output
@@ -71,6 +71,24 @@ def mock_claude_executable(monkeypatch):
     return "/usr/local/bin/claude"
 
 
+@pytest.fixture(autouse=True)
+def clear_cli_caches():
+    """Reset process-wide CLI caches so mocks never leak between tests."""
+    from claude_container.cli.commands.auth_check import _verified_data_dirs
+    from claude_container.cli.helpers import (
+        get_docker_service, get_container_runner, get_mcp_manager, get_task_storage
+    )
+    
+    caches = (get_docker_service, get_container_runner, get_mcp_manager, get_task_storage)
+    for cache in caches:
+        cache.cache_clear()
+    _verified_data_dirs.clear()
+    yield
+    for cache in caches:
+        cache.cache_clear()
+    _verified_data_dirs.clear()
+
+
 @pytest.fixture
 def isolated_cli_runner(cli_runner):
     """Provides a CLI runner with isolated filesystem."""
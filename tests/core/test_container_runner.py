@@ -376,6 +376,89 @@ class TestContainerRunner:
         with pytest.raises(RuntimeError, match="Failed to create container"):
             runner.create_persistent_container("task")
     
+    @patch('claude_container.core.container_runner.DockerService')
+    def test_find_task_container(self, mock_docker_service_class, temp_project_dir):
+        """Test that task containers are labelled on creation and found by task ID."""
+        mock_docker = MagicMock()
+        mock_container = MagicMock()
+        mock_docker.list_containers.side_effect = [[mock_container], []]
+        mock_docker_service_class.return_value = mock_docker
+        
+        data_dir = temp_project_dir / ".claude-container"
+        runner = ContainerRunner(temp_project_dir, data_dir, "test-image")
+        runner.create_persistent_container("task", labels={"claude-container-task-id": "task-1"})
+        
+        labels = mock_docker.run_container.call_args[1]['labels']
+        assert labels["claude-container-task-id"] == "task-1"
+        assert labels["claude-container-type"] == "task"
+        
+        assert runner.find_task_container("task-1") is mock_container
+        assert runner.find_task_container("task-2") is None
+        mock_docker.list_containers.assert_called_with(
+            all=False, labels={"claude-container-task-id": "task-2"}
+        )
+    
+    @patch('claude_container.core.container_runner.DockerService')
+    def test_create_warm_container(self, mock_docker_service_class, temp_project_dir):
+        """Test warm containers are labelled and have the workspace chowned up front."""
+        mock_docker = MagicMock()
+        mock_container = MagicMock(id="warm-1")
+        mock_container.exec_run.return_value = (0, b"")
+        mock_docker.run_container.return_value = mock_container
+        mock_docker_service_class.return_value = mock_docker
+        
+        data_dir = temp_project_dir / ".claude-container"
+        runner = ContainerRunner(temp_project_dir, data_dir, "test-image")
+        
+        assert runner.create_warm_container() is mock_container
+        labels = mock_docker.run_container.call_args[1]['labels']
+        assert labels["claude-container-warm"] == "true"
+        mock_container.exec_run.assert_called_once_with(['chown', '-R', 'node:node', '/workspace'])
+    
+    @patch('claude_container.core.container_runner.DockerService')
+    def test_claim_warm_container(self, mock_docker_service_class, temp_project_dir):
+        """Test claiming skips stale and claimed containers and survives a lost race."""
+        from claude_container.services.exceptions import DockerServiceError
+        mock_docker = MagicMock()
+        mock_docker_service_class.return_value = mock_docker
+        mock_docker.get_image_digest.return_value = "sha256:current"
+        
+        def warm(name, image_id="sha256:current"):
+            container = MagicMock(id=name)
+            container.attrs = {'ImageID': image_id}
+            return container
+        
+        stale = warm("stale", image_id="sha256:old")
+        claimed = warm("claimed-claimed")
+        lost = warm("lost")
+        free = warm("free")
+        mock_docker.list_containers.return_value = [stale, claimed, lost, free]
+        mock_docker.container_name.side_effect = lambda c: c.id
+        
+        def rename(container, name):
+            if container is lost:
+                raise DockerServiceError("Conflict: name already in use")
+        
+        mock_docker.rename_container.side_effect = rename
+        full_container = MagicMock(id="free")
+        mock_docker.get_container.return_value = full_container
+        
+        data_dir = temp_project_dir / ".claude-container"
+        runner = ContainerRunner(temp_project_dir, data_dir, "test-image")
+        
+        assert runner.claim_warm_container() is full_container
+        assert [c[0] for c in mock_docker.rename_container.call_args_list] == [
+            (lost, "lost-claimed"), (free, "free-claimed")
+        ]
+        mock_docker.get_container.assert_called_once_with("free")
+        
+        # The workspace was chowned at warm-up, so no exec is needed for it
+        runner.exec_in_container_as_user(full_container, ["true"], user="node")
+        full_container.exec_run.assert_called_once_with(["true"], user="node")
+        
+        mock_docker.list_containers.return_value = []
+        assert runner.claim_warm_container() is None
+    
     @patch('claude_container.core.container_runner.DockerService')
     def test_write_file_success(self, mock_docker_service_class, temp_project_dir):
         """Test successfully writing a file to container."""
@@ -457,9 +540,54 @@ class TestContainerRunner:
         with pytest.raises(RuntimeError, match="Failed to write file /test/file.txt: Docker error"):
             runner.write_file(mock_container, "/test/file.txt", "Hello")
     
+    @patch('claude_container.core.container_runner.DockerService')
+    def test_workspace_chown_runs_once_per_container(self, mock_docker_service_class, temp_project_dir):
+        """Test /workspace is only chowned on the first exec into a container."""
+        mock_container = MagicMock()
+        mock_container.id = "container-1"
+        mock_container.exec_run.return_value = (0, b"")
+        
+        runner = ContainerRunner(temp_project_dir, temp_project_dir / ".claude-container", "test-image")
+        runner.exec_in_container_as_user(mock_container, "git status", user='node')
+        runner.exec_in_container_as_user(mock_container, "git log", user='node')
+        
+        commands = [c[0][0] for c in mock_container.exec_run.call_args_list]
+        assert commands == [
+            ['chown', '-R', 'node:node', '/workspace'],
+            ['su', 'node', '-c', 'git status'],
+            ['su', 'node', '-c', 'git log'],
+        ]
+    
+    @patch('claude_container.core.container_runner.ShellSession')
+    @patch('claude_container.core.container_runner.DockerService')
+    def test_exec_routed_through_open_shell(self, mock_docker_service_class, mock_session_class, temp_project_dir):
+        """Test commands use the open shell session until it is closed."""
+        mock_container = MagicMock()
+        mock_container.id = "container-1"
+        mock_container.exec_run.return_value = (0, b"")
+        mock_session = mock_session_class.return_value
+        mock_session.run.return_value = (0, b"clean")
+        
+        runner = ContainerRunner(temp_project_dir, temp_project_dir / ".claude-container", "test-image")
+        runner.open_shell(mock_container)
+        mock_docker_service_class.return_value.exec_attach.assert_called_once_with(
+            mock_container, ['sh'], user='node'
+        )
+        
+        result = runner.exec_in_container_as_user(
+            mock_container, ['git', 'status'], user='node', workdir='/workspace'
+        )
+        assert (result.exit_code, result.output) == (0, b"clean")
+        mock_session.run.assert_called_once_with('git status', '/workspace')
+        
+        runner.close_shell(mock_container)
+        mock_session.close.assert_called_once()
+        runner.exec_in_container_as_user(mock_container, "git log", user='node')
+        assert mock_container.exec_run.call_args[0][0] == ['su', 'node', '-c', 'git log']
+    
     @patch('claude_container.core.container_runner.DockerService')
     def test_exec_in_container_as_user_with_multiline_args(self, mock_docker_service_class, temp_project_dir):
-        """Test executing command with multi-line arguments properly escapes them."""
+        """Test argument lists run as the user directly, with no shell to escape for."""
         mock_docker = MagicMock()
         mock_docker_service_class.return_value = mock_docker
         
@@ -477,24 +605,112 @@ class TestContainerRunner:
 3. Implements API endpoints"""
         
         # Execute command with multi-line argument
-        runner.exec_in_container_as_user(
+        result = runner.exec_in_container_as_user(
             mock_container,
             ['claude', '--model=opus', '-p', task_description],
             user='node'
         )
         
-        # Verify the command was properly escaped
-        mock_container.exec_run.assert_called()
-        actual_command = mock_container.exec_run.call_args[0][0]
-        
-        # Should be ['su', 'node', '-c', <escaped command>]
-        assert actual_command[0] == 'su'
-        assert actual_command[1] == 'node'
-        assert actual_command[2] == '-c'
-        
-        # The shell command should have the task description properly quoted
-        shell_command = actual_command[3]
-        assert 'claude --model=opus -p ' in shell_command
-        # The multi-line string should be wrapped in quotes
-        assert "'Implement a new feature that:" in shell_command or '"Implement a new feature that:' in shell_command
-        assert "3. Implements API endpoints'" in shell_command or '3. Implements API endpoints"' in shell_command
\ No newline at end of file
+        # Plain tuples are normalized so callers can use attributes
+        assert (result.exit_code, result.output) == (0, b"Success")
+        
+        # The argument list reaches Docker unchanged, with the user set on the exec
+        mock_container.exec_run.assert_called_with(
+            ['claude', '--model=opus', '-p', task_description], user='node'
+        )
+    
+    @patch('claude_container.core.container_runner.DockerService')
+    def test_run_batched_single_exec(self, mock_docker_service_class, temp_project_dir):
+        """Test that batched steps run in one exec and are split per step."""
+        mock_container = MagicMock()
+        mock_container.exec_run.return_value = (0, b"")
+        
+        data_dir = temp_project_dir / ".claude-container"
+        runner = ContainerRunner(temp_project_dir, data_dir, "test-image")
+        
+        def fake_exec(container, command, user='node', **kwargs):
+            marker = command.split("'")[1].split(' ')[0]
+            output = (
+                f"{marker} STEP fetch\nFetching origin\n\n{marker} RC 0\n"
+                f"{marker} STEP status\n M src/app.py\n?? new.txt\n\n{marker} RC 0\n"
+                f"{marker} STEP checkout\nerror: pathspec 'x'\n{marker} RC 1\n"
+            ).encode()
+            return MagicMock(exit_code=1, output=output)
+        
+        with patch.object(runner, 'exec_in_container_as_user', side_effect=fake_exec) as mock_exec:
+            results = runner.run_batched(
+                mock_container,
+                [("fetch", "git fetch --all"), ("status", "git status --porcelain"),
+                 ("checkout", "git checkout x"), ("pull", "git pull")],
+                stop_on_failure=("checkout",)
+            )
+        
+        mock_exec.assert_called_once()
+        script = mock_exec.call_args[0][1]
+        assert "git fetch --all 2>&1" in script
+        assert script.index("git checkout x") < script.index('|| exit "$rc"') < script.index("git pull")
+        assert results == {
+            "fetch": (0, b"Fetching origin"),
+            "status": (0, b" M src/app.py\n?? new.txt"),
+            "checkout": (1, b"error: pathspec 'x'"),
+        }
+    
+    @patch('claude_container.core.container_runner.DockerService')
+    def test_stream_file_verifies_byte_count(self, mock_docker_service_class, temp_project_dir):
+        """Test that stream_file writes via stdin and checks the reported size."""
+        mock_docker = MagicMock()
+        mock_docker.exec_with_stdin.return_value = (0, b"11\n")
+        mock_docker_service_class.return_value = mock_docker
+        mock_container = MagicMock()
+        
+        data_dir = temp_project_dir / ".claude-container"
+        runner = ContainerRunner(temp_project_dir, data_dir, "test-image")
+        runner.stream_file(mock_container, "/tmp/.mcp.json", "Hello World")
+        
+        mock_docker.exec_with_stdin.assert_called_once_with(
+            mock_container,
+            ['sh', '-c', 'cat > /tmp/.mcp.json && wc -c < /tmp/.mcp.json'],
+            b"Hello World"
+        )
+        mock_docker.exec_in_container.assert_not_called()
+        
+        mock_docker.exec_with_stdin.return_value = (0, b"5\n")
+        with pytest.raises(RuntimeError, match="expected 11 bytes"):
+            runner.stream_file(mock_container, "/tmp/.mcp.json", "Hello World")
+    
+    @patch('claude_container.core.container_runner.DockerService')
+    def test_stream_files_uploads_archive(self, mock_docker_service_class, temp_project_dir):
+        """Test that stream_files uploads every file at once and falls back per file."""
+        from claude_container.services.exceptions import DockerServiceError
+        mock_docker = MagicMock()
+        mock_docker_service_class.return_value = mock_docker
+        mock_container = MagicMock()
+        
+        data_dir = temp_project_dir / ".claude-container"
+        runner = ContainerRunner(temp_project_dir, data_dir, "test-image")
+        runner.stream_files(mock_container, {"/tmp/a.txt": "Hello", "/tmp/b.txt": "Hello World"})
+        
+        mock_docker.put_files.assert_called_once_with(
+            mock_container, {"/tmp/a.txt": b"Hello", "/tmp/b.txt": b"Hello World"}
+        )
+        mock_docker.exec_with_stdin.assert_not_called()
+        
+        mock_docker.put_files.side_effect = DockerServiceError("upload failed")
+        mock_docker.exec_with_stdin.side_effect = [(0, b"5\n"), (0, b"11\n")]
+        runner.stream_files(mock_container, {"/tmp/a.txt": "Hello", "/tmp/b.txt": "Hello World"})
+        assert mock_docker.exec_with_stdin.call_count == 2
+    
+    @patch('claude_container.core.container_runner.DockerService')
+    def test_stream_file_falls_back_to_write_file(self, mock_docker_service_class, temp_project_dir):
+        """Test that stream_file uses the heredoc write when stdin is unavailable."""
+        from claude_container.services.exceptions import DockerServiceError
+        mock_docker = MagicMock()
+        mock_docker.exec_with_stdin.side_effect = DockerServiceError("no socket")
+        mock_docker.exec_in_container.return_value = {'ExitCode': 0, 'stderr': b''}
+        mock_docker_service_class.return_value = mock_docker
+        
+        data_dir = temp_project_dir / ".claude-container"
+        runner = ContainerRunner(temp_project_dir, data_dir, "test-image")
+        runner.stream_file(MagicMock(), "/test/file.txt", "Hello")
+        
+        mock_docker.exec_in_container.assert_called_once()
@@ -0,0 +1,63 @@
+"""Tests for ShellSession."""
+
+import subprocess
+
+import pytest
+
+from claude_container.core.shell_session import ShellSession
+from claude_container.services.exceptions import DockerServiceError
+
+
+class LocalShellChannel:
+    """ExecChannel stand-in backed by a local ``sh`` process."""
+
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            ['sh'], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+        self.output = iter(lambda: self.proc.stdout.read1(4096), b'')
+
+    def send(self, data):
+        self.proc.stdin.write(data)
+        self.proc.stdin.flush()
+
+    def close(self):
+        self.proc.stdin.close()
+        self.proc.wait()
+        self.proc.stdout.close()
+
+
+class TestShellSession:
+    """Test ShellSession functionality."""
+
+    @pytest.fixture
+    def session(self):
+        """Create a session over a local shell."""
+        session = ShellSession(LocalShellChannel())
+        yield session
+        session.close()
+
+    def test_run_returns_exit_code_and_output(self, session):
+        """Test consecutive commands each get their own output and exit code."""
+        assert session.run("echo hello; echo oops >&2") == (0, b"hello\noops\n")
+        assert session.run("printf partial; exit 3") == (3, b"partial")
+        assert session.run("true") == (0, b"")
+
+    def test_run_in_workdir(self, session, tmp_path):
+        """Test commands run in the requested directory without moving the session."""
+        assert session.run("pwd", workdir=str(tmp_path)) == (0, f"{tmp_path}\n".encode())
+        assert session.run("cd /") == (0, b"")
+        assert session.run("pwd", workdir=str(tmp_path)) == (0, f"{tmp_path}\n".encode())
+
+    def test_shell_exit_raises(self):
+        """Test a session whose shell has gone away reports an error."""
+        channel = LocalShellChannel()
+        channel.proc.stdin.close()
+        channel.proc.wait()
+        channel.send = lambda data: None
+        session = ShellSession(channel)
+
+        with pytest.raises(DockerServiceError, match="ended unexpectedly"):
+            session.run("echo hello")
+        assert session.closed
+        channel.proc.stdout.close()
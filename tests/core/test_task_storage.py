@@ -3,6 +3,7 @@ import json
 import pytest
 from datetime import datetime
 from pathlib import Path
+from unittest.mock import patch
 
 from claude_container.core.task_storage import TaskStorageManager
 from claude_container.models.task import TaskStatus, FeedbackEntry
@@ -98,6 +99,37 @@ class TestTaskStorageManager:
         assert updated.commit_hash == commit_hash
         assert updated.started_at is not None
     
+    def test_update_task_skips_registry_for_other_fields(self, storage_manager):
+        """Test the registry is only rewritten when a mirrored field changes."""
+        task = storage_manager.create_task("Test task", "test-branch")
+        
+        with patch.object(storage_manager, '_save_registry') as mock_save:
+            storage_manager.update_task(task.id, commit_hash="abc123")
+            mock_save.assert_not_called()
+            
+            storage_manager.update_task(task.id, status=TaskStatus.FAILED)
+            mock_save.assert_called_once()
+        
+        assert storage_manager.get_task(task.id).commit_hash == "abc123"
+    
+    def test_batch_update(self, storage_manager):
+        """Test that batched updates are written once when the batch is flushed."""
+        task = storage_manager.create_task("Test task", "test-branch")
+        
+        with patch.object(storage_manager, 'update_task', wraps=storage_manager.update_task) as spy:
+            with storage_manager.batch_update(task.id) as batch:
+                batch.update(commit_hash="abc123")
+                batch.update(status=TaskStatus.FAILED, error_message="boom")
+                batch.update(commit_hash="def456")
+                assert storage_manager.get_task(task.id).commit_hash is None
+            
+            spy.assert_called_once()
+        
+        updated = storage_manager.get_task(task.id)
+        assert updated.commit_hash == "def456"
+        assert updated.status == TaskStatus.FAILED
+        assert updated.error_message == "boom"
+    
     def test_add_feedback(self, storage_manager):
         """Test adding feedback to a task."""
         task = storage_manager.create_task("Test task", "test-branch")
@@ -171,6 +203,20 @@ class TestTaskStorageManager:
             registry = json.load(f)
             assert task_id not in registry
     
+    def test_lookup_by_prefix(self, storage_manager):
+        """Test resolving short IDs from the registry."""
+        task1 = storage_manager.create_task("Task 1", "branch-1")
+        task2 = storage_manager.create_task("Task 2", "branch-2")
+        
+        assert storage_manager.lookup_by_prefix(task1.id[:8]) == [task1.id]
+        assert storage_manager.lookup_by_prefix("") == sorted([task1.id, task2.id])
+        assert storage_manager.lookup_by_prefix(task1.id + "0") == []
+        assert storage_manager.list_task_ids() == sorted([task1.id, task2.id])
+        assert storage_manager.lookup_by_prefix("not-a-task") == []
+        
+        storage_manager.delete_task(task1.id)
+        assert storage_manager.lookup_by_prefix(task1.id[:8]) == []
+    
     def test_search_tasks(self, storage_manager):
         """Test searching tasks by description."""
         storage_manager.create_task("Implement authentication", "auth-branch")
@@ -220,6 +266,25 @@ class TestTaskStorageManager:
         # Non-existent log
         assert storage_manager.get_task_log(task.id, "non_existent") is None
     
+    def test_save_task_log_bytes(self, storage_manager):
+        """Test raw byte logs are written as-is and read back with invalid UTF-8 replaced."""
+        task = storage_manager.create_task("Test task", "test-branch")
+        
+        storage_manager.save_task_log(task.id, "claude_output", '{"text": "日本"}\n'.encode() + b'\xff')
+        
+        assert storage_manager.get_task_log(task.id, "claude_output") == '{"text": "日本"}\n\ufffd'
+    
+    def test_open_task_log(self, storage_manager):
+        """Test a streamed log replaces any previous log of the same type."""
+        task = storage_manager.create_task("Test task", "test-branch")
+        storage_manager.save_task_log(task.id, "claude_output", "old output")
+        
+        with storage_manager.open_task_log(task.id, "claude_output") as log_file:
+            log_file.write(b"chunk 1\n")
+            log_file.write(b"chunk 2\n")
+        
+        assert storage_manager.get_task_log(task.id, "claude_output") == "chunk 1\nchunk 2\n"
+    
     def test_task_serialization(self, storage_manager):
         """Test task serialization and deserialization."""
         task = storage_manager.create_task("Test task", "test-branch")
@@ -272,6 +337,20 @@ class TestTaskStorageManager:
         history = storage_manager.get_task_history(branch="middle-branch")
         assert len(history) == 1
         assert history[0].id == task2.id
+    
+    def test_get_task_history_reads_only_needed_tasks(self, storage_manager):
+        """Test that tasks past the limit or on other branches are never loaded."""
+        tasks = [storage_manager.create_task(f"Task {i}", f"branch-{i % 2}") for i in range(4)]
+        
+        with patch.object(storage_manager, 'get_task', wraps=storage_manager.get_task) as get_task:
+            history = storage_manager.get_task_history(limit=1)
+            assert [t.id for t in history] == [tasks[3].id]
+            assert get_task.call_count == 1
+            
+            get_task.reset_mock()
+            history = storage_manager.get_task_history(branch="branch-0")
+            assert [t.id for t in history] == [tasks[2].id, tasks[0].id]
+            assert get_task.call_count == 2
         
         # Test with both limit and branch
         storage_manager.create_task("Another middle task", "middle-branch")
@@ -280,6 +359,49 @@ class TestTaskStorageManager:
         # Should get the newest one
         assert history[0].description == "Another middle task"
     
+    def test_list_tasks_by_status_reads_only_matches(self, storage_manager):
+        """Test that the status filter is answered from the registry."""
+        created = storage_manager.create_task("Task 1", "branch-1")
+        failed = storage_manager.create_task("Task 2", "branch-2")
+        storage_manager.update_task(failed.id, status=TaskStatus.FAILED)
+        
+        with patch.object(storage_manager, 'get_task', wraps=storage_manager.get_task) as get_task:
+            assert storage_manager.list_tasks(TaskStatus.CONTINUED) == []
+            assert get_task.call_count == 0
+            
+            assert [t.id for t in storage_manager.list_tasks(TaskStatus.CREATED)] == [created.id]
+            assert get_task.call_count == 1
+    
+    def test_search_tasks_reads_only_matches(self, storage_manager):
+        """Test that descriptions are matched in the registry before tasks are read."""
+        auth = storage_manager.create_task("Fix authentication bug", "branch-1")
+        storage_manager.create_task("Add user profile", "branch-2")
+        legacy = storage_manager.create_task("Refactor authentication", "branch-3")
+        
+        # Tasks created before the search index existed have no entry
+        index = storage_manager._load_description_index()
+        del index[legacy.id]
+        storage_manager._save_description_index(index)
+        
+        with patch.object(storage_manager, 'get_task', wraps=storage_manager.get_task) as get_task:
+            results = storage_manager.search_tasks("AUTHENTICATION")
+        
+        assert [t.id for t in results] == [legacy.id, auth.id]
+        assert sorted(call.args[0] for call in get_task.call_args_list) == sorted([auth.id, legacy.id])
+    
+    def test_description_index_follows_updates_and_deletes(self, storage_manager):
+        """Test the search index tracks description changes and deleted tasks."""
+        task1 = storage_manager.create_task("Fix Login", "branch-1")
+        task2 = storage_manager.create_task("Add profile", "branch-2")
+        
+        storage_manager.update_task(task1.id, description="Fix logout")
+        storage_manager.delete_task(task2.id)
+        
+        assert storage_manager._load_description_index() == {task1.id: "fix logout"}
+        assert "description" not in storage_manager._load_registry()[task1.id]
+        assert [t.id for t in storage_manager.search_tasks("LOGOUT")] == [task1.id]
+        assert storage_manager.search_tasks("login") == []
+    
     def test_search_tasks_no_results(self, storage_manager):
         """Test searching tasks with no results."""
         storage_manager.create_task("Task one", "branch-1")
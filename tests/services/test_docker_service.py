@@ -1,5 +1,6 @@
 """Tests for Docker service."""
 
+import socket
 from unittest.mock import Mock, MagicMock, patch
 import pytest
 import docker.errors
@@ -133,6 +134,135 @@ class TestDockerService:
             stream=False
         )
 
+    @patch('claude_container.services.docker_service.socket_read')
+    @patch('docker.from_env')
+    def test_exec_stream_demultiplexes_frames(self, mock_from_env, mock_socket_read):
+        """Test raw exec streaming strips frame headers across chunk boundaries."""
+        mock_client = Mock()
+        mock_from_env.return_value = mock_client
+        mock_client.api.exec_create.return_value = {'Id': 'exec-1'}
+        mock_sock = Mock()
+        mock_client.api.exec_start.return_value = mock_sock
+
+        def frame(stream_type, payload):
+            return bytes([stream_type, 0, 0, 0]) + len(payload).to_bytes(4, 'big') + payload
+
+        raw = frame(1, b'{"type": "system"}\n') + frame(2, b'warn\n') + frame(1, b'done\n')
+        # Split the raw stream mid-header and mid-payload
+        mock_socket_read.side_effect = [raw[:5], raw[5:30], raw[30:], b'']
+
+        mock_container = Mock()
+        mock_container.id = 'container-1'
+
+        service = DockerService()
+        output = b''.join(service.exec_stream(
+            mock_container, ['claude'], workdir='/workspace', user='node'
+        ))
+
+        assert output == b'{"type": "system"}\nwarn\ndone\n'
+        mock_client.api.exec_create.assert_called_once_with(
+            'container-1', ['claude'], stdin=False, workdir='/workspace', user='node'
+        )
+        mock_client.api.exec_start.assert_called_once_with('exec-1', socket=True)
+        mock_sock.close.assert_called_once()
+
+    @patch('claude_container.services.docker_service.socket_read')
+    @patch('docker.from_env')
+    def test_exec_with_stdin(self, mock_from_env, mock_socket_read):
+        """Test stdin is written and half-closed before output is read."""
+        mock_client = Mock()
+        mock_from_env.return_value = mock_client
+        mock_client.api.exec_create.return_value = {'Id': 'exec-1'}
+        mock_client.api.exec_inspect.return_value = {'ExitCode': 0}
+        mock_sock = Mock()
+        mock_client.api.exec_start.return_value = mock_sock
+        mock_socket_read.side_effect = [bytes([1, 0, 0, 0, 0, 0, 0, 3]) + b'12\n', b'']
+
+        mock_container = Mock()
+        mock_container.id = 'container-1'
+
+        service = DockerService()
+        exit_code, output = service.exec_with_stdin(mock_container, ['sh', '-c', 'cat > f'], b'{"a": 1}\n\n')
+
+        assert (exit_code, output) == (0, b'12\n')
+        mock_client.api.exec_create.assert_called_once_with(
+            'container-1', ['sh', '-c', 'cat > f'], stdin=True, workdir=None, user=''
+        )
+        mock_sock._sock.sendall.assert_called_once_with(b'{"a": 1}\n\n')
+        mock_sock._sock.shutdown.assert_called_once()
+        mock_sock.close.assert_called_once()
+
+    @patch('claude_container.services.docker_service.socket_read')
+    @patch('docker.from_env')
+    def test_exec_stream_with_stdin(self, mock_from_env, mock_socket_read):
+        """Test streamed exec writes stdin before output is read."""
+        mock_client = Mock()
+        mock_from_env.return_value = mock_client
+        mock_client.api.exec_create.return_value = {'Id': 'exec-1'}
+        mock_sock = Mock()
+        mock_client.api.exec_start.return_value = mock_sock
+        mock_socket_read.side_effect = [bytes([1, 0, 0, 0, 0, 0, 0, 5]) + b'done\n', b'']
+
+        mock_container = Mock()
+        mock_container.id = 'container-1'
+
+        service = DockerService()
+        output = b''.join(service.exec_stream(mock_container, ['claude', '-p'], stdin_data=b'prompt'))
+
+        assert output == b'done\n'
+        mock_client.api.exec_create.assert_called_once_with(
+            'container-1', ['claude', '-p'], stdin=True, workdir=None, user=''
+        )
+        mock_sock._sock.sendall.assert_called_once_with(b'prompt')
+        mock_sock._sock.shutdown.assert_called_once()
+
+    def test_iter_exec_socket_reads_raw_socket(self):
+        """Test demultiplexing straight from a real socket in small reads."""
+        from claude_container.services.docker_service import _iter_exec_socket
+
+        def frame(stream_type, payload):
+            return bytes([stream_type, 0, 0, 0]) + len(payload).to_bytes(4, 'big') + payload
+
+        reader, writer = socket.socketpair()
+        writer.sendall(frame(1, b'hello ') + frame(2, b'') + frame(1, b'world\n'))
+        writer.close()
+        sock = socket.SocketIO(reader, 'rb')
+
+        assert b''.join(_iter_exec_socket(sock, 5)) == b'hello world\n'
+        reader.close()
+
+    @patch('claude_container.services.docker_service.socket_read')
+    def test_socket_reader_makes_exec_socket_blocking(self, mock_socket_read):
+        """Test the client's timeout is cleared so the raw socket is read directly."""
+        from claude_container.services.docker_service import _socket_reader
+
+        reader, writer = socket.socketpair()
+        try:
+            reader.settimeout(60)
+            read = _socket_reader(socket.SocketIO(reader, 'rb'))
+            assert reader.gettimeout() is None
+            writer.sendall(b'data')
+            assert read(16) == b'data'
+            mock_socket_read.assert_not_called()
+        finally:
+            reader.close()
+            writer.close()
+
+    def test_enable_tcp_keepalive(self):
+        """Test keepalive is enabled on TCP exec sockets only."""
+        from claude_container.services.docker_service import _enable_tcp_keepalive
+
+        tcp_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        unix_sock, peer = socket.socketpair()
+        try:
+            _enable_tcp_keepalive(socket.SocketIO(tcp_sock, 'rb'))
+            _enable_tcp_keepalive(unix_sock)
+            assert tcp_sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+            assert not unix_sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+        finally:
+            for sock in (tcp_sock, unix_sock, peer):
+                sock.close()
+
     @patch('docker.from_env')
     def test_remove_container_success(self, mock_from_env):
         """Test successful container removal."""
@@ -177,6 +307,19 @@ class TestDockerService:
         service = DockerService()
         assert service.image_exists("test:latest") is False
 
+    @patch('docker.from_env')
+    def test_get_image_digest(self, mock_from_env):
+        """Test get_image_digest returns the image ID, or None if missing."""
+        mock_client = Mock()
+        mock_from_env.return_value = mock_client
+        mock_client.images.get.return_value = Mock(id="sha256:abc")
+
+        service = DockerService()
+        assert service.get_image_digest("test:latest") == "sha256:abc"
+
+        mock_client.images.get.side_effect = docker.errors.ImageNotFound("Not found")
+        assert service.get_image_digest("test:latest") is None
+
     @patch('docker.from_env')
     def test_remove_image_success(self, mock_from_env):
         """Test successful image removal."""
@@ -216,8 +359,54 @@ class TestDockerService:
         assert containers == mock_containers
         mock_client.containers.list.assert_called_once_with(
             all=True,
-            filters={"label": ["app=test", "env=prod"]}
+            filters={"label": ["app=test", "env=prod"]},
+            sparse=False
+        )
+
+    @patch('docker.from_env')
+    def test_list_containers_name_prefix(self, mock_from_env):
+        """Test the name prefix is sent to the daemon as an anchored name filter."""
+        mock_client = Mock()
+        mock_from_env.return_value = mock_client
+        mock_client.containers.list.return_value = []
+
+        service = DockerService()
+        service.list_containers(labels={"app": "test"}, name_prefix="claude-container-task")
+
+        mock_client.containers.list.assert_called_once_with(
+            all=True,
+            filters={"label": ["app=test"], "name": ["^/claude\\-container\\-task"]},
+            sparse=False
+        )
+
+    @patch('docker.from_env')
+    def test_list_containers_sparse(self, mock_from_env):
+        """Test sparse listing reads name and creation time from the list response."""
+        mock_client = Mock()
+        mock_from_env.return_value = mock_client
+        sparse_container = Mock()
+        sparse_container.name = None
+        sparse_container.attrs = {
+            'Names': ['/claude-container-task-abc'],
+            'Created': 1748599200,
+        }
+        mock_client.containers.list.return_value = [sparse_container]
+
+        service = DockerService()
+        containers = service.list_containers(all=True, sparse=True)
+
+        mock_client.containers.list.assert_called_once_with(
+            all=True, filters={}, sparse=True
         )
+        assert DockerService.container_name(containers[0]) == 'claude-container-task-abc'
+        assert DockerService.container_created(containers[0]) == '2025-05-30T10:00:00'
+
+    def test_container_created_from_inspect(self):
+        """Test creation time from a fully inspected container."""
+        container = Mock()
+        container.attrs = {'Created': '2025-05-30T10:00:00.000000000Z'}
+
+        assert DockerService.container_created(container) == '2025-05-30T10:00:00'
 
     @patch('docker.from_env')
     def test_get_container_success(self, mock_from_env):
@@ -278,6 +467,52 @@ class TestDockerService:
         with pytest.raises(ImageNotFoundError):
             service.run_container("test:latest")
 
+    @patch('docker.from_env')
+    def test_put_files(self, mock_from_env):
+        """Test files are uploaded as one tar archive."""
+        import io
+        import tarfile
+        mock_from_env.return_value = Mock()
+        mock_container = Mock()
+
+        service = DockerService()
+        service.put_files(mock_container, {"/tmp/a.txt": b"a", "/tmp/b.json": b"{}"})
+
+        path, data = mock_container.put_archive.call_args[0]
+        assert path == '/'
+        with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+            assert tar.getnames() == ["tmp/a.txt", "tmp/b.json"]
+            assert tar.extractfile("tmp/b.json").read() == b"{}"
+
+        mock_container.put_archive.side_effect = docker.errors.NotFound("gone")
+        with pytest.raises(ContainerNotFoundError):
+            service.put_files(mock_container, {"/tmp/a.txt": b"a"})
+
+    @patch('docker.from_env')
+    def test_rename_container(self, mock_from_env):
+        """Test renaming a container and the error for a taken name."""
+        mock_from_env.return_value = Mock()
+        mock_container = Mock()
+        
+        service = DockerService()
+        service.rename_container(mock_container, "new-name")
+        mock_container.rename.assert_called_once_with("new-name")
+        
+        mock_container.rename.side_effect = docker.errors.APIError("Conflict")
+        with pytest.raises(DockerServiceError, match="Failed to rename container"):
+            service.rename_container(mock_container, "new-name")
+
+    @patch('docker.from_env')
+    def test_put_files_rejected(self, mock_from_env):
+        """Test a rejected archive upload is reported as a failure."""
+        mock_from_env.return_value = Mock()
+        mock_container = Mock()
+        mock_container.put_archive.return_value = False
+        
+        service = DockerService()
+        with pytest.raises(DockerServiceError, match="rejected"):
+            service.put_files(mock_container, {"/tmp/a.txt": b"a"})
+
     @patch('docker.from_env')
     @patch('tarfile.open')
     @patch('io.BytesIO')
@@ -5,7 +5,7 @@ from unittest.mock import Mock, patch, MagicMock
 import subprocess
 import pytest
 
-from claude_container.services.git_service import GitService
+from claude_container.services.git_service import GitService, local_branch_exists
 from claude_container.services.exceptions import (
     GitServiceError,
     BranchNotFoundError,
@@ -363,4 +363,44 @@ class TestGitService:
             check=True,
             capture_output=True,
             text=True
-        )
\ No newline at end of file
+        )
+
+class TestLocalBranchExists:
+    """Test reading local branches without running git."""
+
+    def test_loose_and_packed_refs(self, tmp_path):
+        """Test branches are found as loose ref files and in packed-refs."""
+        refs = tmp_path / ".git" / "refs" / "heads" / "feature"
+        refs.mkdir(parents=True)
+        (refs / "loose").write_text("abc123\n")
+        (tmp_path / ".git" / "packed-refs").write_text(
+            "# pack-refs with: peeled fully-peeled sorted\n"
+            "def456 refs/heads/packed\n"
+            "^789abc\n"
+        )
+
+        assert local_branch_exists(tmp_path, "feature/loose") is True
+        assert local_branch_exists(tmp_path, "packed") is True
+        assert local_branch_exists(tmp_path, "feature") is False
+        assert local_branch_exists(tmp_path, "missing") is False
+
+    def test_worktree_uses_common_dir(self, tmp_path):
+        """Test a worktree's .git file is followed to the shared refs."""
+        common = tmp_path / "main" / ".git"
+        (common / "refs" / "heads").mkdir(parents=True)
+        (common / "refs" / "heads" / "shared").write_text("abc123\n")
+        worktree_git = common / "worktrees" / "wt"
+        worktree_git.mkdir(parents=True)
+        (worktree_git / "commondir").write_text("../..\n")
+        worktree = tmp_path / "wt"
+        worktree.mkdir()
+        (worktree / ".git").write_text(f"gitdir: {worktree_git}\n")
+
+        assert local_branch_exists(worktree, "shared") is True
+
+    def test_unreadable_refs(self, tmp_path):
+        """Test None is returned when git has to be asked instead."""
+        assert local_branch_exists(tmp_path, "main") is None
+
+        (tmp_path / ".git" / "reftable").mkdir(parents=True)
+        assert local_branch_exists(tmp_path, "main") is None
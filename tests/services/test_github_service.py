@@ -0,0 +1,104 @@
+"""Unit tests for GitHubService."""
+
+import io
+import json
+import subprocess
+import urllib.error
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from claude_container.services.exceptions import GitHubServiceError
+from claude_container.services.github_service import GitHubService, parse_github_repo
+
+
+class TestParseGitHubRepo:
+    """Test parse_github_repo function."""
+
+    @pytest.mark.parametrize("url", [
+        "https://github.com/owner/repo.git",
+        "https://github.com/owner/repo",
+        "git@github.com:owner/repo.git\n",
+        "ssh://git@github.com/owner/repo.git",
+    ])
+    def test_supported_urls(self, url):
+        """Test HTTPS and SSH remote URLs are parsed."""
+        assert parse_github_repo(url) == ("owner", "repo")
+
+    def test_non_github_url(self):
+        """Test a non-GitHub remote is rejected."""
+        with pytest.raises(GitHubServiceError):
+            parse_github_repo("https://gitlab.com/owner/repo.git")
+
+
+class TestGitHubService:
+    """Test GitHubService functionality."""
+
+    @patch('claude_container.services.github_service.urllib.request.urlopen')
+    def test_create_pull_request(self, mock_urlopen):
+        """Test a draft pull request is created with one API call."""
+        mock_urlopen.return_value.__enter__.return_value = io.BytesIO(
+            b'{"html_url": "https://github.com/owner/repo/pull/1"}'
+        )
+
+        service = GitHubService(token="secret")
+        url = service.create_pull_request("owner", "repo", "Title", "Body", head="feature", base="master")
+
+        assert url == "https://github.com/owner/repo/pull/1"
+        request = mock_urlopen.call_args[0][0]
+        assert request.full_url == "https://api.github.com/repos/owner/repo/pulls"
+        assert request.get_method() == "POST"
+        assert request.get_header("Authorization") == "Bearer secret"
+        assert json.loads(request.data) == {
+            "title": "Title", "body": "Body", "head": "feature", "base": "master", "draft": True
+        }
+
+    @patch('claude_container.services.github_service.urllib.request.urlopen')
+    def test_create_pull_request_http_error(self, mock_urlopen):
+        """Test API errors are raised as GitHubServiceError with the response body."""
+        mock_urlopen.side_effect = urllib.error.HTTPError(
+            "url", 422, "Unprocessable", {}, io.BytesIO(b'{"message": "Validation Failed"}')
+        )
+
+        with pytest.raises(GitHubServiceError, match="422.*Validation Failed"):
+            GitHubService(token="secret").create_pull_request(
+                "owner", "repo", "Title", "Body", head="feature", base="master"
+            )
+
+    @patch('claude_container.services.github_service.subprocess.run')
+    def test_token_lookup(self, mock_run, monkeypatch):
+        """Test the environment token wins and the GitHub CLI is asked at most once."""
+        monkeypatch.setenv("GITHUB_TOKEN", "from-env")
+        assert GitHubService()._get_token() == "from-env"
+        mock_run.assert_not_called()
+
+        monkeypatch.delenv("GITHUB_TOKEN")
+        monkeypatch.delenv("GH_TOKEN", raising=False)
+        mock_run.return_value = MagicMock(stdout="from-gh\n")
+        service = GitHubService()
+        assert service._get_token() == "from-gh"
+        assert service._get_token() == "from-gh"
+        mock_run.assert_called_once()
+
+    @patch('claude_container.services.github_service.subprocess.run')
+    def test_prefetch_token_defers_errors(self, mock_run, monkeypatch):
+        """Test a failed prefetch is silent and the error surfaces on use."""
+        monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+        monkeypatch.delenv("GH_TOKEN", raising=False)
+        mock_run.side_effect = OSError("gh not installed")
+        service = GitHubService()
+
+        service.prefetch_token()
+
+        with pytest.raises(GitHubServiceError, match="No GitHub token"):
+            service._get_token()
+
+    @patch('claude_container.services.github_service.subprocess.run')
+    def test_has_token(self, mock_run, monkeypatch):
+        """Test token availability is reported without raising."""
+        assert GitHubService(token="secret").has_token() is True
+
+        monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+        monkeypatch.delenv("GH_TOKEN", raising=False)
+        mock_run.side_effect = subprocess.CalledProcessError(1, ["gh", "auth", "token"])
+        assert GitHubService().has_token() is False
@@ -3,6 +3,7 @@
 import json
 import pytest
 from pathlib import Path
+from unittest.mock import patch
 
 from claude_container.utils.mcp_manager import MCPManager
 from claude_container.models.mcp import MCPRegistry, MCPServerConfig
@@ -149,6 +150,38 @@ class TestMCPManager:
         assert "server3" in filtered.mcpServers
         assert "server2" not in filtered.mcpServers
     
+    def test_load_registry_reuses_parsed_registry(self, mcp_manager):
+        """Test the registry is only re-parsed when the file changes."""
+        mcp_manager.add_server("server1", {"type": "stdio", "command": "cmd1"})
+        
+        first = mcp_manager.load_registry()
+        with patch.object(mcp_manager, '_read_registry') as mock_read:
+            assert mcp_manager.load_registry() is first
+            assert mcp_manager.list_servers() == ["server1"]
+            mock_read.assert_not_called()
+        
+        mcp_manager.add_server("server2", {"type": "stdio", "command": "cmd2"})
+        assert mcp_manager.list_servers() == ["server1", "server2"]
+    
+    def test_get_mcp_config_json_uses_cache(self, mcp_manager):
+        """Test serialized MCP config is cached per registry and selection."""
+        mcp_manager.add_server("server1", {"type": "stdio", "command": "cmd1"})
+        mcp_manager.add_server("server2", {"type": "stdio", "command": "cmd2"})
+        
+        config_str = mcp_manager.get_mcp_config_json(["server2", "server1"])
+        assert set(json.loads(config_str)["mcpServers"]) == {"server1", "server2"}
+        assert "\n" not in config_str and ": " not in config_str  # compact form
+        assert len(list(mcp_manager.cache_dir.glob("*.json"))) == 1
+        
+        with patch.object(mcp_manager, 'filter_registry') as mock_filter:
+            assert mcp_manager.get_mcp_config_json(["server1", "server2"]) == config_str
+            mock_filter.assert_not_called()
+        
+        # Changing the registry produces a new cache entry
+        mcp_manager.add_server("server1", {"type": "stdio", "command": "changed"})
+        updated = json.loads(mcp_manager.get_mcp_config_json(["server1", "server2"]))
+        assert updated["mcpServers"]["server1"]["command"] == "changed"
+    
     def test_validate_server_names(self, mcp_manager):
         """Test validating server names."""
         # Add some servers
@@ -167,6 +200,14 @@ class TestMCPManager:
         missing = mcp_manager.validate_server_names(["server1", "server2"])
         assert missing == []
     
+    def test_validate_against_listed_names(self, mcp_manager):
+        """Test names listed by the caller are used instead of the registry."""
+        with patch.object(mcp_manager, 'list_servers') as mock_list:
+            missing = mcp_manager.validate_server_names(["b", "x", "a", "x"], ["a", "b"])
+        
+        assert missing == ["x"]
+        mock_list.assert_not_called()
+    
     def test_invalid_json_file(self, mcp_manager):
         """Test handling invalid JSON in config file."""
         # Create invalid JSON file
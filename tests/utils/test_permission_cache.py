@@ -0,0 +1,57 @@
+"""Tests for PermissionCache."""
+
+import json
+from datetime import datetime, timedelta
+
+from claude_container.core.constants import PERMISSION_CACHE_FILE
+from claude_container.utils.permission_cache import PermissionCache
+
+
+class TestPermissionCache:
+    """Test PermissionCache functionality."""
+    
+    def test_get_missing_entry(self, tmp_path):
+        """Test that an unknown image has no cached result."""
+        cache = PermissionCache(tmp_path)
+        assert cache.get("sha256:abc") is None
+    
+    def test_set_and_get(self, tmp_path):
+        """Test that a recorded result is returned and persisted."""
+        PermissionCache(tmp_path).set("sha256:abc", True)
+        
+        assert PermissionCache(tmp_path).get("sha256:abc") is True
+        assert PermissionCache(tmp_path).get("sha256:def") is None
+        assert (tmp_path / PERMISSION_CACHE_FILE).exists()
+    
+    def test_expired_entry(self, tmp_path):
+        """Test that entries older than the TTL are ignored."""
+        checked_at = (datetime.now() - timedelta(seconds=120)).isoformat()
+        (tmp_path / PERMISSION_CACHE_FILE).write_text(
+            json.dumps({"sha256:abc": {"accepted": True, "checked_at": checked_at}})
+        )
+        
+        assert PermissionCache(tmp_path, ttl=60).get("sha256:abc") is None
+        assert PermissionCache(tmp_path, ttl=600).get("sha256:abc") is True
+    
+    def test_set_prunes_expired_entries(self, tmp_path):
+        """Test that recording a result drops expired entries for other images."""
+        old = (datetime.now() - timedelta(seconds=120)).isoformat()
+        recent = datetime.now().isoformat()
+        (tmp_path / PERMISSION_CACHE_FILE).write_text(json.dumps({
+            "sha256:old": {"accepted": True, "checked_at": old},
+            "sha256:recent": {"accepted": True, "checked_at": recent},
+        }))
+        
+        PermissionCache(tmp_path, ttl=60).set("sha256:new", True)
+        
+        data = json.loads((tmp_path / PERMISSION_CACHE_FILE).read_text())
+        assert set(data) == {"sha256:recent", "sha256:new"}
+    
+    def test_corrupt_cache_file(self, tmp_path):
+        """Test that a corrupt cache file is treated as empty."""
+        (tmp_path / PERMISSION_CACHE_FILE).write_text("not json")
+        cache = PermissionCache(tmp_path)
+        
+        assert cache.get("sha256:abc") is None
+        cache.set("sha256:abc", True)
+        assert cache.get("sha256:abc") is True